@@ -1,16 +1,42 @@
+import math
 import os
 
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from flask_swagger_ui import get_swaggerui_blueprint
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from app.api.v1 import v1_bp
+from app.api.well_known import well_known_bp
+from app.cli import (
+    archive_command,
+    explain_command,
+    keys_cli,
+    reshard_command,
+    seed_command,
+    traces_cli,
+    worker_command,
+)
+from app.core.admission import AdmissionController
 from app.core.config import Config
+from app.core.database import ShardMoving, engine, router
+from app.core.events import broker
+from app.core.keys import init_keyring
+from app.core.metrics import init_metrics
+from app.core.profiling import init_profiling
+from app.core.query_log import init_query_log
+from app.core.rate_limit import RateLimiter
+from app.core.readiness import init_readiness
+from app.core.recorder import RequestRecorder
+from app.core.startup import LazyMount, StaticDocument
+from app.core.token_cache import CachingJWTManager
+from app.core.tracing import init_tracing
 from app.schemas import ErrorResponse
+from app.services.todo_service import VersionConflict
 
-jwt = JWTManager()
+jwt = CachingJWTManager()
 cors = CORS()
+limiter = RateLimiter()
+admission = AdmissionController()
 
 SWAGGER_URL = "/docs"
 API_URL = "/openapi.yaml"
@@ -19,6 +45,22 @@ API_URL = "/openapi.yaml"
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+def swagger_blueprint():
+    from flask_swagger_ui import get_swaggerui_blueprint
+
+    return get_swaggerui_blueprint(
+        SWAGGER_URL,
+        API_URL,
+        config={"app_name": "Flask TODO API"},
+    )
+
+
+def create_docs_app() -> Flask:
+    docs_app = Flask("docs", static_folder=None)
+    docs_app.register_blueprint(swagger_blueprint(), url_prefix=SWAGGER_URL)
+    return docs_app
+
+
 def create_app() -> Flask:
     app = Flask(__name__, static_folder=None)
 
@@ -27,26 +69,88 @@ def create_app() -> Flask:
     app.config["JWT_SECRET_KEY"] = Config.JWT_SECRET_KEY
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = Config.JWT_ACCESS_TOKEN_EXPIRES
     app.config["JWT_REFRESH_TOKEN_EXPIRES"] = Config.JWT_REFRESH_TOKEN_EXPIRES
-
-    # Initialize extensions
+    app.config["JWT_TOKEN_CACHE_SIZE"] = Config.JWT_TOKEN_CACHE_SIZE
+    app.config["JWT_ALGORITHM"] = Config.JWT_ALGORITHM
+    app.config["JWT_KEYS_DIR"] = Config.JWT_KEYS_DIR
+    app.config["JWT_ACTIVE_KID"] = Config.JWT_ACTIVE_KID
+    app.config["JWKS_MAX_AGE"] = Config.JWKS_MAX_AGE
+    app.config["RATE_LIMIT_ENABLED"] = Config.RATE_LIMIT_ENABLED
+    app.config["RATE_LIMIT_STORAGE_URL"] = Config.RATE_LIMIT_STORAGE_URL
+    app.config["RATE_LIMITS"] = Config.RATE_LIMITS
+    app.config["ADMISSION_ENABLED"] = Config.ADMISSION_ENABLED
+    app.config["ADMISSION_QUEUE_TARGET_MS"] = Config.ADMISSION_QUEUE_TARGET_MS
+    app.config["ADMISSION_MIN_LIMIT"] = Config.ADMISSION_MIN_LIMIT
+    app.config["ADMISSION_MAX_LIMIT"] = Config.ADMISSION_MAX_LIMIT
+    app.config["TRUSTED_PROXY_COUNT"] = Config.TRUSTED_PROXY_COUNT
+    app.config["METRICS_ENABLED"] = Config.METRICS_ENABLED
+    app.config["QUERY_LOG_SAMPLE_RATE"] = Config.QUERY_LOG_SAMPLE_RATE
+    app.config["SLOW_QUERY_MS"] = Config.SLOW_QUERY_MS
+    app.config["N_PLUS_ONE_THRESHOLD"] = Config.N_PLUS_ONE_THRESHOLD
+    app.config["PROFILE_TOKEN"] = Config.PROFILE_TOKEN
+    app.config["PROFILE_SAMPLE_RATE"] = Config.PROFILE_SAMPLE_RATE
+    app.config["PROFILER"] = Config.PROFILER
+    app.config["PROFILE_INTERVAL_MS"] = Config.PROFILE_INTERVAL_MS
+    app.config["PROFILE_DIR"] = Config.PROFILE_DIR
+    app.config["TRACING_ENABLED"] = Config.TRACING_ENABLED
+    app.config["TRACE_SAMPLE_RATE"] = Config.TRACE_SAMPLE_RATE
+    app.config["TRACE_EXPORT_PATH"] = Config.TRACE_EXPORT_PATH
+    app.config["READY_PROBE_INTERVAL"] = Config.READY_PROBE_INTERVAL
+    app.config["READY_MAX_AGE"] = Config.READY_MAX_AGE
+    app.config["FAST_STARTUP"] = Config.FAST_STARTUP
+    app.config["EVENTS_SOCKET_DIR"] = Config.EVENTS_SOCKET_DIR
+    app.config["SSE_HEARTBEAT_SECONDS"] = Config.SSE_HEARTBEAT_SECONDS
+    app.config["SSE_RETRY_MS"] = Config.SSE_RETRY_MS
+
+    if Config.REQUEST_RECORD_PATH:
+        app.wsgi_app = RequestRecorder(
+            app.wsgi_app,
+            Config.REQUEST_RECORD_PATH,
+            app.config.get("JWT_QUERY_STRING_NAME", "jwt"),
+        )
+    if Config.TRUSTED_PROXY_COUNT:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_COUNT)
+
+    # Initialize extensions. The profiler and the request's root span wrap
+    # every other hook; metrics and request ids come next so shed requests are
+    # still counted and tagged; admission control next so shed requests do no
+    # other work.
+    init_profiling(app)
+    init_tracing(app, router)
+    init_metrics(app, router)
+    init_query_log(app, router)
+    admission.init_app(app)
     jwt.init_app(app)
+    init_keyring(app, jwt)
     cors.init_app(app, origins=Config.get_cors_origins())
+    limiter.init_app(app)
+    init_readiness(app, engine)
+    broker.init_app(app)
 
-    # Swagger UI
-    swaggerui_blueprint = get_swaggerui_blueprint(
-        SWAGGER_URL,
-        API_URL,
-        config={"app_name": "Flask TODO API"},
-    )
-    app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    # Swagger UI; FAST_STARTUP builds it on the first /docs request instead
+    if Config.FAST_STARTUP:
+        app.wsgi_app = LazyMount(app.wsgi_app, SWAGGER_URL, create_docs_app)
+    else:
+        app.register_blueprint(swagger_blueprint(), url_prefix=SWAGGER_URL)
+
+    # Serve OpenAPI spec from memory
+    openapi = StaticDocument(os.path.join(ROOT_DIR, "openapi.yaml"), "application/yaml")
 
-    # Serve OpenAPI spec
     @app.route("/openapi.yaml")
     def serve_openapi():
-        return send_from_directory(ROOT_DIR, "openapi.yaml")
+        return openapi.response(request)
 
     # Register blueprints
     app.register_blueprint(v1_bp)
+    app.register_blueprint(well_known_bp)
+
+    # CLI commands
+    app.cli.add_command(keys_cli)
+    app.cli.add_command(traces_cli)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(explain_command)
+    app.cli.add_command(archive_command)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(reshard_command)
 
     # JWT error handlers
     @jwt.unauthorized_loader
@@ -97,4 +201,33 @@ def create_app() -> Flask:
             401,
         )
 
+    # Writes arriving while `manage.py reshard` moves the user's todos
+    @app.errorhandler(ShardMoving)
+    def shard_moving(error):
+        response = jsonify(
+            ErrorResponse(
+                error="moving",
+                message="Your todos are being moved, retry shortly",
+            ).model_dump()
+        )
+        response.status_code = 503
+        response.headers["Retry-After"] = str(math.ceil(router.cache_seconds))
+        return response
+
+    # If-Match named another version, or a concurrent write won the race
+    @app.errorhandler(VersionConflict)
+    def version_conflict(error):
+        response = jsonify(
+            ErrorResponse(
+                error="version_conflict",
+                message="Todo has changed, fetch it and retry",
+            ).model_dump()
+        )
+        # 412 only when a precondition the client sent failed; an unconditional
+        # write that lost a race is a plain conflict
+        response.status_code = 412 if error.precondition else 409
+        if error.version is not None:
+            response.set_etag(str(error.version))
+        return response
+
     return app
@@ -0,0 +1,30 @@
+from flask import Flask
+
+from app.api.v1.async_routes import auth, todos
+
+# Endpoints whose sync views are replaced; everything else stays sync
+ASYNC_VIEWS = {
+    "v1.auth.register": auth.register,
+    "v1.auth.login": auth.login,
+    "v1.auth.me": auth.me,
+    "v1.todos.list_todos_route": todos.list_todos_route,
+    "v1.todos.list_changes_route": todos.list_changes_route,
+    "v1.todos.todo_stats_route": todos.todo_stats_route,
+    "v1.todos.create_todo_route": todos.create_todo_route,
+    "v1.todos.get_todo_route": todos.get_todo_route,
+    "v1.todos.update_todo_route": todos.update_todo_route,
+    "v1.todos.delete_todo_route": todos.delete_todo_route,
+    "v1.todos.toggle_todo_route": todos.toggle_todo_route,
+}
+
+
+def use_async_views(app: Flask) -> None:
+    """Serve the database-bound endpoints from the async service layer.
+
+    Routes, blueprint hooks and error handlers are unchanged; only the view
+    functions behind the endpoints are swapped.
+    """
+    for endpoint, view in ASYNC_VIEWS.items():
+        if endpoint not in app.view_functions:
+            raise RuntimeError(f"No endpoint {endpoint} to replace")
+        app.view_functions[endpoint] = view
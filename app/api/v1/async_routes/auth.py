@@ -0,0 +1,139 @@
+from flask import jsonify, request
+from flask_jwt_extended import (
+    create_access_token,
+    create_refresh_token,
+    get_jwt_identity,
+    jwt_required,
+)
+from pydantic import ValidationError
+
+from app.core.database import get_async_session
+from app.core.rate_limit import rate_limit
+from app.core.tracing import span
+from app.schemas import (
+    ErrorResponse,
+    TokenResponse,
+    UserLogin,
+    UserRegister,
+    UserResponse,
+)
+from app.services.async_auth_service import (
+    authenticate_user,
+    create_user,
+    get_user_by_email,
+    get_user_by_id,
+    get_user_by_username,
+)
+
+# Same module and function names as app/api/v1/routes/auth.py, so the rate
+# limit scopes (and any RATE_LIMITS overrides) are shared
+
+
+@rate_limit("5/minute", key="ip")
+async def register():
+    try:
+        with span("validate"):
+            data = UserRegister.model_validate(request.get_json())
+    except ValidationError as e:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="validation_error",
+                    message="Validation failed",
+                    details=e.errors(),
+                ).model_dump()
+            ),
+            400,
+        )
+
+    async with get_async_session() as session:
+        # Check if email exists
+        if await get_user_by_email(session, data.email):
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="conflict",
+                        message="Email already exists",
+                    ).model_dump()
+                ),
+                409,
+            )
+
+        # Check if username exists
+        if await get_user_by_username(session, data.username):
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="conflict",
+                        message="Username already exists",
+                    ).model_dump()
+                ),
+                409,
+            )
+
+        with span("service.create_user"):
+            user = await create_user(session, data)
+        return jsonify(UserResponse.model_validate(user).model_dump()), 201
+
+
+@rate_limit("10/minute", key="ip")
+async def login():
+    try:
+        with span("validate"):
+            data = UserLogin.model_validate(request.get_json())
+    except ValidationError as e:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="validation_error",
+                    message="Validation failed",
+                    details=e.errors(),
+                ).model_dump()
+            ),
+            400,
+        )
+
+    async with get_async_session() as session:
+        with span("service.authenticate_user"):
+            user = await authenticate_user(session, data.email, data.password)
+        if user is None:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="unauthorized",
+                        message="Invalid credentials",
+                    ).model_dump()
+                ),
+                401,
+            )
+
+        access_token = create_access_token(identity=str(user.id))
+        refresh_token = create_refresh_token(identity=str(user.id))
+
+        return jsonify(
+            TokenResponse(
+                access_token=access_token,
+                refresh_token=refresh_token,
+            ).model_dump()
+        )
+
+
+@jwt_required()
+async def me():
+    user_id = int(get_jwt_identity())
+
+    async with get_async_session() as session:
+        with span("service.get_user_by_id"):
+            user = await get_user_by_id(session, user_id)
+        if user is None:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="not_found",
+                        message="User not found",
+                    ).model_dump()
+                ),
+                404,
+            )
+
+        return jsonify(UserResponse.model_validate(user).model_dump())
@@ -0,0 +1,213 @@
+from datetime import datetime, timezone
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from pydantic import ValidationError
+
+from app.api.v1.routes.todos import (
+    changes_args,
+    if_match_versions,
+    invalid_cursor,
+    list_args,
+    stats_etag,
+    stats_result,
+    todo_result,
+)
+from app.core.admission import admission_priority
+from app.core.database import router
+from app.core.tracing import span
+from app.schemas import (
+    ErrorResponse,
+    MessageResponse,
+    TodoCreate,
+    TodoUpdate,
+)
+from app.services.async_todo_service import (
+    create_todo,
+    current_change_seq,
+    delete_todo,
+    get_todo,
+    list_changes,
+    list_todos,
+    todo_stats,
+    toggle_todo,
+    update_todo,
+)
+
+
+@admission_priority("low")
+@jwt_required()
+async def list_todos_route():
+    user_id = int(get_jwt_identity())
+
+    args = list_args()
+
+    async with router.async_session(user_id) as session:
+        with span("service.list_todos"):
+            result = await list_todos(session, user_id, *args)
+        with span("serialize"):
+            return jsonify(result.model_dump())
+
+
+@admission_priority("low")
+@jwt_required()
+async def list_changes_route():
+    user_id = int(get_jwt_identity())
+
+    args = changes_args()
+    if args is None:
+        return invalid_cursor()
+
+    async with router.async_session(user_id) as session:
+        with span("service.list_changes"):
+            result = await list_changes(session, user_id, *args)
+        with span("serialize"):
+            return jsonify(result.model_dump())
+
+
+@admission_priority("low")
+@jwt_required()
+async def todo_stats_route():
+    user_id = int(get_jwt_identity())
+    today = datetime.now(timezone.utc).date()
+
+    async with router.async_session(user_id) as session:
+        etag = stats_etag(user_id, await current_change_seq(session, user_id), today)
+        if request.if_none_match.contains_weak(etag):
+            return stats_result(etag, None)
+        with span("service.todo_stats"):
+            result = await todo_stats(session, user_id, today)
+        with span("serialize"):
+            return stats_result(etag, result)
+
+
+@jwt_required()
+async def create_todo_route():
+    user_id = int(get_jwt_identity())
+
+    try:
+        with span("validate"):
+            data = TodoCreate.model_validate(request.get_json())
+    except ValidationError as e:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="validation_error",
+                    message="Validation failed",
+                    details=e.errors(),
+                ).model_dump()
+            ),
+            400,
+        )
+
+    async with router.async_session(user_id, write=True) as session:
+        with span("service.create_todo"):
+            todo = await create_todo(session, user_id, data)
+        with span("serialize"):
+            return todo_result(todo, 201)
+
+
+@jwt_required()
+async def get_todo_route(todo_id: int):
+    user_id = int(get_jwt_identity())
+
+    async with router.async_session(user_id) as session:
+        with span("service.get_todo"):
+            todo = await get_todo(session, todo_id, user_id)
+        if todo is None:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="not_found",
+                        message="Todo not found",
+                    ).model_dump()
+                ),
+                404,
+            )
+
+        with span("serialize"):
+            return todo_result(todo)
+
+
+@jwt_required()
+async def update_todo_route(todo_id: int):
+    user_id = int(get_jwt_identity())
+
+    try:
+        with span("validate"):
+            data = TodoUpdate.model_validate(request.get_json())
+    except ValidationError as e:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="validation_error",
+                    message="Validation failed",
+                    details=e.errors(),
+                ).model_dump()
+            ),
+            400,
+        )
+
+    async with router.async_session(user_id, write=True) as session:
+        with span("service.update_todo"):
+            todo = await update_todo(
+                session, todo_id, user_id, data, if_match_versions()
+            )
+        if todo is None:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="not_found",
+                        message="Todo not found",
+                    ).model_dump()
+                ),
+                404,
+            )
+
+        with span("serialize"):
+            return todo_result(todo)
+
+
+@jwt_required()
+async def delete_todo_route(todo_id: int):
+    user_id = int(get_jwt_identity())
+
+    async with router.async_session(user_id, write=True) as session:
+        with span("service.delete_todo"):
+            success = await delete_todo(session, todo_id, user_id, if_match_versions())
+        if not success:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="not_found",
+                        message="Todo not found",
+                    ).model_dump()
+                ),
+                404,
+            )
+
+        return jsonify(
+            MessageResponse(message="Todo deleted successfully").model_dump()
+        )
+
+
+@jwt_required()
+async def toggle_todo_route(todo_id: int):
+    user_id = int(get_jwt_identity())
+
+    async with router.async_session(user_id, write=True) as session:
+        with span("service.toggle_todo"):
+            todo = await toggle_todo(session, todo_id, user_id, if_match_versions())
+        if todo is None:
+            return (
+                jsonify(
+                    ErrorResponse(
+                        error="not_found",
+                        message="Todo not found",
+                    ).model_dump()
+                ),
+                404,
+            )
+
+        with span("serialize"):
+            return todo_result(todo)
@@ -9,6 +9,8 @@ from pydantic import ValidationError
 from sqlmodel import Session
 
 from app.core.database import engine
+from app.core.rate_limit import rate_limit
+from app.core.tracing import span
 from app.schemas import (
     ErrorResponse,
     TokenResponse,
@@ -28,9 +30,11 @@ auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 
 @auth_bp.route("/register", methods=["POST"])
+@rate_limit("5/minute", key="ip")
 def register():
     try:
-        data = UserRegister.model_validate(request.get_json())
+        with span("validate"):
+            data = UserRegister.model_validate(request.get_json())
     except ValidationError as e:
         return (
             jsonify(
@@ -68,14 +72,17 @@ def register():
                 409,
             )
 
-        user = create_user(session, data)
+        with span("service.create_user"):
+            user = create_user(session, data)
         return jsonify(UserResponse.model_validate(user).model_dump()), 201
 
 
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit("10/minute", key="ip")
 def login():
     try:
-        data = UserLogin.model_validate(request.get_json())
+        with span("validate"):
+            data = UserLogin.model_validate(request.get_json())
     except ValidationError as e:
         return (
             jsonify(
@@ -89,7 +96,8 @@ def login():
         )
 
     with Session(engine) as session:
-        user = authenticate_user(session, data.email, data.password)
+        with span("service.authenticate_user"):
+            user = authenticate_user(session, data.email, data.password)
         if user is None:
             return (
                 jsonify(
@@ -113,6 +121,7 @@ def login():
 
 
 @auth_bp.route("/refresh", methods=["POST"])
+@rate_limit("30/minute")
 @jwt_required(refresh=True)
 def refresh():
     identity = get_jwt_identity()
@@ -133,7 +142,8 @@ def me():
     user_id = int(get_jwt_identity())
 
     with Session(engine) as session:
-        user = get_user_by_id(session, user_id)
+        with span("service.get_user_by_id"):
+            user = get_user_by_id(session, user_id)
         if user is None:
             return (
                 jsonify(
@@ -1,8 +1,11 @@
 from flask import Blueprint, jsonify
 
+from app.core.admission import admission_priority
+
 health_bp = Blueprint("health", __name__)
 
 
 @health_bp.route("/health", methods=["GET"])
+@admission_priority("high")
 def health_check():
     return jsonify({"status": "healthy", "service": "flask-todo-api"})
@@ -1,38 +1,55 @@
-from flask import Blueprint, jsonify, request
+from datetime import date, datetime, timezone
+
+from flask import Blueprint, Response, current_app, jsonify, request, url_for
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from pydantic import ValidationError
 from sqlmodel import Session
 
-from app.core.database import engine
+from app.core.admission import admission_priority
+from app.core.database import engine, router
+from app.core.downloads import send_download
+from app.core.rate_limit import rate_limit
+from app.core.sse import format_changes, stream_preamble
+from app.core.tracing import span
+from app.models import JobStatus, Todo
 from app.schemas import (
     ErrorResponse,
     MessageResponse,
     TodoCreate,
     TodoResponse,
+    TodoStatsResponse,
     TodoUpdate,
 )
+from app.services.export_service import (
+    export_file,
+    export_response,
+    get_export,
+    start_export,
+)
 from app.services.todo_service import (
     create_todo,
+    current_change_seq,
     delete_todo,
     get_todo,
+    list_changes,
     list_todos,
+    todo_stats,
     toggle_todo,
     update_todo,
 )
 
 todos_bp = Blueprint("todos", __name__, url_prefix="/todos")
+rate_limit("120/minute")(todos_bp)
 
 
-@todos_bp.route("", methods=["GET"])
-@jwt_required()
-def list_todos_route():
-    user_id = int(get_jwt_identity())
-
+def list_args() -> tuple[int, int, bool | None, str, str, bool]:
+    """Parse and clamp the list query parameters, in ``list_todos`` order."""
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     completed = request.args.get("completed", type=str)
     sort_by = request.args.get("sort_by", "created_at", type=str)
     order = request.args.get("order", "desc", type=str)
+    include_archived = request.args.get("include_archived", "false", type=str)
 
     # Validate pagination
     if page < 1:
@@ -51,11 +68,234 @@ def list_todos_route():
     if completed is not None:
         completed_filter = completed.lower() in ("true", "1", "yes")
 
+    return (
+        page,
+        per_page,
+        completed_filter,
+        sort_by,
+        order,
+        include_archived.lower() in ("true", "1", "yes"),
+    )
+
+
+@todos_bp.route("", methods=["GET"])
+@admission_priority("low")
+@jwt_required()
+def list_todos_route():
+    user_id = int(get_jwt_identity())
+
+    args = list_args()
+
+    with router.session(user_id) as session:
+        with span("service.list_todos"):
+            result = list_todos(session, user_id, *args)
+        with span("serialize"):
+            return jsonify(result.model_dump())
+
+
+def changes_args() -> tuple[int, int] | None:
+    """Parse ``since`` and ``limit``; ``None`` when the cursor is malformed."""
+    since = request.args.get("since", "0", type=str)
+    if not since.isdigit():
+        return None
+    limit = request.args.get("limit", 100, type=int)
+    return int(since), min(max(limit, 1), 1000)
+
+
+def invalid_cursor():
+    return (
+        jsonify(
+            ErrorResponse(
+                error="invalid_cursor",
+                message="since must be a cursor returned by this endpoint",
+            ).model_dump()
+        ),
+        400,
+    )
+
+
+@todos_bp.route("/changes", methods=["GET"])
+@admission_priority("low")
+@jwt_required()
+def list_changes_route():
+    user_id = int(get_jwt_identity())
+
+    args = changes_args()
+    if args is None:
+        return invalid_cursor()
+
+    with router.session(user_id) as session:
+        with span("service.list_changes"):
+            result = list_changes(session, user_id, *args)
+        with span("serialize"):
+            return jsonify(result.model_dump())
+
+
+def stats_etag(user_id: int, change_seq: int, today: date) -> str:
+    """Stats only change with a write or with the date, so tag on both.
+
+    The user id keeps accounts sharing a browser cache from matching each
+    other's tags.
+    """
+    return f"{user_id}-{change_seq}-{today.isoformat()}"
+
+
+def stats_result(etag: str, stats: TodoStatsResponse | None) -> Response:
+    """The stats body, or ``304`` when ``stats`` was skipped for a fresh tag."""
+    if stats is None:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(stats.model_dump())
+    response.set_etag(etag)
+    # Per-user data: browsers may keep it, but must revalidate every time
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@todos_bp.route("/stats", methods=["GET"])
+@admission_priority("low")
+@jwt_required()
+def todo_stats_route():
+    user_id = int(get_jwt_identity())
+    today = datetime.now(timezone.utc).date()
+
+    with router.session(user_id) as session:
+        # Tag before counting: a write landing in between leaves a stale tag on
+        # fresh counts, which only costs the next request a full response
+        etag = stats_etag(user_id, current_change_seq(session, user_id), today)
+        if request.if_none_match.contains_weak(etag):
+            return stats_result(etag, None)
+        with span("service.todo_stats"):
+            result = todo_stats(session, user_id, today)
+        with span("serialize"):
+            return stats_result(etag, result)
+
+
+@todos_bp.route("/stream", methods=["GET"])
+@admission_priority("low")
+@jwt_required(locations=["headers", "query_string"])
+def stream_todos_route():
+    """Event stream for servers without ``asgi.py``.
+
+    Holding the connection open would pin a sync worker, so this sends the
+    changes since ``Last-Event-ID`` and closes. ``EventSource`` reconnects
+    after ``SSE_RETRY_MS``. Under ``asgi.py`` the path is served by
+    :class:`app.core.sse.EventStream` instead.
+    """
+    user_id = int(get_jwt_identity())
+    last_event_id = request.headers.get("Last-Event-ID", "")
+
+    with router.session(user_id) as session:
+        current = current_change_seq(session, user_id)
+        cursor = int(last_event_id) if last_event_id.isdigit() else current
+        chunks = [stream_preamble(current_app.config["SSE_RETRY_MS"], cursor)]
+        while cursor < current:
+            page = list_changes(session, user_id, cursor, 1000)
+            chunks.append(format_changes(page))
+            cursor = int(page.cursor)
+            if not page.has_more:
+                break
+    return Response(
+        b"".join(chunks),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+def export_not_found():
+    return (
+        jsonify(
+            ErrorResponse(error="not_found", message="Export not found").model_dump()
+        ),
+        404,
+    )
+
+
+@todos_bp.route("/exports", methods=["POST"])
+@admission_priority("low")
+@rate_limit("10/hour")
+@jwt_required()
+def create_export_route():
+    """Queue an export; the worker writes the file, poll the status URL."""
+    user_id = int(get_jwt_identity())
+
+    with Session(engine) as session:
+        with span("service.start_export"):
+            export = start_export(session, user_id)
+    response = jsonify(export.model_dump())
+    response.status_code = 202
+    response.headers["Location"] = url_for(".get_export_route", export_id=export.id)
+    return response
+
+
+@todos_bp.route("/exports/<int:export_id>", methods=["GET"])
+@jwt_required()
+def get_export_route(export_id: int):
+    user_id = int(get_jwt_identity())
+
+    with Session(engine) as session:
+        with span("service.get_export"):
+            job = get_export(session, export_id, user_id)
+    if job is None:
+        return export_not_found()
+    return jsonify(export_response(job).model_dump())
+
+
+@todos_bp.route("/exports/<int:export_id>/download", methods=["GET"])
+@admission_priority("low")
+@jwt_required()
+def download_export_route(export_id: int):
+    """The export file, resumable with ``Range``/``If-Range``.
+
+    Served from disk rather than regenerated, so an interrupted download
+    picks up where it stopped for as long as the file is kept.
+    """
+    user_id = int(get_jwt_identity())
+
     with Session(engine) as session:
-        result = list_todos(
-            session, user_id, page, per_page, completed_filter, sort_by, order
+        with span("service.get_export"):
+            job = get_export(session, export_id, user_id)
+    if job is None:
+        return export_not_found()
+    if job.status != JobStatus.DONE:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="export_not_ready",
+                    message=f"Export is {job.status.value}",
+                ).model_dump()
+            ),
+            409,
+        )
+    path = export_file(job)
+    if path is None:
+        return (
+            jsonify(
+                ErrorResponse(
+                    error="export_expired",
+                    message="Export has expired, start a new one",
+                ).model_dump()
+            ),
+            410,
         )
-        return jsonify(result.model_dump())
+    return send_download(path, f"todos-{export_id}.ndjson.gz", "application/gzip")
+
+
+def if_match_versions() -> set[int] | None:
+    """Versions named by ``If-Match``; ``None`` when absent or ``*``.
+
+    Weak tags never match, as the header requires.
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    return {int(tag) for tag in request.if_match.as_set() if tag.isdigit()}
+
+
+def todo_result(todo: Todo, status: int = 200) -> Response:
+    response = jsonify(TodoResponse.model_validate(todo).model_dump())
+    response.status_code = status
+    response.set_etag(str(todo.version))
+    return response
 
 
 @todos_bp.route("", methods=["POST"])
@@ -64,7 +304,8 @@ def create_todo_route():
     user_id = int(get_jwt_identity())
 
     try:
-        data = TodoCreate.model_validate(request.get_json())
+        with span("validate"):
+            data = TodoCreate.model_validate(request.get_json())
     except ValidationError as e:
         return (
             jsonify(
@@ -77,9 +318,11 @@ def create_todo_route():
             400,
         )
 
-    with Session(engine) as session:
-        todo = create_todo(session, user_id, data)
-        return jsonify(TodoResponse.model_validate(todo).model_dump()), 201
+    with router.session(user_id, write=True) as session:
+        with span("service.create_todo"):
+            todo = create_todo(session, user_id, data)
+        with span("serialize"):
+            return todo_result(todo, 201)
 
 
 @todos_bp.route("/<int:todo_id>", methods=["GET"])
@@ -87,8 +330,9 @@ def create_todo_route():
 def get_todo_route(todo_id: int):
     user_id = int(get_jwt_identity())
 
-    with Session(engine) as session:
-        todo = get_todo(session, todo_id, user_id)
+    with router.session(user_id) as session:
+        with span("service.get_todo"):
+            todo = get_todo(session, todo_id, user_id)
         if todo is None:
             return (
                 jsonify(
@@ -100,7 +344,8 @@ def get_todo_route(todo_id: int):
                 404,
             )
 
-        return jsonify(TodoResponse.model_validate(todo).model_dump())
+        with span("serialize"):
+            return todo_result(todo)
 
 
 @todos_bp.route("/<int:todo_id>", methods=["PUT"])
@@ -109,7 +354,8 @@ def update_todo_route(todo_id: int):
     user_id = int(get_jwt_identity())
 
     try:
-        data = TodoUpdate.model_validate(request.get_json())
+        with span("validate"):
+            data = TodoUpdate.model_validate(request.get_json())
     except ValidationError as e:
         return (
             jsonify(
@@ -122,8 +368,9 @@ def update_todo_route(todo_id: int):
             400,
         )
 
-    with Session(engine) as session:
-        todo = update_todo(session, todo_id, user_id, data)
+    with router.session(user_id, write=True) as session:
+        with span("service.update_todo"):
+            todo = update_todo(session, todo_id, user_id, data, if_match_versions())
         if todo is None:
             return (
                 jsonify(
@@ -135,7 +382,8 @@ def update_todo_route(todo_id: int):
                 404,
             )
 
-        return jsonify(TodoResponse.model_validate(todo).model_dump())
+        with span("serialize"):
+            return todo_result(todo)
 
 
 @todos_bp.route("/<int:todo_id>", methods=["DELETE"])
@@ -143,8 +391,9 @@ def update_todo_route(todo_id: int):
 def delete_todo_route(todo_id: int):
     user_id = int(get_jwt_identity())
 
-    with Session(engine) as session:
-        success = delete_todo(session, todo_id, user_id)
+    with router.session(user_id, write=True) as session:
+        with span("service.delete_todo"):
+            success = delete_todo(session, todo_id, user_id, if_match_versions())
         if not success:
             return (
                 jsonify(
@@ -166,8 +415,9 @@ def delete_todo_route(todo_id: int):
 def toggle_todo_route(todo_id: int):
     user_id = int(get_jwt_identity())
 
-    with Session(engine) as session:
-        todo = toggle_todo(session, todo_id, user_id)
+    with router.session(user_id, write=True) as session:
+        with span("service.toggle_todo"):
+            todo = toggle_todo(session, todo_id, user_id, if_match_versions())
         if todo is None:
             return (
                 jsonify(
@@ -179,4 +429,5 @@ def toggle_todo_route(todo_id: int):
                 404,
             )
 
-        return jsonify(TodoResponse.model_validate(todo).model_dump())
+        with span("serialize"):
+            return todo_result(todo)
@@ -0,0 +1,23 @@
+from flask import Blueprint, current_app, request
+
+from app.core.keys import get_keyring
+
+well_known_bp = Blueprint("well_known", __name__, url_prefix="/.well-known")
+
+EMPTY_JWKS = b'{"keys": []}'
+
+
+@well_known_bp.route("/jwks.json", methods=["GET"])
+def jwks():
+    keyring = get_keyring()
+    body = keyring.jwks_body if keyring else EMPTY_JWKS
+    etag = keyring.jwks_etag if keyring else "empty"
+
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    max_age = current_app.config["JWKS_MAX_AGE"]
+    response.headers["Cache-Control"] = (
+        f"public, max-age={max_age}, stale-while-revalidate={max_age}, "
+        f"stale-if-error={max_age * 24}"
+    )
+    return response.make_conditional(request)
@@ -0,0 +1,198 @@
+import signal
+import time
+from datetime import timedelta
+
+import click
+from flask.cli import AppGroup
+
+from app.core.config import Config
+from app.core.database import engine, router
+from app.core.jobs import Worker
+from app.core.keys import ASYMMETRIC_ALGORITHMS, write_private_key
+from app.core.query_plan import (
+    BASELINE_PATH,
+    inspect_query_plans,
+    load_baseline,
+    new_findings,
+    save_baseline,
+)
+from app.core.seed import seed
+from app.core.tracing import format_summary, summarize
+from app.services.archive_service import archive_all_shards
+from app.services.shard_service import move_user, rebalance
+
+keys_cli = AppGroup("keys", help="Manage JWT signing keys.")
+traces_cli = AppGroup("traces", help="Inspect exported tracing spans.")
+
+
+# Runs without an app context so the first key can be created before the app
+# (which refuses to start without one) is importable.
+@keys_cli.command("generate", with_appcontext=False)
+@click.option(
+    "--algorithm",
+    type=click.Choice(sorted(ASYMMETRIC_ALGORITHMS)),
+    default=None,
+    help="Key type to generate (defaults to JWT_ALGORITHM).",
+)
+@click.option("--keys-dir", default=Config.JWT_KEYS_DIR, show_default=True)
+def generate_key(algorithm: str | None, keys_dir: str):
+    """Add a new signing key.
+
+    The key is published in the JWKS on the next start. It signs from the
+    first start at which its file is older than 2 * JWKS_MAX_AGE.
+    """
+    algorithm = algorithm or Config.JWT_ALGORITHM
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise click.UsageError(
+            f"JWT_ALGORITHM is {algorithm}; pass --algorithm RS256 or EdDSA"
+        )
+    kid = write_private_key(keys_dir, algorithm)
+    click.echo(f"Generated {algorithm} key {kid} in {keys_dir}")
+
+
+@traces_cli.command("summary", with_appcontext=False)
+@click.argument("path", type=click.File(), default=Config.TRACE_EXPORT_PATH)
+def traces_summary(path):
+    """Print per-route, per-stage latency from a span NDJSON file."""
+    stages = summarize(path)
+    if not stages:
+        raise click.ClickException(f"No request spans in {path.name}")
+    click.echo(format_summary(stages))
+
+
+@click.command("seed")
+@click.option("--users", default=1000, show_default=True)
+@click.option("--todos", default=100_000, show_default=True, help="Total todos.")
+@click.option("--seed", "seed_value", default=0, show_default=True, help="RNG seed.")
+@click.option(
+    "--skew",
+    default=1.1,
+    show_default=True,
+    help="Zipf exponent of todos per user; 0 spreads them evenly.",
+)
+@click.option("--password", default="password123", show_default=True)
+@click.option("--prefix", default="seed", show_default=True, help="Username prefix.")
+def seed_command(
+    users: int, todos: int, seed_value: int, skew: float, password: str, prefix: str
+):
+    """Bulk-load a reproducible synthetic dataset into DATABASE_URL and shards."""
+    try:
+        result = seed(
+            engine, users, todos, seed_value, skew, password, prefix, router=router
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        f"Inserted {result.users} users and {result.todos} todos "
+        f"(largest user: {result.max_todos_per_user}) in {result.seconds:.1f}s"
+    )
+
+
+@click.command("explain")
+@click.option("--baseline", default=BASELINE_PATH, show_default=True)
+@click.option("--update-baseline", is_flag=True, help="Accept the current findings.")
+@click.option("-v", "--verbose", is_flag=True, help="Print every statement.")
+def explain_command(baseline: str, update_baseline: bool, verbose: bool):
+    """Flag full scans and temp sorts in the query plans of every service query.
+
+    Exits non-zero when a finding is not in the baseline.
+    """
+    try:
+        findings = inspect_query_plans(engine)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    dialect = engine.dialect.name
+
+    if update_baseline:
+        save_baseline(baseline, dialect, findings)
+        click.echo(f"Saved {dialect} baseline to {baseline}")
+        return
+
+    if verbose:
+        for name, items in findings.items():
+            click.echo(f"{name}: {'; '.join(items) or 'ok'}")
+
+    regressions = new_findings(findings, load_baseline(baseline, dialect))
+    flagged = sum(1 for items in findings.values() if items)
+    click.echo(
+        f"{len(findings)} statements, {flagged} with scans or temp sorts, "
+        f"{len(regressions)} not in the baseline"
+    )
+    if regressions:
+        for name, items in regressions.items():
+            click.echo(f"  {name}: {'; '.join(items)}", err=True)
+        raise click.ClickException("Query plans regressed")
+
+
+@click.command("archive")
+@click.option(
+    "--after-days",
+    default=Config.ARCHIVE_AFTER_DAYS,
+    show_default=True,
+    help="Archive todos completed (and untouched) for this many days.",
+)
+@click.option("--batch-size", default=Config.ARCHIVE_BATCH_SIZE, show_default=True)
+@click.option(
+    "--interval",
+    default=0.0,
+    help="Keep running, archiving every this many seconds (0 runs once).",
+)
+def archive_command(after_days: int, batch_size: int, interval: float):
+    """Move old completed todos from todos into archived_todos."""
+    while True:
+        moved = archive_all_shards(timedelta(days=after_days), batch_size)
+        click.echo(f"Archived {moved} todos")
+        if not interval:
+            return
+        time.sleep(interval)
+
+
+@click.command("worker")
+@click.option("--threads", default=Config.JOB_WORKER_THREADS, show_default=True)
+def worker_command(threads: int):
+    """Run background jobs until interrupted."""
+    worker = Worker(engine, threads)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    click.echo(f"Running jobs on {threads} threads")
+    worker.run()
+
+
+@click.command("reshard")
+@click.option("--user-id", type=int, help="Move only this user (needs --to).")
+@click.option("--to", "target", type=int, help="Shard to move --user-id to.")
+@click.option("--dry-run", is_flag=True, help="List the moves without making them.")
+def reshard_command(user_id: int | None, target: int | None, dry_run: bool):
+    """Move users' todos to the shard the hash ring assigns them.
+
+    Run after adding a database to SHARD_URLS and migrating it. Users keep
+    reading throughout; each user's writes pause for a few seconds.
+    """
+    if user_id is not None:
+        if target is None:
+            raise click.UsageError("--user-id needs --to")
+        if dry_run:
+            click.echo(f"Would move user {user_id} to shard {target}")
+            return
+        try:
+            moved = move_user(router, user_id, target)
+        except (LookupError, ValueError) as e:
+            raise click.ClickException(str(e))
+        if moved:
+            click.echo(f"Moved user {user_id} to shard {target}")
+        else:
+            click.echo(f"User {user_id} is already on shard {target}")
+        return
+    moves = rebalance(router, dry_run=dry_run)
+    for moved_id, source, destination in moves:
+        click.echo(f"User {moved_id}: shard {source} -> {destination}")
+    click.echo(f"{'Would move' if dry_run else 'Moved'} {len(moves)} users")
+
+
+cli = click.Group(help="Management commands that run without the Flask app.")
+cli.add_command(keys_cli)
+cli.add_command(traces_cli)
+cli.add_command(seed_command)
+cli.add_command(explain_command)
+cli.add_command(archive_command)
+cli.add_command(worker_command)
+cli.add_command(reshard_command)
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+
+from flask import Flask, current_app, g, jsonify, request
+
+from app.core.metrics import ADMISSION_DECISIONS, ADMISSION_LIMIT
+from app.schemas import ErrorResponse
+
+logger = logging.getLogger(__name__)
+
+LOW = "low"
+NORMAL = "normal"
+HIGH = "high"
+
+# Fraction of the concurrency limit each priority may fill, and how far past
+# the queue-time target a request of that priority may have waited
+CONCURRENCY_SHARE = {LOW: 0.5, NORMAL: 0.8, HIGH: 1.0}
+QUEUE_FACTOR = {LOW: 1, NORMAL: 2, HIGH: 10}
+
+DECREASE_FACTOR = 0.9
+DECREASE_INTERVAL = 0.1  # seconds between multiplicative decreases
+# Longer "queue times" are clock skew or a forged header; proxies give up sooner
+MAX_QUEUE_MS = 60_000
+
+
+def admission_priority(priority: str):
+    """Mark a view as ``low``/``normal``/``high`` priority for load shedding.
+
+    Unmarked GET views are ``normal``; unmarked writes are ``high``.
+    """
+    if priority not in CONCURRENCY_SHARE:
+        raise ValueError(f"Unknown admission priority: {priority!r}")
+
+    def decorator(view):
+        view.admission_priority = priority
+        return view
+
+    return decorator
+
+
+def parse_request_start(value: str | None, now: float) -> float | None:
+    """Return queue time in ms from an ``X-Request-Start`` header.
+
+    Accepts ``t=<epoch>`` or a bare epoch in seconds (with fraction),
+    milliseconds or microseconds, as emitted by nginx, HAProxy and Heroku.
+    Values more than ``MAX_QUEUE_MS`` in the past are ignored.
+    """
+    if not value:
+        return None
+    try:
+        started = float(value.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1_000_000
+    elif started > 1e11:
+        started /= 1000
+    queue_ms = (now - started) * 1000
+    if queue_ms > MAX_QUEUE_MS:
+        return None
+    return max(0.0, queue_ms)
+
+
+class AdmissionController:
+    """Adaptive (AIMD) in-flight limit with priority-aware load shedding.
+
+    The limit grows by ``1/limit`` for every request that was not queued past
+    the target and shrinks by 10% (at most every 100 ms) when an admitted
+    request was; shed requests never move it. Low
+    priority requests are refused first: they may only use half the limit and
+    are shed as soon as queue time exceeds the target, while writes and auth
+    keep the full limit and tolerate ten times the target before shedding.
+    """
+
+    def __init__(self, app: Flask | None = None):
+        self.enabled = True
+        self.queue_target_ms = 100.0
+        self.min_limit = 1.0
+        self.max_limit = 32.0
+        self.limit = self.max_limit
+        self.in_flight = 0
+        # X-Request-Start is only read when a trusted proxy sets it
+        self.trust_request_start = False
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("ADMISSION_ENABLED", True)
+        app.config.setdefault("ADMISSION_QUEUE_TARGET_MS", 100)
+        app.config.setdefault("ADMISSION_MIN_LIMIT", 1)
+        app.config.setdefault("ADMISSION_MAX_LIMIT", 32)
+        app.config.setdefault("TRUSTED_PROXY_COUNT", 0)
+        self.enabled = app.config["ADMISSION_ENABLED"]
+        self.queue_target_ms = float(app.config["ADMISSION_QUEUE_TARGET_MS"])
+        self.min_limit = float(app.config["ADMISSION_MIN_LIMIT"])
+        self.max_limit = float(app.config["ADMISSION_MAX_LIMIT"])
+        self.trust_request_start = app.config["TRUSTED_PROXY_COUNT"] > 0
+        self.limit = self.max_limit
+        self.in_flight = 0
+        ADMISSION_LIMIT.set(self.limit)
+        app.extensions["admission"] = self
+
+        if self.enabled:
+            app.before_request(self._before_request)
+            app.teardown_request(self._teardown_request)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"limit": round(self.limit, 2), "in_flight": self.in_flight}
+
+    def admit(self, priority: str, queue_ms: float | None) -> str | None:
+        """Reserve an in-flight slot, or return the reason the request is shed."""
+        with self._lock:
+            if queue_ms is not None and queue_ms > (
+                self.queue_target_ms * QUEUE_FACTOR[priority]
+            ):
+                reason = "queue_time"
+            elif self.in_flight >= max(
+                self.min_limit, self.limit * CONCURRENCY_SHARE[priority]
+            ):
+                reason = "concurrency"
+            else:
+                self.in_flight += 1
+                ADMISSION_DECISIONS.labels(priority, "admitted", "none").inc()
+                return None
+
+        # The limit is left alone: shedding a request says nothing about how
+        # long admitted ones queue, and a client could otherwise push it down
+        ADMISSION_DECISIONS.labels(priority, "shed", reason).inc()
+        return reason
+
+    def release(self, queue_ms: float | None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if queue_ms is not None and queue_ms > self.queue_target_ms:
+                self._decrease(time.monotonic())
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            ADMISSION_LIMIT.set(self.limit)
+
+    def _decrease(self, now: float) -> None:
+        if now - self._last_decrease < DECREASE_INTERVAL:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+
+    def _before_request(self):
+        view = current_app.view_functions.get(request.endpoint)
+        priority = getattr(view, "admission_priority", None)
+        if priority is None:
+            priority = NORMAL if request.method in ("GET", "HEAD") else HIGH
+
+        queue_ms = None
+        if self.trust_request_start:
+            queue_ms = parse_request_start(
+                request.headers.get("X-Request-Start"), time.time()
+            )
+        reason = self.admit(priority, queue_ms)
+        if reason is None:
+            g.admission_queue_ms = queue_ms
+            return None
+
+        logger.info(
+            "Shed %s %s (priority=%s, reason=%s, queue_ms=%s, limit=%.1f)",
+            request.method,
+            request.path,
+            priority,
+            reason,
+            None if queue_ms is None else round(queue_ms),
+            self.limit,
+        )
+        response = jsonify(
+            ErrorResponse(
+                error="overloaded",
+                message="Server is overloaded, retry later",
+            ).model_dump()
+        )
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+
+    def _teardown_request(self, exc):
+        if "admission_queue_ms" in g:
+            self.release(g.pop("admission_queue_ms"))
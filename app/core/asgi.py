@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+from app.core.database import get_async_engine
+from app.core.events import broker
+
+# The plain function behind asgiref's @sync_to_async-decorated method
+_run_wsgi_app = WsgiToAsgiInstance.__dict__["run_wsgi_app"].func
+
+
+class _ThreadPoolInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(
+            _run_wsgi_app, thread_sensitive=False, executor=self.executor
+        )(self, body)
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """Serve a Flask app over ASGI with requests handled concurrently.
+
+    asgiref's ``WsgiToAsgi`` runs every request on one shared thread. Here each
+    request gets a pool thread, and the async views it awaits run on the
+    server's event loop. A request waiting on the database holds an idle
+    thread, not a process, and its query overlaps with the others.
+
+    ``routes`` maps exact paths to native ASGI apps that bypass Flask and the
+    thread pool, for responses that stay open such as event streams.
+    """
+
+    def __init__(self, wsgi_application, threads: int, routes: dict | None = None):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="asgi")
+        self.routes = routes or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        route = self.routes.get(scope["path"]) if scope["type"] == "http" else None
+        if route is not None:
+            await route(scope, receive, send)
+            return
+        await _ThreadPoolInstance(self.wsgi_application, self.executor)(
+            scope, receive, send
+        )
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                broker.close()
+                await get_async_engine().dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -22,6 +22,118 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(
         seconds=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES", "604800"))
     )
+    # HS256 signs with JWT_SECRET_KEY; RS256/EdDSA publish every <kid>.pem in
+    # JWT_KEYS_DIR as JWKS and sign with JWT_ACTIVE_KID, or else the newest key
+    # whose file is older than 2 * JWKS_MAX_AGE (the JWKS cache lifetime)
+    JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+    JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "./keys")
+    JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID") or None
+    JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "3600"))
+    # Verified tokens cached per worker; 0 disables the cache
+    JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "1024"))
+
+    # Rate limiting - "memory://" (per worker) or "sqlite:///<path>" (shared by
+    # all workers on the host). RATE_LIMITS overrides per scope, e.g.
+    # "auth.login=20/minute,todos=off"
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMIT_STORAGE_URL = os.getenv("RATE_LIMIT_STORAGE_URL", "memory://")
+    RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+
+    # Prometheus metrics at /metrics. Under gunicorn also set
+    # PROMETHEUS_MULTIPROC_DIR to an empty directory so workers are aggregated
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+    # Query log - fraction of requests whose SQL is recorded, logged when a
+    # statement is slow or a statement shape repeats (N+1 suspect)
+    QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "0.1"))
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+    N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "3"))
+
+    # Profiling - requests sent with "X-Profile: <PROFILE_TOKEN>" or sampled at
+    # PROFILE_SAMPLE_RATE are profiled into PROFILE_DIR/<endpoint>/. PROFILER is
+    # "sampling" (collapsed stacks for flamegraphs) or "cprofile" (pstats)
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILER = os.getenv("PROFILER", "sampling")
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+
+    # Tracing - spans for JWT decode, validation, service calls, SQL and
+    # serialization, appended as NDJSON to TRACE_EXPORT_PATH. Incoming sampled
+    # W3C traceparent headers are always traced when enabled
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "./traces.ndjson")
+
+    # Append every API request (tokens and ids templated) to this JSONL file for
+    # replay with tests/benchmarks/bench_load.py; empty disables recording
+    REQUEST_RECORD_PATH = os.getenv("REQUEST_RECORD_PATH", "")
+
+    # Admission control - shed low-priority requests first once requests queue
+    # (per X-Request-Start) longer than the target or in-flight hits the limit
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+    ADMISSION_QUEUE_TARGET_MS = int(os.getenv("ADMISSION_QUEUE_TARGET_MS", "100"))
+    ADMISSION_MIN_LIMIT = int(os.getenv("ADMISSION_MIN_LIMIT", "1"))
+    ADMISSION_MAX_LIMIT = int(os.getenv("ADMISSION_MAX_LIMIT", "32"))
+
+    # Readiness - /ready reports the result of a background DB probe run every
+    # READY_PROBE_INTERVAL seconds; older than READY_MAX_AGE counts as failing
+    READY_PROBE_INTERVAL = float(os.getenv("READY_PROBE_INTERVAL", "2"))
+    READY_MAX_AGE = float(os.getenv("READY_MAX_AGE", "10"))
+
+    # Startup optimization - build the docs UI on its first request, and under
+    # gunicorn preload the app in the master and warm pool connections, the
+    # statement cache and validators in each worker before it takes traffic
+    FAST_STARTUP = os.getenv("FAST_STARTUP", "0") == "1"
+
+    # ASGI mode (asgi.py) - threads serving requests concurrently in one
+    # process; async views await the database on the server's event loop
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "64"))
+
+    # Todo event streams (/api/v1/todos/stream) - directory of UNIX sockets that
+    # fans events out between processes on one host (empty: this process only),
+    # seconds between keepalive comments, and the client reconnect delay
+    EVENTS_SOCKET_DIR = os.getenv("EVENTS_SOCKET_DIR", "")
+    SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+    # Archive tier - `manage.py archive` moves todos completed more than this
+    # many days ago into archived_todos, this many rows per transaction
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+    # Seconds between archive runs by `manage.py worker` (0: never)
+    ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+    # Background jobs (`manage.py worker`) - worker threads, seconds an idle
+    # thread waits before polling again, seconds a claimed job stays hidden
+    # from other workers, first retry delay (doubling per attempt, capped),
+    # attempts before a job fails, and days finished jobs are kept
+    JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "4"))
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+    JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+    # Todo exports (/api/v1/todos/exports) - directory the worker writes the
+    # gzipped NDJSON files to (shared with the API processes), rows fetched
+    # per round trip, and hours a finished file stays downloadable
+    EXPORT_DIR = os.getenv("EXPORT_DIR", "./exports")
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+    EXPORT_RETENTION_HOURS = int(os.getenv("EXPORT_RETENTION_HOURS", "24"))
+
+    # Sharding - comma-separated URLs of extra databases for todo data. Shard 0
+    # is DATABASE_URL, which also keeps users, jobs and the user_shards
+    # directory. Each process caches a user's shard this many seconds, and
+    # reserves this many todo ids at a time
+    SHARD_URLS = os.getenv("SHARD_URLS", "")
+    SHARD_CACHE_SECONDS = float(os.getenv("SHARD_CACHE_SECONDS", "5"))
+    TODO_ID_BLOCK_SIZE = int(os.getenv("TODO_ID_BLOCK_SIZE", "100"))
+
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is trusted;
+    # with any, admission control also trusts their X-Request-Start
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
 
     # CORS - comma-separated list of allowed origins, or "*" for all
     CORS_ORIGINS: str | list[str] = os.getenv("CORS_ORIGINS", "*")
@@ -35,3 +147,8 @@ class Config:
         if "," in origins:
             return [o.strip() for o in origins.split(",")]
         return origins
+
+    @classmethod
+    def get_shard_urls(cls) -> list[str]:
+        """Parse SHARD_URLS into a list, in shard order starting at shard 1."""
+        return [url.strip() for url in cls.SHARD_URLS.split(",") if url.strip()]
@@ -1,9 +1,299 @@
-from sqlmodel import Session, create_engine
+import asyncio
+import bisect
+import hashlib
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from sqlalchemy import event, func, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import Config
+from app.models import ArchivedTodo, IdBlock, Todo, User, UserShard
 
 engine = create_engine(Config.DATABASE_URL, echo=Config.DEBUG)
 
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+_async_engine: AsyncEngine | None = None
+
+RING_POINTS = 64  # Points per shard on the hash ring
+SHARD_CACHE_LIMIT = 100_000
+
 
 def get_session() -> Session:
     return Session(engine)
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver in a database URL for its asyncio counterpart."""
+    backend, _, rest = url.partition("://")
+    dialect = backend.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for {backend}")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the asyncio engine, creating it on first use.
+
+    Sync deployments never call this, so they never load aiosqlite or asyncpg.
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_url(Config.DATABASE_URL), echo=Config.DEBUG
+        )
+    return _async_engine
+
+
+def get_async_session() -> AsyncSession:
+    return AsyncSession(get_async_engine())
+
+
+class ShardMoving(Exception):
+    """The user's todos are being moved to another shard; retry shortly."""
+
+
+@dataclass(frozen=True)
+class ShardLocation:
+    shard: int
+    moving: bool = False
+
+
+class HashRing:
+    """Consistent hashing of user ids onto ``shards`` shards.
+
+    Adding a shard hands it about ``1/shards`` of the users and moves nobody
+    else, so a rebalance copies as little as possible.
+    """
+
+    def __init__(self, shards: int):
+        points = sorted(
+            (self._hash(f"shard-{shard}-{i}"), shard)
+            for shard in range(shards)
+            for i in range(RING_POINTS)
+        )
+        self._keys = [key for key, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+    def shard_for(self, user_id: int) -> int:
+        i = bisect.bisect(self._keys, self._hash(str(user_id))) % len(self._keys)
+        return self._shards[i]
+
+
+class ShardRouter:
+    """Routes each user's todo data to one of several databases.
+
+    Shard 0 is the main database, which also keeps users, jobs and the
+    ``user_shards`` directory saying where each user's todos are; users
+    without a row are on shard 0. New users are placed by a :class:`HashRing`.
+    Each shard has the full schema and a copy of its users' ``users`` rows,
+    whose ``change_seq`` counts that user's writes there.
+
+    Directory lookups are cached per process for ``cache_seconds``, which is
+    how long ``manage.py reshard`` waits for every process to see a move.
+    Todo ids are handed out in blocks by the main database, so they stay
+    unique when todos move. With no extra shards nothing is looked up and
+    every session is a plain session on the main database.
+    """
+
+    def __init__(self, main: Engine, urls: Sequence[str] = ()):
+        self.main = main
+        self.cache_seconds = Config.SHARD_CACHE_SECONDS
+        self.id_block_size = Config.TODO_ID_BLOCK_SIZE
+        self._lock = threading.Lock()
+        self._instruments: list[Callable[[Engine], None]] = []
+        self.configure(urls)
+
+    def configure(self, urls: Sequence[str]) -> None:
+        """Use the main database plus a shard for each of ``urls``."""
+        self.urls = list(urls)
+        self.engines = [
+            self.main,
+            *(create_engine(url, echo=Config.DEBUG) for url in self.urls),
+        ]
+        self.ring = HashRing(len(self.engines))
+        self._locations: dict[int, tuple[float, ShardLocation]] = {}
+        self._async_engines: dict[int, AsyncEngine] = {}
+        self._next_id = self._id_limit = 0
+        for shard_engine in self.engines[1:]:
+            for hook in self._instruments:
+                hook(shard_engine)
+
+    def instrument(self, hook: Callable[[Engine], None]) -> None:
+        """Run ``hook`` on every engine now and on shards configured later."""
+        if hook not in self._instruments:
+            self._instruments.append(hook)
+        for shard_engine in self.engines:
+            hook(shard_engine)
+
+    @property
+    def sharded(self) -> bool:
+        return len(self.engines) > 1
+
+    def locate(self, user_id: int, cached: bool = True) -> ShardLocation:
+        if not self.sharded:
+            return ShardLocation(0)
+        now = time.monotonic()
+        if cached and (location := self._cached(user_id, now)) is not None:
+            return location
+        with Session(self.main) as session:
+            row = session.get(UserShard, user_id)
+        location = ShardLocation(row.shard, row.moving) if row else ShardLocation(0)
+        if len(self._locations) >= SHARD_CACHE_LIMIT:
+            self._locations.clear()
+        self._locations[user_id] = (now + self.cache_seconds, location)
+        return location
+
+    def _cached(self, user_id: int, now: float) -> ShardLocation | None:
+        expires, location = self._locations.get(user_id, (0.0, None))
+        return location if expires > now else None
+
+    def forget(self, user_id: int) -> None:
+        self._locations.pop(user_id, None)
+
+    def session(self, user_id: int, write: bool = False) -> Session:
+        """A session on the shard holding ``user_id``'s todos.
+
+        With ``write``, raises :class:`ShardMoving` while they are being moved.
+        """
+        if not self.sharded:
+            return Session(self.main)
+        location = self.locate(user_id)
+        if write:
+            self._check_write(location)
+            self._ensure_ids()
+        return Session(self.engines[location.shard], info={"shard_router": self})
+
+    def _check_write(self, location: ShardLocation) -> None:
+        if location.moving:
+            raise ShardMoving()
+
+    @asynccontextmanager
+    async def async_session(
+        self, user_id: int, write: bool = False
+    ) -> AsyncIterator[AsyncSession]:
+        """:meth:`session` for async views."""
+        if not self.sharded:
+            async with AsyncSession(get_async_engine()) as session:
+                yield session
+            return
+        # Directory lookups and id reservations block, so run them in a thread
+        location = self._cached(user_id, time.monotonic())
+        if location is None:
+            location = await asyncio.to_thread(self.locate, user_id)
+        if write:
+            self._check_write(location)
+            if self._next_id >= self._id_limit:
+                await asyncio.to_thread(self._ensure_ids)
+        async with AsyncSession(
+            self.async_engine(location.shard), info={"shard_router": self}
+        ) as session:
+            yield session
+
+    def async_engine(self, shard: int) -> AsyncEngine:
+        if shard == 0:
+            return get_async_engine()
+        if shard not in self._async_engines:
+            self._async_engines[shard] = create_async_engine(
+                async_database_url(self.urls[shard - 1]), echo=Config.DEBUG
+            )
+        return self._async_engines[shard]
+
+    def add_user(self, session: Session, user: User) -> None:
+        """Place a new, flushed user on a shard in ``session``'s transaction.
+
+        ``session`` is on the main database; the caller commits it.
+        """
+        shard = self.place_user(session, user)
+        if shard:
+            self.copy_user(shard, user)
+
+    def place_user(self, session: Session | AsyncSession, user: User) -> int:
+        """Add ``user``'s directory row to ``session`` and return its shard."""
+        if not self.sharded:
+            return 0
+        shard = self.ring.shard_for(user.id)
+        session.add(UserShard(user_id=user.id, shard=shard))
+        return shard
+
+    def copy_user(self, shard: int, user: User) -> None:
+        """Write ``user``'s row to ``shard``; blocks, so async callers use a thread."""
+        with Session(self.engines[shard]) as shard_session:
+            # A row left by a registration rolled back after this point
+            # may hold the id; replace it
+            shard_session.merge(User(**user.model_dump()))
+            shard_session.commit()
+
+    def next_todo_id(self) -> int:
+        with self._lock:
+            if self._next_id >= self._id_limit:
+                self._reserve_ids()
+            todo_id = self._next_id
+            self._next_id += 1
+            return todo_id
+
+    def _ensure_ids(self) -> None:
+        # Reserve before a write transaction opens: reserving inside one
+        # would wait on its own lock when the user is on SQLite shard 0
+        with self._lock:
+            if self._next_id >= self._id_limit:
+                self._reserve_ids()
+
+    def _reserve_ids(self) -> None:
+        ids = self.claim_ids(self.id_block_size)
+        self._next_id, self._id_limit = ids.start, ids.stop
+
+    def claim_ids(self, count: int) -> range:
+        """Take ``count`` todo ids that no other process will hand out."""
+        with Session(self.main) as session:
+            limit = session.exec(
+                update(IdBlock)
+                .where(IdBlock.name == "todos")
+                .values(next_id=IdBlock.next_id + count)
+                .returning(IdBlock.next_id)
+            ).scalar_one_or_none()
+            if limit is None:
+                # First block: start above every id handed out before sharding
+                limit = self._highest_todo_id() + 1 + count
+                session.add(IdBlock(name="todos", next_id=limit))
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another process created the row first
+                session.rollback()
+                return self.claim_ids(count)
+        return range(limit - count, limit)
+
+    def _highest_todo_id(self) -> int:
+        highest = 0
+        for shard_engine in self.engines:
+            with Session(shard_engine) as session:
+                for model in (Todo, ArchivedTodo):
+                    top = session.exec(select(func.max(model.id))).one()
+                    highest = max(highest, top or 0)
+        return highest
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_todo_ids(session: Session, flush_context, instances) -> None:
+    """Give new todos in router sessions an id from the shared blocks."""
+    router = session.info.get("shard_router")
+    if router is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, Todo) and obj.id is None:
+            obj.id = router.next_todo_id()
+
+
+router = ShardRouter(engine, Config.get_shard_urls())
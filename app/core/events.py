@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+import uuid
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+
+from flask import Flask
+
+QUEUE_SIZE = 1000  # events buffered per stream before it falls back to a catch-up
+RECEIVE_BUFFER = 1 << 20
+MAX_DATAGRAM = 1 << 16
+
+
+@dataclass(frozen=True)
+class TodoEvent:
+    user_id: int
+    id: int  # The todo's change_seq after the write
+    type: str  # created, updated, toggled or deleted
+    data: dict
+
+    def encode(self) -> bytes:
+        return json.dumps(asdict(self), separators=(",", ":")).encode()
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "TodoEvent":
+        return cls(**json.loads(payload))
+
+
+class Subscription:
+    """One stream's queue of events, filled from any thread."""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue[TodoEvent] = asyncio.Queue(QUEUE_SIZE)
+        # Set when an event was dropped; the stream then reloads from the feed
+        self.lagged = False
+
+    def put(self, event: TodoEvent) -> None:
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: TodoEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+
+class EventBroker:
+    """Publishes todo events to the streams subscribed in any local process.
+
+    Subscribers in this process are handed events directly. With
+    ``EVENTS_SOCKET_DIR`` set, each process that has subscribers also binds a
+    UNIX datagram socket in that directory, and every publish is sent to all
+    sockets there. Processes without subscribers, such as sync gunicorn
+    workers, only send. A datagram can be dropped when a receiver is behind;
+    streams notice the gap in event ids and reload from the change feed.
+    """
+
+    def __init__(self):
+        self.socket_dir: str | None = None
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._sender: socket.socket | None = None
+        self._receiver: socket.socket | None = None
+        self._address: str | None = None
+        self._pid = None
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("EVENTS_SOCKET_DIR", "")
+        app.config.setdefault("SSE_HEARTBEAT_SECONDS", 15.0)
+        app.config.setdefault("SSE_RETRY_MS", 3000)
+        self.socket_dir = app.config["EVENTS_SOCKET_DIR"] or None
+        app.extensions["events"] = self
+
+    def has_listeners(self, user_id: int) -> bool:
+        """Whether publishing for this user can reach anyone."""
+        return self.socket_dir is not None or user_id in self._subscribers
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Subscribe the running event loop to ``user_id``'s events."""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(user_id, loop)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        if self.socket_dir is not None:
+            self._listen(loop)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscribers.pop(subscription.user_id, None)
+
+    def publish(self, event: TodoEvent) -> None:
+        self.deliver(event)
+        if self.socket_dir is not None:
+            self._fan_out(event.encode())
+
+    def deliver(self, event: TodoEvent) -> None:
+        """Hand an event to this process's subscribers."""
+        with self._lock:
+            subscriptions = list(self._subscribers.get(event.user_id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def close(self) -> None:
+        if self._receiver is not None:
+            with suppress(Exception):
+                asyncio.get_running_loop().remove_reader(self._receiver.fileno())
+            self._receiver.close()
+            with suppress(FileNotFoundError):
+                os.unlink(self._address)
+        self._receiver = self._address = None
+
+    def _fan_out(self, payload: bytes) -> None:
+        try:
+            names = os.listdir(self.socket_dir)
+        except FileNotFoundError:
+            return
+        if self._sender is None or self._pid != os.getpid():
+            # Forked workers must not share the parent's socket
+            self._pid = os.getpid()
+            self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sender.setblocking(False)
+        for name in names:
+            path = os.path.join(self.socket_dir, name)
+            if not name.endswith(".sock") or path == self._address:
+                continue
+            try:
+                self._sender.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a process that exited without closing
+                with suppress(FileNotFoundError):
+                    os.unlink(path)
+            except BlockingIOError:
+                # The receiver is behind; its streams reload the gap
+                pass
+
+    def _listen(self, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            if self._receiver is not None:
+                return
+            os.makedirs(self.socket_dir, exist_ok=True)
+            address = os.path.join(
+                self.socket_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+            )
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+            receiver.setblocking(False)
+            receiver.bind(address)
+            self._receiver, self._address = receiver, address
+        loop.add_reader(receiver.fileno(), self._receive)
+
+    def _receive(self) -> None:
+        while self._receiver is not None:
+            try:
+                payload = self._receiver.recv(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            self.deliver(TodoEvent.decode(payload))
+
+
+broker = EventBroker()
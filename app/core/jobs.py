@@ -0,0 +1,314 @@
+import importlib
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.core.config import Config
+from app.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Modules whose tasks the worker loads
+TASK_MODULES = (
+    "app.core.jobs",
+    "app.services.archive_service",
+    "app.services.export_service",
+)
+CLAIM_CANDIDATES = 10
+CLAIMABLE = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    fn: Callable[..., Any]
+    every: float | None  # Seconds between periodic runs
+    timeout: int  # Visibility timeout in seconds
+    max_attempts: int
+
+
+tasks: dict[str, Task] = {}
+
+
+def task(
+    name: str,
+    *,
+    every: float | None = None,
+    timeout: int | None = None,
+    max_attempts: int | None = None,
+):
+    """Register ``fn(session, **payload)`` as the task ``name``.
+
+    With ``every``, the worker also runs it once per ``every`` seconds. What
+    ``fn`` returns is stored on the job as JSON.
+    """
+
+    def register(fn):
+        tasks[name] = Task(
+            name,
+            fn,
+            every or None,
+            timeout or Config.JOB_VISIBILITY_TIMEOUT,
+            max_attempts or Config.JOB_MAX_ATTEMPTS,
+        )
+        return fn
+
+    return register
+
+
+def enqueue(
+    session: Session,
+    name: str,
+    payload: dict | None = None,
+    *,
+    delay: float = 0,
+    run_at: datetime | None = None,
+) -> Job:
+    """Add a job for task ``name`` to ``session``.
+
+    Nothing runs until the caller commits, so the job exists exactly when the
+    work that asked for it does.
+    """
+    if name not in tasks:
+        raise LookupError(f"No task named {name}")
+    job = Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        max_attempts=tasks[name].max_attempts,
+        run_at=run_at or datetime.now(timezone.utc) + timedelta(seconds=delay),
+    )
+    session.add(job)
+    return job
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter, so jobs that failed together spread out."""
+    delay = min(
+        Config.JOB_RETRY_MAX_SECONDS,
+        Config.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+    )
+    return random.uniform(delay / 2, delay)
+
+
+class Worker:
+    """Runs due jobs on a pool of threads.
+
+    Any number of workers, in any number of processes, can share the table.
+    A job is claimed by bumping its attempt count with a compare-and-set, so
+    each attempt runs once. A claimed job stays hidden for its task's
+    visibility timeout; if the worker dies, the job is claimed again after.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        threads: int | None = None,
+        poll_seconds: float | None = None,
+    ):
+        for module in TASK_MODULES:
+            importlib.import_module(module)
+        self.engine = engine
+        self.threads = threads or Config.JOB_WORKER_THREADS
+        self.poll_seconds = (
+            Config.JOB_POLL_SECONDS if poll_seconds is None else poll_seconds
+        )
+        self._stop = threading.Event()
+        self._scheduled: dict[str, int] = {}
+
+    def run(self) -> None:
+        """Work until :meth:`stop` or Ctrl-C, then let running jobs finish."""
+        threads = [
+            threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+        for thread in threads:
+            thread.join()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.work_one():
+                    continue
+                self.schedule_periodic()
+            except Exception:
+                # e.g. the database is down; try again after the poll interval
+                logger.exception("Job worker error")
+            self._stop.wait(self.poll_seconds)
+
+    def work_one(self) -> bool:
+        """Claim and run one due job; ``False`` when none is due."""
+        job = self.claim()
+        if job is None:
+            return False
+        self.execute(job)
+        return True
+
+    def claim(self) -> Job | None:
+        now = datetime.now(timezone.utc)
+        with Session(self.engine, expire_on_commit=False) as session:
+            candidates = session.exec(
+                select(Job)
+                .where(Job.status.in_(CLAIMABLE), Job.run_at <= now)
+                .order_by(Job.run_at)
+                .limit(CLAIM_CANDIDATES)
+            ).all()
+            for job in candidates:
+                seen = job.attempts
+                claimed = (
+                    update(Job)
+                    .where(
+                        Job.id == job.id,
+                        Job.attempts == seen,
+                        Job.status.in_(CLAIMABLE),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if seen >= job.max_attempts:
+                    # Its last attempt outlived the visibility timeout
+                    session.exec(
+                        claimed.values(
+                            status=JobStatus.FAILED,
+                            last_error="Visibility timeout expired",
+                            finished_at=now,
+                        )
+                    )
+                    session.commit()
+                    continue
+
+                spec = tasks.get(job.name)
+                timeout = spec.timeout if spec else Config.JOB_VISIBILITY_TIMEOUT
+                result = session.exec(
+                    claimed.values(
+                        status=JobStatus.RUNNING,
+                        attempts=seen + 1,
+                        run_at=now + timedelta(seconds=timeout),
+                    )
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    session.refresh(job)
+                    return job
+        return None
+
+    def execute(self, job: Job) -> None:
+        spec = tasks.get(job.name)
+        try:
+            if spec is None:
+                raise LookupError(f"No task named {job.name}")
+            with Session(self.engine) as session:
+                result = spec.fn(session, **json.loads(job.payload))
+        except Exception as e:
+            logger.exception(
+                "Job %s (%s) failed on attempt %d", job.id, job.name, job.attempts
+            )
+            self.fail(job, f"{type(e).__name__}: {e}"[:1000])
+        else:
+            self._finish(
+                job,
+                status=JobStatus.DONE,
+                result=None if result is None else json.dumps(result),
+                last_error=None,
+                finished_at=datetime.now(timezone.utc),
+            )
+
+    def fail(self, job: Job, error: str) -> None:
+        now = datetime.now(timezone.utc)
+        if job.attempts >= job.max_attempts:
+            self._finish(
+                job, status=JobStatus.FAILED, last_error=error, finished_at=now
+            )
+        else:
+            self._finish(
+                job,
+                status=JobStatus.QUEUED,
+                last_error=error,
+                run_at=now + timedelta(seconds=retry_delay(job.attempts)),
+            )
+
+    def _finish(self, job: Job, **values) -> bool:
+        """Record the outcome unless the job was claimed again meanwhile."""
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(Job)
+                .where(
+                    Job.id == job.id,
+                    Job.attempts == job.attempts,
+                    Job.status == JobStatus.RUNNING,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+        if result.rowcount != 1:
+            logger.warning(
+                "Job %s (%s) outlived its visibility timeout", job.id, job.name
+            )
+        return result.rowcount == 1
+
+    def schedule_periodic(self) -> None:
+        """Queue the current interval's run of each periodic task.
+
+        The job key is the task and interval, so however many workers try,
+        each interval gets one run.
+        """
+        now = time.time()
+        for spec in tasks.values():
+            if spec.every is None:
+                continue
+            slot = int(now // spec.every)
+            if self._scheduled.get(spec.name) == slot:
+                continue
+            key = f"{spec.name}:{slot}"
+            with Session(self.engine) as session:
+                if session.exec(select(Job.id).where(Job.key == key)).first() is None:
+                    session.add(
+                        Job(
+                            name=spec.name,
+                            key=key,
+                            max_attempts=spec.max_attempts,
+                            run_at=datetime.fromtimestamp(
+                                slot * spec.every, timezone.utc
+                            ),
+                        )
+                    )
+                    try:
+                        session.commit()
+                    except IntegrityError:
+                        # Another worker queued it first
+                        session.rollback()
+            self._scheduled[spec.name] = slot
+
+
+@task("prune_jobs", every=24 * 60 * 60)
+def prune_jobs(session: Session) -> int:
+    """Delete jobs that finished more than ``JOB_RETENTION_DAYS`` ago."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=Config.JOB_RETENTION_DAYS)
+    result = session.exec(
+        delete(Job).where(
+            Job.status.in_((JobStatus.DONE, JobStatus.FAILED)),
+            Job.finished_at < cutoff,
+        )
+    )
+    session.commit()
+    return result.rowcount
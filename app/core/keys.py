@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from flask import Flask, current_app
+from flask_jwt_extended import JWTManager
+from flask_jwt_extended.config import config as jwt_config
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from jwt.exceptions import InvalidTokenError
+
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+ASYMMETRIC_ALGORITHMS = {
+    "RS256": rsa.RSAPrivateKey,
+    "EdDSA": ed25519.Ed25519PrivateKey,
+}
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+
+def write_private_key(keys_dir: str, algorithm: str) -> str:
+    """Generate a key named after the current UTC time and return its kid."""
+    os.makedirs(keys_dir, exist_ok=True)
+    kid = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    pem = generate_private_key(algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return kid
+
+
+class KeyRing:
+    """Private signing keys for one algorithm, indexed by key id (kid).
+
+    The active key signs new tokens; every key in the ring is accepted for
+    verification and published in the JWKS document, so a rotated-out key keeps
+    validating tokens until it is removed from the keys directory.
+    """
+
+    def __init__(self, algorithm: str, private_keys: dict, active_kid: str):
+        if active_kid not in private_keys:
+            raise RuntimeError(f"JWT_ACTIVE_KID {active_kid!r} not found in key ring")
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self._private_keys = private_keys
+        self._public_keys = {kid: key.public_key() for kid, key in private_keys.items()}
+        self.jwks_body = json.dumps(self.jwks(), sort_keys=True).encode()
+        self.jwks_etag = hashlib.sha256(self.jwks_body).hexdigest()[:32]
+
+    @classmethod
+    def from_directory(
+        cls,
+        algorithm: str,
+        keys_dir: str,
+        active_kid: str | None = None,
+        publish_seconds: float = 0,
+    ) -> "KeyRing":
+        """Load every ``<kid>.pem`` in ``keys_dir``.
+
+        Without ``active_kid``, the newest key whose file is at least
+        ``publish_seconds`` old signs, so verifiers holding a cached JWKS
+        already have it. Until a key qualifies, the oldest one signs.
+        """
+        key_type = ASYMMETRIC_ALGORITHMS[algorithm]
+        try:
+            filenames = sorted(f for f in os.listdir(keys_dir) if f.endswith(".pem"))
+        except FileNotFoundError:
+            filenames = []
+        if not filenames:
+            raise RuntimeError(
+                f"No *.pem signing keys found in JWT_KEYS_DIR ({keys_dir}) "
+                f'for algorithm "{algorithm}"'
+            )
+
+        private_keys = {}
+        published = []
+        cutoff = time.time() - publish_seconds
+        for filename in filenames:
+            path = os.path.join(keys_dir, filename)
+            with open(path, "rb") as f:
+                key = serialization.load_pem_private_key(f.read(), password=None)
+            if not isinstance(key, key_type):
+                raise RuntimeError(f'{filename} is not a valid "{algorithm}" key')
+            kid = filename.removesuffix(".pem")
+            private_keys[kid] = key
+            if os.path.getmtime(path) <= cutoff:
+                published.append(kid)
+
+        # Filenames are UTC timestamps, so the last one is the newest key
+        if active_kid is None:
+            active_kid = max(published) if published else min(private_keys)
+        return cls(algorithm, private_keys, active_kid)
+
+    @property
+    def signing_key(self):
+        return self._private_keys[self.active_kid]
+
+    def verification_key(self, kid: str | None):
+        key = self._public_keys.get(kid)
+        if key is None:
+            raise InvalidTokenError("Unknown signing key")
+        return key
+
+    def jwks(self) -> dict:
+        to_jwk = (
+            RSAAlgorithm.to_jwk if self.algorithm == "RS256" else OKPAlgorithm.to_jwk
+        )
+        keys = []
+        for kid, public_key in sorted(self._public_keys.items()):
+            jwk = to_jwk(public_key, as_dict=True)
+            jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+def get_keyring() -> KeyRing | None:
+    return current_app.extensions.get("jwt_keyring")
+
+
+def init_keyring(app: Flask, manager: JWTManager) -> None:
+    """Load the key ring for asymmetric algorithms and route JWT keys through it.
+
+    With a symmetric algorithm no key ring is loaded and the loaders fall back
+    to flask-jwt-extended's own secret-key handling.
+    """
+    algorithm = app.config["JWT_ALGORITHM"]
+    if algorithm in SYMMETRIC_ALGORITHMS:
+        app.extensions["jwt_keyring"] = None
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        app.extensions["jwt_keyring"] = KeyRing.from_directory(
+            algorithm,
+            app.config["JWT_KEYS_DIR"],
+            app.config["JWT_ACTIVE_KID"],
+            # /.well-known/jwks.json may be served from cache for max-age plus
+            # stale-while-revalidate
+            publish_seconds=2 * app.config["JWKS_MAX_AGE"],
+        )
+    else:
+        raise RuntimeError(f'Unsupported JWT_ALGORITHM "{algorithm}"')
+
+    @manager.encode_key_loader
+    def encode_key(identity):
+        keyring = get_keyring()
+        return keyring.signing_key if keyring else jwt_config.encode_key
+
+    @manager.decode_key_loader
+    def decode_key(jwt_header, jwt_data):
+        keyring = get_keyring()
+        if keyring is None:
+            return jwt_config.decode_key
+        return keyring.verification_key(jwt_header.get("kid"))
+
+    @manager.additional_headers_loader
+    def additional_headers(identity):
+        keyring = get_keyring()
+        return {"kid": keyring.active_kid} if keyring else {}
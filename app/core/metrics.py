@@ -0,0 +1,184 @@
+import os
+import time
+
+from flask import Flask, Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, default
+from sqlalchemy.pool import Pool
+
+from app.core.database import ShardRouter
+
+# Under gunicorn, PROMETHEUS_MULTIPROC_DIR must be set before this module is
+# imported; each worker then writes its samples to mmap-backed files there and
+# /metrics sums them across workers.
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+REQUEST_SQL_QUERIES = Histogram(
+    "http_request_sql_queries",
+    "SQL statements issued per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds",
+    "Time spent in SQL statements per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+SQL_COMPILED_CACHE = Counter(
+    "sql_compiled_cache_total",
+    "SQL statements by SQLAlchemy compiled-cache outcome",
+    ["result"],
+)
+STATEMENT_CACHE = Counter(
+    "statement_cache_total",
+    "Prebuilt statement lookups (app.core.statement_cache)",
+    ["cache", "result"],
+)
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total",
+    "Admission control decisions (app.core.admission)",
+    ["priority", "result", "reason"],
+)
+ADMISSION_LIMIT = Gauge(
+    "admission_limit",
+    "Adaptive in-flight limit of each worker's admission controller",
+    multiprocess_mode="liveall",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+
+def _route() -> str:
+    # The URL rule keeps label cardinality bounded (no ids in the path)
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if has_request_context() and "metrics_started" in g:
+        g.metrics_sql_started = time.perf_counter()
+
+
+COMPILED_CACHE_RESULTS = {
+    default.CACHE_HIT: SQL_COMPILED_CACHE.labels("hit"),
+    default.CACHE_MISS: SQL_COMPILED_CACHE.labels("miss"),
+}
+UNCACHED = SQL_COMPILED_CACHE.labels("uncached")
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    # Raw SQL and statements with caching disabled count as "uncached"
+    COMPILED_CACHE_RESULTS.get(getattr(context, "cache_hit", None), UNCACHED).inc()
+    if has_request_context() and "metrics_sql_started" in g:
+        g.metrics_sql_queries += 1
+        g.metrics_sql_seconds += time.perf_counter() - g.pop("metrics_sql_started")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count SQL statements per request and time pool checkouts on ``engine``."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "engine_disposed", _engine_disposed)
+    _time_checkouts(engine.pool)
+
+
+def _time_checkouts(pool: Pool) -> None:
+    # The pool has no "before checkout" event, so time the blocking get itself
+    do_get = pool._do_get
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+
+
+def _engine_disposed(engine: Engine) -> None:
+    # dispose() swaps in a new pool, as gunicorn's post_fork does in workers
+    _time_checkouts(engine.pool)
+
+
+def _before_request():
+    IN_FLIGHT.inc()
+    g.metrics_started = time.perf_counter()
+    g.metrics_sql_queries = 0
+    g.metrics_sql_seconds = 0.0
+
+
+def _after_request(response):
+    if "metrics_started" in g:
+        route = _route()
+        REQUESTS.labels(request.method, route, response.status_code).inc()
+        REQUEST_LATENCY.labels(request.method, route).observe(
+            time.perf_counter() - g.metrics_started
+        )
+        REQUEST_SQL_QUERIES.labels(route).observe(g.metrics_sql_queries)
+        REQUEST_SQL_SECONDS.labels(route).observe(g.metrics_sql_seconds)
+    return response
+
+
+def _teardown_request(exc):
+    if g.pop("metrics_started", None) is not None:
+        IN_FLIGHT.dec()
+
+
+def metrics_view():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask, router: ShardRouter) -> None:
+    app.config.setdefault("METRICS_ENABLED", True)
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    router.instrument(instrument_engine)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
+    app.extensions["metrics"] = True
+
+
+def mark_process_dead(pid: int) -> None:
+    """Gunicorn ``child_exit`` hook: drop a dead worker's live gauges."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
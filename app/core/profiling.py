@@ -0,0 +1,138 @@
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Flask, current_app, g, request
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_FILE_HEADER = "X-Profile-File"
+_UNSAFE = re.compile(r"[^\w.\-]")
+
+
+class StackSampler:
+    """Sample one thread's stack on an interval and count collapsed stacks.
+
+    The output is the ``frame;frame;frame count`` format read by flamegraph.pl
+    and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                    f":{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+
+def _should_profile() -> bool:
+    token = current_app.config["PROFILE_TOKEN"]
+    supplied = request.headers.get(PROFILE_HEADER)
+    if token and supplied and hmac.compare_digest(supplied, token):
+        return True
+    return random.random() < current_app.config["PROFILE_SAMPLE_RATE"]
+
+
+def _before_request():
+    if not _should_profile():
+        return
+    if current_app.config["PROFILER"] == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = StackSampler(
+            threading.get_ident(), current_app.config["PROFILE_INTERVAL_MS"] / 1000
+        )
+        profiler.start()
+    g.profiler = profiler
+
+
+def _finish() -> str | None:
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return None
+
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        extension = "pstats"
+    else:
+        profiler.stop()
+        extension = "collapsed"
+
+    route = _UNSAFE.sub("_", request.endpoint or "unmatched")
+    directory = os.path.join(current_app.config["PROFILE_DIR"], route)
+    os.makedirs(directory, exist_ok=True)
+    filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{g.get('request_id', os.getpid())}"
+    path = os.path.join(directory, f"{filename}.{extension}")
+
+    if isinstance(profiler, cProfile.Profile):
+        profiler.dump_stats(path)
+    else:
+        profiler.write(path)
+    return os.path.join(route, f"{filename}.{extension}")
+
+
+def _after_request(response):
+    path = _finish()
+    if path is not None:
+        response.headers[PROFILE_FILE_HEADER] = path
+    return response
+
+
+def _teardown_request(exc):
+    # Requests that raised never reach after_request
+    _finish()
+
+
+def init_profiling(app: Flask) -> None:
+    """Profile requests carrying ``X-Profile: <PROFILE_TOKEN>`` or a sampled share.
+
+    Hooks are only registered when a token or sample rate is configured, so a
+    disabled profiler costs nothing per request. Register this before other
+    extensions: Flask runs after/teardown hooks in reverse order, so the
+    profile then spans every other hook.
+    """
+    app.config.setdefault("PROFILE_TOKEN", "")
+    app.config.setdefault("PROFILE_SAMPLE_RATE", 0.0)
+    app.config.setdefault("PROFILER", "sampling")
+    app.config.setdefault("PROFILE_INTERVAL_MS", 1)
+    app.config.setdefault("PROFILE_DIR", "./profiles")
+    if app.config["PROFILER"] not in ("sampling", "cprofile"):
+        raise RuntimeError(f'Unsupported PROFILER "{app.config["PROFILER"]}"')
+    if not app.config["PROFILE_TOKEN"] and not app.config["PROFILE_SAMPLE_RATE"]:
+        return
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
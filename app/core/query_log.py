@@ -0,0 +1,128 @@
+import logging
+import random
+import re
+import time
+import uuid
+from collections import Counter
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(\?|%\(\w+\)s|:\w+)(\s*,\s*(\?|%\(\w+\)s|:\w+))+\s*\)"
+)
+_VALID_REQUEST_ID = re.compile(r"^[\w.\-]{1,128}$")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so calls differing only in bound values compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+def redact(parameters) -> str:
+    """Describe bound parameters by type only, never by value."""
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+            + "}"
+        )
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"[{len(parameters)} rows]"
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _route() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else request.path
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if has_request_context() and "query_log" in g:
+        g.query_log_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if not has_request_context() or "query_log_started" not in g:
+        return
+    duration_ms = (time.perf_counter() - g.pop("query_log_started")) * 1000
+    g.query_log.append((statement, duration_ms))
+
+    if duration_ms >= current_app.config["SLOW_QUERY_MS"]:
+        logger.warning(
+            "Slow query %.1fms request_id=%s route=%s %s %s params=%s",
+            duration_ms,
+            g.request_id,
+            _route(),
+            request.method,
+            statement_shape(statement),
+            redact(parameters),
+        )
+
+
+def _before_request():
+    incoming = request.headers.get(REQUEST_ID_HEADER, "")
+    g.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+    if random.random() < current_app.config["QUERY_LOG_SAMPLE_RATE"]:
+        g.query_log = []
+
+
+def _after_request(response):
+    response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+    entries = g.pop("query_log", None)
+    if not entries:
+        return response
+
+    threshold = current_app.config["N_PLUS_ONE_THRESHOLD"]
+    shapes = Counter(statement_shape(statement) for statement, _ in entries)
+    for shape, count in shapes.items():
+        if count >= threshold:
+            logger.warning(
+                "N+1 suspect: %d x %s request_id=%s route=%s %s",
+                count,
+                shape,
+                g.request_id,
+                _route(),
+                request.method,
+            )
+
+    logger.debug(
+        "request_id=%s route=%s %s queries=%d sql_ms=%.1f",
+        g.request_id,
+        _route(),
+        request.method,
+        len(entries),
+        sum(duration for _, duration in entries),
+    )
+    return response
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def init_query_log(app: Flask, router: ShardRouter) -> None:
+    """Tag requests with an id and log slow queries and repeated statement shapes.
+
+    Only a ``QUERY_LOG_SAMPLE_RATE`` fraction of requests record statements;
+    the rest pay for one ``random()`` call and the request id.
+    """
+    app.config.setdefault("QUERY_LOG_SAMPLE_RATE", 0.1)
+    app.config.setdefault("SLOW_QUERY_MS", 100)
+    app.config.setdefault("N_PLUS_ONE_THRESHOLD", 3)
+
+    router.instrument(instrument_engine)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
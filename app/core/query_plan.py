@@ -0,0 +1,140 @@
+import itertools
+import json
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import Session
+
+from app.services.auth_service import get_user_by_email, get_user_by_username
+from app.services.export_service import export_rows
+from app.services.todo_service import (
+    SORTABLE_FIELDS,
+    get_todo,
+    list_changes,
+    list_todos,
+    todo_stats,
+)
+
+# Accepted findings per dialect; anything else fails `manage.py explain`
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "query_plans.json",
+)
+
+
+def query_shapes(user_id: int = 1):
+    """Yield ``(name, call)`` for every distinct query the services issue."""
+    for sort_by, order, completed in itertools.product(
+        sorted(SORTABLE_FIELDS), ("asc", "desc"), (None, True, False)
+    ):
+        yield (
+            f"list_todos sort_by={sort_by} order={order} completed={completed}",
+            lambda s, sort_by=sort_by, order=order, completed=completed: list_todos(
+                s, user_id, 1, 10, completed, sort_by, order
+            ),
+        )
+    yield "list_todos include_archived", lambda s: list_todos(
+        s, user_id, include_archived=True
+    )
+    yield "get_todo", lambda s: get_todo(s, 1, user_id)
+    yield "list_changes", lambda s: list_changes(s, user_id, 0, 100)
+    yield "todo_stats", lambda s: todo_stats(s, user_id)
+    yield "export_todos", lambda s: list(export_rows(s, user_id))
+    yield "get_user_by_email", lambda s: get_user_by_email(s, "plan@example.com")
+    yield "get_user_by_username", lambda s: get_user_by_username(s, "plan")
+
+
+def _sqlite_findings(conn: Connection, statement: str, parameters) -> list[str]:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    findings = []
+    for _, _, _, detail in rows:
+        # "SCAN todos" reads every row; "SEARCH ... USING INDEX" does not
+        if detail.startswith("SCAN ") or "TEMP B-TREE" in detail:
+            findings.append(detail)
+    return findings
+
+
+def _postgresql_findings(conn: Connection, statement: str, parameters) -> list[str]:
+    (plan,) = conn.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    ).scalar()
+    findings = []
+    nodes = [plan["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            findings.append(f"Seq Scan on {node['Relation Name']}")
+        elif node["Node Type"] in ("Sort", "Incremental Sort"):
+            findings.append(f"{node['Node Type']} ({', '.join(node['Sort Key'])})")
+        nodes.extend(node.get("Plans", []))
+    return sorted(findings)
+
+
+EXPLAINERS = {"sqlite": _sqlite_findings, "postgresql": _postgresql_findings}
+
+
+def inspect_query_plans(engine: Engine) -> dict[str, list[str]]:
+    """Map each statement of each query shape to its full scans and temp sorts.
+
+    The service functions run inside a transaction that is rolled back, so
+    their real SQL is captured and explained with the real parameters.
+    """
+    explain = EXPLAINERS.get(engine.dialect.name)
+    if explain is None:
+        raise RuntimeError(f"EXPLAIN is not supported for {engine.dialect.name}")
+
+    results = {}
+    with engine.connect() as conn:
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        event.listen(conn, "before_cursor_execute", capture)
+        try:
+            with Session(bind=conn) as session:
+                for name, call in query_shapes():
+                    captured.clear()
+                    call(session)
+                    statements = list(captured)
+                    for i, (statement, parameters) in enumerate(statements, 1):
+                        label = name if len(statements) == 1 else f"{name} [{i}]"
+                        results[label] = explain(conn, statement, parameters)
+        finally:
+            event.remove(conn, "before_cursor_execute", capture)
+            conn.rollback()
+    return results
+
+
+def load_baseline(path: str, dialect: str) -> dict[str, list[str]]:
+    try:
+        with open(path) as f:
+            return json.load(f).get(dialect, {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, dialect: str, findings: dict[str, list[str]]) -> None:
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        document = {}
+    document[dialect] = {name: items for name, items in findings.items() if items}
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def new_findings(
+    findings: dict[str, list[str]], baseline: dict[str, list[str]]
+) -> dict[str, list[str]]:
+    """Return findings not already accepted in the baseline."""
+    regressions = {}
+    for name, items in findings.items():
+        accepted = baseline.get(name, [])
+        new = [item for item in items if item not in accepted]
+        if new:
+            regressions[name] = new
+    return regressions
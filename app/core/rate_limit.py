@@ -0,0 +1,246 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from flask import Blueprint, Flask, current_app, jsonify, request
+from flask_jwt_extended import decode_token
+
+from app.schemas import ErrorResponse
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+PRUNE_EVERY = 1000
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: int
+    rate: float  # tokens refilled per second
+
+    @classmethod
+    def parse(cls, value: str) -> "Limit":
+        """Parse ``"<count>/<second|minute|hour|day>"``."""
+        count, _, period = value.strip().partition("/")
+        if period not in PERIODS or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return cls(capacity=int(count), rate=int(count) / PERIODS[period])
+
+
+class MemoryStore:
+    """Per-process buckets; limits are multiplied by the number of workers."""
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def consume(self, key: str, limit: Limit, now: float) -> tuple[bool, float]:
+        with self._lock:
+            self._calls += 1
+            if self._calls % PRUNE_EVERY == 0:
+                self._prune(now)
+
+            tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False, (1 - tokens) / limit.rate
+            self._buckets[key] = (tokens - 1, now)
+            return True, 0.0
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle for an hour are full again in every limit we use
+        stale = [k for k, (_, updated) in self._buckets.items() if now - updated > 3600]
+        for key in stale:
+            del self._buckets[key]
+
+
+class SQLiteStore:
+    """Buckets in a SQLite file shared by every worker on the host.
+
+    Each check is a single atomic UPSERT, so concurrent workers never
+    double-spend a token. Point it at tmpfs (e.g. ``/dev/shm``) to keep it off
+    disk; the state is disposable.
+    """
+
+    CONSUME = """
+        INSERT INTO rate_limit_buckets (key, tokens, updated_at, full_at)
+        VALUES (:key, :capacity - 1, :now, :now + 1 / :rate)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = MIN(:capacity, tokens + (:now - updated_at) * :rate) - 1,
+            updated_at = :now,
+            full_at = :now + (
+                :capacity - MIN(:capacity, tokens + (:now - updated_at) * :rate) + 1
+            ) / :rate
+        WHERE MIN(:capacity, tokens + (:now - updated_at) * :rate) >= 1
+        RETURNING tokens
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after gunicorn forks a worker
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def consume(self, key: str, limit: Limit, now: float) -> tuple[bool, float]:
+        conn = self._connection()
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limit_buckets WHERE full_at < ?", (now,))
+
+        params = {
+            "key": key,
+            "capacity": limit.capacity,
+            "rate": limit.rate,
+            "now": now,
+        }
+        if conn.execute(self.CONSUME, params).fetchone() is not None:
+            return True, 0.0
+
+        tokens, updated_at = conn.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+        ).fetchone()
+        tokens = min(limit.capacity, tokens + (now - updated_at) * limit.rate)
+        return False, max(0.0, (1 - tokens) / limit.rate)
+
+
+def create_store(url: str):
+    if url == "memory://":
+        return MemoryStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url.removeprefix("sqlite:///"))
+    raise RuntimeError(f"Unsupported RATE_LIMIT_STORAGE_URL: {url}")
+
+
+class RateLimiter:
+    """Token-bucket limiter; limits are attached with :func:`rate_limit`."""
+
+    def __init__(self, app: Flask | None = None):
+        self.store = None
+        self.enabled = True
+        self.overrides: dict[str, Limit | None] = {}
+        self.checks = 0
+        self.rejected = 0
+        self.seconds = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("RATE_LIMIT_ENABLED", True)
+        app.config.setdefault("RATE_LIMIT_STORAGE_URL", "memory://")
+        app.config.setdefault("RATE_LIMITS", "")
+        self.enabled = app.config["RATE_LIMIT_ENABLED"]
+        self.store = create_store(app.config["RATE_LIMIT_STORAGE_URL"])
+        self.overrides = self._parse_overrides(app.config["RATE_LIMITS"])
+        self.checks = self.rejected = 0
+        self.seconds = 0.0
+        app.extensions["rate_limiter"] = self
+
+    @staticmethod
+    def _parse_overrides(value: str) -> dict[str, Limit | None]:
+        """Parse ``"auth.login=20/minute,todos=off"`` into per-scope limits."""
+        overrides = {}
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            scope, _, limit = item.partition("=")
+            overrides[scope.strip()] = None if limit == "off" else Limit.parse(limit)
+        return overrides
+
+    @property
+    def overhead_us(self) -> float:
+        """Mean time spent per limit check, in microseconds."""
+        return self.seconds / self.checks * 1_000_000 if self.checks else 0.0
+
+    def check(self, scope: str, default: Limit, key: str):
+        """Consume a token, returning a 429 response when the bucket is empty."""
+        if not self.enabled:
+            return None
+        limit = self.overrides.get(scope, default)
+        if limit is None:
+            return None
+
+        started = time.perf_counter()
+        allowed, retry_after = self.store.consume(
+            f"{scope}|{_client_key(key)}", limit, time.time()
+        )
+        self.checks += 1
+        self.seconds += time.perf_counter() - started
+        if allowed:
+            return None
+
+        self.rejected += 1
+        response = jsonify(
+            ErrorResponse(
+                error="rate_limited",
+                message="Too many requests",
+            ).model_dump()
+        )
+        response.status_code = 429
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+
+def _client_key(key: str) -> str:
+    if key == "user":
+        auth = request.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            try:
+                return f"user:{decode_token(auth[7:])['sub']}"
+            except Exception:
+                # Invalid tokens are rejected later by jwt_required
+                pass
+    return f"ip:{request.remote_addr}"
+
+
+def rate_limit(limit: str, key: str = "user"):
+    """Attach a token-bucket limit to a view function or a whole blueprint.
+
+    ``key`` is ``"user"`` (JWT identity, falling back to client IP) or
+    ``"ip"``. The scope name (``<module>.<view>`` or the blueprint name) can be
+    overridden or disabled through the ``RATE_LIMITS`` setting.
+    """
+    default = Limit.parse(limit)
+
+    def decorator(target):
+        if isinstance(target, Blueprint):
+            scope = target.name
+
+            @target.before_request
+            def check_blueprint_limit():
+                # CORS preflights come before every cross-origin call; only
+                # charge the call itself
+                if request.method == "OPTIONS":
+                    return None
+                return current_app.extensions["rate_limiter"].check(scope, default, key)
+
+            return target
+
+        scope = f"{target.__module__.rsplit('.', 1)[-1]}.{target.__name__}"
+
+        @wraps(target)
+        def wrapper(*args, **kwargs):
+            response = current_app.extensions["rate_limiter"].check(scope, default, key)
+            if response is not None:
+                return response
+            return current_app.ensure_sync(target)(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
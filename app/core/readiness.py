@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from flask import Flask, current_app, jsonify
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.admission import admission_priority
+
+LATENCY_WINDOW = 30  # probes kept for max_latency_ms
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    checked_at: float
+    latency_ms: float | None
+    revision: str | None
+    error: str | None
+
+
+def pool_stats(pool: Pool) -> dict | None:
+    """Checked-out and overflow counts; ``None`` for pools without a limit."""
+    if not isinstance(pool, QueuePool):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+    }
+
+
+class DatabaseProber:
+    """Probes the database from a background thread so ``/ready`` does no I/O.
+
+    Each probe reads the alembic revision, which also needs SQLite's shared
+    lock, so a locked database file fails the probe. A probe stuck waiting for
+    a pooled connection shows up as a stale result.
+    """
+
+    def __init__(self, engine: Engine, interval: float, max_age: float):
+        self.engine = engine
+        self.interval = interval
+        self.max_age = max_age
+        self.result: ProbeResult | None = None
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start probing in this process; a no-op when already running.
+
+        Forked workers inherit the prober but not its thread, so the pid is
+        checked on every call.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Inherited from the parent process; its pool is not ours
+                self.result = None
+                self.latencies.clear()
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            threading.Thread(
+                target=self._run, args=(self._stop,), name="db-prober", daemon=True
+            ).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pid = None
+
+    def _run(self, stop: threading.Event) -> None:
+        while True:
+            self.probe()
+            if stop.wait(self.interval):
+                return
+
+    def probe(self) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                revision = None
+                if inspect(conn).has_table("alembic_version"):
+                    revision = conn.execute(
+                        text("SELECT version_num FROM alembic_version")
+                    ).scalar()
+        except SQLAlchemyError as e:
+            message = str(getattr(e, "orig", None) or e).splitlines()[0]
+            result = ProbeResult(time.time(), None, None, message)
+        else:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.latencies.append(latency_ms)
+            result = ProbeResult(time.time(), latency_ms, revision, None)
+        self.result = result
+        return result
+
+    def report(self, now: float) -> tuple[bool, dict]:
+        """Readiness and the details behind it, from memory only."""
+        result = self.result
+        pool = pool_stats(self.engine.pool)
+
+        reason = None
+        if result is None:
+            reason = "no database probe has completed yet"
+        elif result.error is not None:
+            reason = f"database probe failed: {result.error}"
+        elif now - result.checked_at > self.max_age:
+            reason = "database probe is stale"
+        elif (
+            pool is not None
+            and pool["max_overflow"] >= 0
+            and pool["checked_out"] >= pool["size"] + pool["max_overflow"]
+        ):
+            reason = "connection pool exhausted"
+
+        database = None
+        if result is not None:
+            database = {
+                "checked_at": datetime.fromtimestamp(
+                    result.checked_at, timezone.utc
+                ).isoformat(),
+                "age_s": round(now - result.checked_at, 3),
+                "latency_ms": result.latency_ms,
+                "max_latency_ms": max(self.latencies, default=None),
+                "revision": result.revision,
+                "error": result.error,
+            }
+        body = {"status": "ready" if reason is None else "unavailable"}
+        if reason is not None:
+            body["reason"] = reason
+        body["database"] = database
+        body["pool"] = pool
+        return reason is None, body
+
+
+@admission_priority("high")
+def ready_view():
+    prober = current_app.extensions["readiness"]
+    prober.start()
+    ready, body = prober.report(time.time())
+    response = jsonify(body)
+    response.status_code = 200 if ready else 503
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def init_readiness(app: Flask, engine: Engine) -> None:
+    app.config.setdefault("READY_PROBE_INTERVAL", 2.0)
+    app.config.setdefault("READY_MAX_AGE", 10.0)
+    app.extensions["readiness"] = DatabaseProber(
+        engine, app.config["READY_PROBE_INTERVAL"], app.config["READY_MAX_AGE"]
+    )
+    app.add_url_rule("/ready", "ready", ready_view, methods=["GET"])
@@ -0,0 +1,59 @@
+import io
+import json
+import os
+import re
+import threading
+
+# Auth requests carry passwords; the replay harness logs its own users in
+SKIP_PREFIXES = ("/api/v1/auth/",)
+_TODO_ID = re.compile(r"(/todos/)\d+")
+
+
+class RequestRecorder:
+    """WSGI middleware appending API requests to a replayable JSONL mix.
+
+    Each line is ``{"method", "path", "headers", "json"}``. Bearer tokens,
+    ``?<token_param>=`` tokens (the event stream's) and todo ids are replaced
+    with ``{{token}}`` and ``{{todo_id}}`` so the load harness
+    (``tests/benchmarks/bench_load.py``) can substitute per-user values.
+    """
+
+    def __init__(self, wsgi_app, path: str, token_param: str = "jwt"):
+        self.wsgi_app = wsgi_app
+        self.path = path
+        self._query_token = re.compile(rf"(^|&)({re.escape(token_param)}=)[^&]*")
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if path.startswith("/api/v1/") and not path.startswith(SKIP_PREFIXES):
+            self._record(environ, path)
+        return self.wsgi_app(environ, start_response)
+
+    def _record(self, environ, path: str) -> None:
+        entry = {
+            "method": environ["REQUEST_METHOD"],
+            "path": _TODO_ID.sub(r"\1{{todo_id}}", path),
+        }
+        if environ.get("QUERY_STRING"):
+            query = self._query_token.sub(r"\1\2{{token}}", environ["QUERY_STRING"])
+            entry["path"] += f"?{query}"
+        if environ.get("HTTP_AUTHORIZATION", "").startswith("Bearer "):
+            entry["headers"] = {"Authorization": "Bearer {{token}}"}
+
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        if length and environ.get("CONTENT_TYPE", "").startswith("application/json"):
+            body = environ["wsgi.input"].read(length)
+            environ["wsgi.input"] = io.BytesIO(body)
+            try:
+                entry["json"] = json.loads(body)
+            except ValueError:
+                pass
+
+        line = (json.dumps(entry) + "\n").encode()
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
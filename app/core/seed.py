@@ -0,0 +1,279 @@
+import random
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import batched
+
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.database import ShardRouter
+from app.models import Todo, User, UserShard
+from app.models.enums import Priority
+from app.services.auth_service import hash_password
+
+WORDS = (
+    "review update fix write call email plan book schedule prepare send check "
+    "clean order pay renew draft submit follow-up organize finish test deploy "
+    "report invoice budget meeting client project design notes slides docs "
+    "groceries dentist car insurance taxes tickets flight hotel gift birthday "
+    "team weekly quarterly release backlog migration dashboard contract lease"
+).split()
+PRIORITY_WEIGHTS = {Priority.LOW: 0.3, Priority.MEDIUM: 0.5, Priority.HIGH: 0.2}
+HISTORY = timedelta(days=730)
+POOL_SIZE = 4096
+
+
+@dataclass
+class SeedResult:
+    users: int
+    todos: int
+    max_todos_per_user: int
+    seconds: float
+
+
+def todos_per_user(users: int, total: int, skew: float) -> list[int]:
+    """Split ``total`` todos over users with Zipf weights ``1 / rank ** skew``.
+
+    With the default skew of 1.1 over 1,000 users the heaviest user gets about
+    18% of all rows, so a few accounts reach the 50k+ range seen in production.
+    """
+    weights = [1 / rank**skew for rank in range(1, users + 1)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Hand the rounding remainder to the lightest users
+    for i in range(total - sum(counts)):
+        counts[-1 - i % users] += 1
+    return counts
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words)).capitalize()
+
+
+class TextPool:
+    """Pre-generated titles and descriptions with realistic length spreads.
+
+    Joining words per row dominated generation time; sampling from a pool
+    keeps the length distribution at a fraction of the cost.
+    """
+
+    def __init__(self, rng: random.Random, size: int = POOL_SIZE):
+        self.titles = [
+            _text(rng, max(1, min(30, int(rng.lognormvariate(1.3, 0.5)))))
+            for _ in range(size)
+        ]
+        self.descriptions = [
+            _text(rng, max(1, min(150, int(rng.lognormvariate(2.5, 0.9)))))[:1000]
+            for _ in range(size)
+        ]
+
+
+def todo_rows(
+    rng: random.Random,
+    user_id: int,
+    count: int,
+    now: datetime,
+    text: TextPool | None = None,
+) -> Iterator[dict]:
+    """Yield ``count`` todo rows, oldest first, with production-like values."""
+    text = text or TextPool(rng)
+    size = len(text.titles)
+    low = PRIORITY_WEIGHTS[Priority.LOW]
+    medium = low + PRIORITY_WEIGHTS[Priority.MEDIUM]
+    step = HISTORY / max(count, 1)
+    start = now - HISTORY
+    for i in range(count):
+        created_at = start + step * i
+        age_days = (now - created_at).days
+
+        # Descriptions are optional and long-tailed
+        description = None
+        if rng.random() < 0.45:
+            description = text.descriptions[rng.randrange(size)]
+
+        due_date = None
+        if rng.random() < 0.6:
+            due_date = created_at + timedelta(days=rng.triangular(-2, 90, 7))
+
+        # Old todos are mostly done; recent ones mostly open
+        completed = rng.random() < min(0.9, 0.15 + age_days / 400)
+        updated_at = created_at
+        if completed or rng.random() < 0.2:
+            updated_at = min(now, created_at + timedelta(days=rng.expovariate(0.2)))
+
+        roll = rng.random()
+        priority = (
+            Priority.LOW
+            if roll < low
+            else Priority.MEDIUM if roll < medium else Priority.HIGH
+        )
+
+        yield {
+            "title": text.titles[rng.randrange(size)],
+            "description": description,
+            "completed": completed,
+            "priority": priority,
+            "due_date": due_date,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "user_id": user_id,
+            "change_seq": i + 1,
+        }
+
+
+def _sqlite_datetime(value: datetime | None) -> str | None:
+    # SQLAlchemy's SQLite DATETIME storage format
+    return value.isoformat(" ", "microseconds") if value is not None else None
+
+
+def insert_todos(conn: Connection, rows: list[dict]) -> None:
+    """Bulk-insert rows from :func:`todo_rows` on an open connection.
+
+    Rows may carry an ``id``; either all of them do or none.
+    """
+    if conn.dialect.name != "sqlite":
+        conn.execute(insert(Todo), rows)
+        return
+    # SQLAlchemy's per-value DATETIME bind processing costs more than the
+    # insert itself on SQLite, so pre-render values and use executemany
+    columns = [
+        "title",
+        "description",
+        "completed",
+        "priority",
+        "due_date",
+        "created_at",
+        "updated_at",
+        "user_id",
+        "change_seq",
+    ]
+    values = [
+        (
+            row["title"],
+            row["description"],
+            row["completed"],
+            row["priority"].name,
+            _sqlite_datetime(row["due_date"]),
+            _sqlite_datetime(row["created_at"]),
+            _sqlite_datetime(row["updated_at"]),
+            row["user_id"],
+            row["change_seq"],
+        )
+        for row in rows
+    ]
+    if "id" in rows[0]:
+        columns.insert(0, "id")
+        values = [(row["id"], *value) for row, value in zip(rows, values)]
+    conn.exec_driver_sql(
+        f"INSERT INTO {Todo.__tablename__} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})",
+        values,
+    )
+
+
+def _place_users(
+    router: ShardRouter, conns: list[Connection], user_rows: list[dict]
+) -> dict[int, int]:
+    """Record each user's shard, as registration does, and return the map."""
+    shard_of = {row["id"]: router.ring.shard_for(row["id"]) for row in user_rows}
+    conns[0].execute(
+        insert(UserShard),
+        [{"user_id": user_id, "shard": shard} for user_id, shard in shard_of.items()],
+    )
+    for shard, conn in enumerate(conns[1:], 1):
+        placed = [row for row in user_rows if shard_of[row["id"]] == shard]
+        if placed:
+            conn.execute(insert(User), placed)
+    return shard_of
+
+
+def seed(
+    engine: Engine,
+    users: int,
+    todos: int,
+    seed: int = 0,
+    skew: float = 1.1,
+    password: str = "password123",
+    prefix: str = "seed",
+    batch_size: int = 10_000,
+    router: ShardRouter | None = None,
+) -> SeedResult:
+    """Bulk-insert a reproducible dataset of ``users`` and ``todos``.
+
+    Every user shares one bcrypt hash of ``password``, computed once, and
+    gets an ``<prefix><n>@example.com`` address. The same ``seed`` always
+    produces the same rows. With a sharded ``router`` (whose main database
+    is ``engine``), users are placed on shards and todo ids come from the
+    shared id blocks.
+    """
+    if not inspect(engine).has_table(Todo.__tablename__):
+        raise RuntimeError("Database has no todos table; run migrations first")
+    with engine.connect() as conn:
+        if conn.scalar(select(User.id).where(User.username == f"{prefix}0")):
+            raise RuntimeError(
+                f'Users prefixed "{prefix}" already exist; choose another prefix'
+            )
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    # Naive UTC, as stored by the DateTime columns
+    now = datetime(2025, 1, 1)
+    password_hash = hash_password(password)
+    counts = todos_per_user(users, todos, skew)
+    text = TextPool(rng)
+    sharded = router is not None and router.sharded
+    # Claimed before the inserts, which would block the claim on SQLite
+    todo_ids = iter(router.claim_ids(todos)) if sharded else None
+
+    with ExitStack() as stack:
+        conn = stack.enter_context(engine.begin())
+        conns = [conn]
+        user_rows = [
+            {
+                "email": f"{prefix}{n}@example.com",
+                "username": f"{prefix}{n}",
+                "password_hash": password_hash,
+                "is_active": True,
+                "change_seq": counts[n],
+            }
+            for n in range(users)
+        ]
+        conn.execute(insert(User), user_rows)
+        ids = dict(
+            conn.execute(
+                select(User.username, User.id).where(
+                    User.username.startswith(prefix, autoescape=True)
+                )
+            ).all()
+        )
+        shard_of: dict[int, int] = defaultdict(int)
+        if sharded:
+            conns += [stack.enter_context(e.begin()) for e in router.engines[1:]]
+            for row in user_rows:
+                row["id"] = ids[row["username"]]
+            shard_of.update(_place_users(router, conns, user_rows))
+
+        rows = (
+            row
+            for n, count in enumerate(counts)
+            for row in todo_rows(rng, ids[f"{prefix}{n}"], count, now, text)
+        )
+        for batch in batched(rows, batch_size):
+            by_shard = defaultdict(list)
+            for row in batch:
+                if todo_ids is not None:
+                    row["id"] = next(todo_ids)
+                by_shard[shard_of[row["user_id"]]].append(row)
+            for shard, shard_rows in by_shard.items():
+                insert_todos(conns[shard], shard_rows)
+
+    return SeedResult(
+        users=users,
+        todos=todos,
+        max_todos_per_user=max(counts, default=0),
+        seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,218 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import jwt as pyjwt
+from flask import Flask
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+
+from app.core.config import Config
+from app.core.database import router
+from app.core.events import EventBroker, Subscription
+from app.schemas import ErrorResponse, TodoChangesResponse
+from app.services.async_todo_service import current_change_seq, list_changes
+
+STREAM_PATH = "/api/v1/todos/stream"
+REPLAY_PAGE_SIZE = 500
+
+
+def format_event(event_type: str, data: dict, event_id: int | None = None) -> bytes:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines += [f"event: {event_type}", f"data: {json.dumps(data)}"]
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+def format_changes(page: TodoChangesResponse) -> bytes:
+    """A change-feed page as events, deletions first.
+
+    Todos in ``changed`` were written after any deletion of the same id, so
+    applying deletions first is always safe. Only the last event carries an
+    id (the page cursor); a client cut off mid-page replays the whole page.
+    """
+    events = [("deleted", {"id": todo.id}) for todo in page.deleted] + [
+        ("updated", todo.model_dump(mode="json")) for todo in page.changed
+    ]
+    return b"".join(
+        format_event(
+            event_type, data, int(page.cursor) if i == len(events) - 1 else None
+        )
+        for i, (event_type, data) in enumerate(events)
+    )
+
+
+def stream_preamble(retry_ms: int, cursor: int) -> bytes:
+    # An id with no data moves the client's Last-Event-ID without an event
+    return f"retry: {retry_ms}\nid: {cursor}\n\n".encode()
+
+
+class EventStream:
+    """ASGI handler for ``GET /api/v1/todos/stream``.
+
+    A connected client is a queue on the event loop, not a thread, so one
+    process holds thousands of streams. Events come from the
+    :class:`EventBroker`. ``Last-Event-ID`` resumes are replayed from the change
+    feed, as are gaps in event ids left by a dropped datagram or a full queue.
+    """
+
+    def __init__(self, flask_app: Flask, broker: EventBroker):
+        self.flask_app = flask_app
+        self.broker = broker
+        self.heartbeat = flask_app.config["SSE_HEARTBEAT_SECONDS"]
+        self.retry_ms = flask_app.config["SSE_RETRY_MS"]
+        origins = Config.get_cors_origins()
+        if isinstance(origins, str):
+            origins = [origins]
+        # None allows every origin
+        self.cors_origins = None if origins == ["*"] else set(origins)
+
+    def cors_headers(self, scope) -> list[tuple[bytes, bytes]]:
+        """Echo an allowed ``Origin`` back, as flask-cors does for Flask routes."""
+        headers = [(b"vary", b"Origin")]
+        origin = dict(scope["headers"]).get(b"origin")
+        if origin is not None and (
+            self.cors_origins is None or origin.decode("latin-1") in self.cors_origins
+        ):
+            headers.append((b"access-control-allow-origin", origin))
+        return headers
+
+    def authenticate(self, scope) -> int | None:
+        """The user id from an access token in the header or query string.
+
+        ``EventSource`` cannot set headers, so browsers pass the token as
+        ``?jwt=``.
+        """
+        headers = dict(scope["headers"])
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if authorization.startswith("Bearer "):
+            token = authorization.removeprefix("Bearer ")
+        else:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            name = self.flask_app.config["JWT_QUERY_STRING_NAME"]
+            token = query.get(name, [""])[0]
+        if not token:
+            return None
+        with self.flask_app.app_context():
+            try:
+                claims = decode_token(token)
+            except (pyjwt.PyJWTError, JWTExtendedException):
+                return None
+        if claims.get("type") != "access":
+            return None
+        return int(claims["sub"])
+
+    async def __call__(self, scope, receive, send):
+        cors = self.cors_headers(scope)
+        if scope["method"] == "OPTIONS":
+            await self._preflight(scope, send, cors)
+            return
+        if scope["method"] != "GET":
+            await self._error(send, cors, 405, "method_not_allowed", "Use GET")
+            return
+        user_id = self.authenticate(scope)
+        if user_id is None:
+            await self._error(
+                send, cors, 401, "unauthorized", "Missing or invalid access token"
+            )
+            return
+
+        # Subscribe before reading the cursor so nothing falls in between
+        subscription = self.broker.subscribe(user_id)
+        try:
+            last_event_id = dict(scope["headers"]).get(b"last-event-id", b"")
+            async with router.async_session(user_id) as session:
+                current = await current_change_seq(session, user_id)
+            cursor = int(last_event_id) if last_event_id.isdigit() else current
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream"),
+                        (b"cache-control", b"no-store"),
+                        # Stop nginx from buffering the stream
+                        (b"x-accel-buffering", b"no"),
+                        *cors,
+                    ],
+                }
+            )
+            await self._send(send, stream_preamble(self.retry_ms, cursor))
+            if cursor < current:
+                cursor = await self._catch_up(send, user_id, cursor)
+            await self._stream(receive, send, subscription, cursor)
+        finally:
+            self.broker.unsubscribe(subscription)
+
+    async def _stream(self, receive, send, subscription: Subscription, cursor: int):
+        disconnected = asyncio.ensure_future(self._wait_for_disconnect(receive))
+        try:
+            while True:
+                getter = asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, disconnected},
+                    timeout=self.heartbeat,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if getter not in done:
+                    getter.cancel()
+                if disconnected in done:
+                    return
+
+                event = getter.result() if getter in done else None
+                if subscription.lagged or (event and event.id > cursor + 1):
+                    # Missed an event; the change feed has everything committed
+                    subscription.lagged = False
+                    cursor = await self._catch_up(send, subscription.user_id, cursor)
+                elif event is None:
+                    await self._send(send, b": keepalive\n\n")
+                elif event.id == cursor + 1:
+                    await self._send(
+                        send, format_event(event.type, event.data, event.id)
+                    )
+                    cursor = event.id
+                # Anything older was already sent by a catch-up
+        finally:
+            disconnected.cancel()
+
+    async def _catch_up(self, send, user_id: int, cursor: int) -> int:
+        async with router.async_session(user_id) as session:
+            while True:
+                page = await list_changes(session, user_id, cursor, REPLAY_PAGE_SIZE)
+                if page.changed or page.deleted:
+                    await self._send(send, format_changes(page))
+                cursor = int(page.cursor)
+                if not page.has_more:
+                    return cursor
+
+    @staticmethod
+    async def _wait_for_disconnect(receive) -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    @staticmethod
+    async def _send(send, body: bytes) -> None:
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    @staticmethod
+    async def _preflight(scope, send, cors: list[tuple[bytes, bytes]]) -> None:
+        headers = [*cors, (b"access-control-allow-methods", b"GET, OPTIONS")]
+        requested = dict(scope["headers"]).get(b"access-control-request-headers")
+        if requested:
+            headers.append((b"access-control-allow-headers", requested))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _error(
+        send, cors: list[tuple[bytes, bytes]], status: int, error: str, message: str
+    ) -> None:
+        body = json.dumps(ErrorResponse(error=error, message=message).model_dump())
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), *cors],
+            }
+        )
+        await send({"type": "http.response.body", "body": body.encode()})
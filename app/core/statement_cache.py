@@ -0,0 +1,48 @@
+import threading
+from collections.abc import Callable, Hashable
+
+from app.core.metrics import STATEMENT_CACHE
+
+
+class StatementCache:
+    """Statements built once per variant and reused with new bound parameters.
+
+    Building a ``select()`` and its SQLAlchemy cache key can cost as much as
+    running a small indexed query on SQLite. A statement object memoizes its
+    cache key, so reusing one also makes the engine's compiled-cache lookup
+    nearly free. Variants must not capture per-request values: those go in
+    ``bindparam()``s filled at execution time.
+    """
+
+    def __init__(self, name: str, build: Callable[..., object]):
+        self.name = name
+        self.build = build
+        self.hits = 0
+        self.misses = 0
+        self._variants: dict[Hashable, object] = {}
+        self._lock = threading.Lock()
+        self._hit = STATEMENT_CACHE.labels(name, "hit")
+        self._miss = STATEMENT_CACHE.labels(name, "miss")
+
+    def get(self, *key: Hashable):
+        variant = self._variants.get(key)
+        if variant is not None:
+            # Unlocked: an increment lost to a race only skews the stats
+            self.hits += 1
+            self._hit.inc()
+            return variant
+        with self._lock:
+            if key not in self._variants:
+                self._variants[key] = self.build(*key)
+            self.misses += 1
+        self._miss.inc()
+        return self._variants[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._variants.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._variants)
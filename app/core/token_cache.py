@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from app.core.tracing import span
+
+
+class TokenCache:
+    """Bounded LRU of verified JWT claims, keyed by a digest of the raw token.
+
+    Entries are only served until the token's ``exp`` claim, after which the
+    caller falls back to a full decode (which raises the usual expiry error).
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(encoded_token: str) -> bytes:
+        return hashlib.blake2b(encoded_token.encode(), digest_size=16).digest()
+
+    def get(self, encoded_token: str) -> dict | None:
+        key = self.digest(encoded_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, encoded_token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if self.maxsize <= 0 or expires_at is None:
+            return
+        key = self.digest(encoded_token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, encoded_token: str) -> None:
+        with self._lock:
+            self._entries.pop(self.digest(encoded_token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that memoizes successful token decodes per worker.
+
+    Only the signature/claims decode is cached. Token type, freshness and the
+    ``token_in_blocklist_loader`` revocation check still run on every request
+    because flask-jwt-extended performs them after ``decode_token`` returns.
+    """
+
+    def __init__(self, app: Flask | None = None, **kwargs):
+        self.token_cache = TokenCache()
+        super().__init__(app, **kwargs)
+
+    def init_app(self, app: Flask, **kwargs) -> None:
+        super().init_app(app, **kwargs)
+        app.config.setdefault("JWT_TOKEN_CACHE_SIZE", 1024)
+        self.token_cache.maxsize = app.config["JWT_TOKEN_CACHE_SIZE"]
+        # Keys or decode settings may differ between apps; never share entries
+        self.token_cache.clear()
+
+    def _decode_jwt_from_config(
+        self, encoded_token: str, csrf_value=None, allow_expired: bool = False
+    ) -> dict:
+        if csrf_value is not None or allow_expired or self.token_cache.maxsize <= 0:
+            with span("jwt.decode", cached=False):
+                return super()._decode_jwt_from_config(
+                    encoded_token, csrf_value, allow_expired
+                )
+
+        with span("jwt.decode") as decode_span:
+            claims = self.token_cache.get(encoded_token)
+            if claims is None:
+                claims = super()._decode_jwt_from_config(encoded_token)
+                self.token_cache.put(encoded_token, claims)
+                decode_span.set_attribute("cached", False)
+            else:
+                decode_span.set_attribute("cached", True)
+            return claims
@@ -0,0 +1,258 @@
+import json
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.database import ShardRouter
+from app.core.query_log import statement_shape
+
+TRACEPARENT_HEADER = "traceparent"
+TRACERESPONSE_HEADER = "traceresponse"
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a W3C traceparent."""
+    match = _TRACEPARENT.match(value or "")
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    if version == "00" and len(value) != 55:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+class Trace:
+    """Spans recorded for one request; exported together when it ends."""
+
+    def __init__(self, trace_id: str, parent_id: str | None):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.spans: list[dict] = []
+        self.stack: list[Span] = []
+
+
+class Span:
+    def __init__(self, trace: Trace, name: str, attributes: dict):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+        self.span_id = os.urandom(8).hex()
+
+    def __enter__(self) -> "Span":
+        stack = self.trace.stack
+        self.parent_id = stack[-1].span_id if stack else self.trace.parent_id
+        self.start = time.time_ns()
+        stack.append(self)
+        return self
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end = time.time_ns()
+        self.trace.stack.remove(self)
+        record = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start,
+            "endTimeUnixNano": end,
+            "attributes": self.attributes,
+            "status": "ok",
+        }
+        if exc_type is not None:
+            record["status"] = "error"
+            record["attributes"]["exception.type"] = exc_type.__name__
+        self.trace.spans.append(record)
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """Time a block as a child of the current span.
+
+    Outside a sampled request this returns a shared no-op, so call sites can
+    stay in place with tracing disabled.
+    """
+    trace = g.get("trace") if has_request_context() else None
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, attributes)
+
+
+class NDJSONExporter:
+    """Append spans as JSON lines, one ``write`` per request.
+
+    Lines use OTLP span field names, so the file can be tailed by a collector's
+    file receiver or summarized locally with ``manage.py traces summary``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[dict]) -> None:
+        data = "".join(json.dumps(s, separators=(",", ":")) + "\n" for s in spans)
+        with self._lock:
+            # O_APPEND keeps lines from different gunicorn workers whole
+            if self._fd is None or self._pid != os.getpid():
+                self._fd = os.open(
+                    self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+                )
+                self._pid = os.getpid()
+            os.write(self._fd, data.encode())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    trace = g.get("trace") if has_request_context() else None
+    if trace is not None:
+        context._trace_span = Span(
+            trace, "db.query", {"db.statement": statement_shape(statement)}
+        ).__enter__()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    sql_span = getattr(context, "_trace_span", None)
+    if sql_span is not None:
+        del context._trace_span
+        sql_span.__exit__(None, None, None)
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    sql_span = getattr(context, "_trace_span", None)
+    if sql_span is not None:
+        del context._trace_span
+        error = exception_context.original_exception
+        sql_span.__exit__(type(error), error, None)
+
+
+def _before_request():
+    parent = parse_traceparent(request.headers.get(TRACEPARENT_HEADER))
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id = os.urandom(16).hex(), None
+        sampled = random.random() < current_app.config["TRACE_SAMPLE_RATE"]
+    if not sampled:
+        return
+
+    g.trace = Trace(trace_id, parent_id)
+    g.trace_root = Span(
+        g.trace, f"{request.method} {request.path}", {"http.method": request.method}
+    ).__enter__()
+
+
+def _after_request(response):
+    root = g.get("trace_root")
+    if root is not None:
+        root.attributes["http.status_code"] = response.status_code
+        # W3C Trace Context level 2: lets the caller find this request's spans
+        response.headers[TRACERESPONSE_HEADER] = (
+            f"00-{root.trace.trace_id}-{root.span_id}-01"
+        )
+    return response
+
+
+def _teardown_request(exc):
+    trace = g.pop("trace", None)
+    if trace is None:
+        return
+    root = g.pop("trace_root")
+    rule = request.url_rule
+    if rule is not None:
+        root.name = f"{request.method} {rule.rule}"
+        root.attributes["http.route"] = rule.rule
+    if "request_id" in g:
+        root.attributes["request_id"] = g.request_id
+    root.__exit__(type(exc) if exc else None, exc, None)
+    current_app.extensions["trace_exporter"].export(trace.spans)
+
+
+def summarize(lines) -> dict[str, dict[str, list[float]]]:
+    """Group span durations (ms) by root route, then by span name."""
+    spans = [json.loads(line) for line in lines if line.strip()]
+    roots = {}
+    for s in spans:
+        if "http.method" in s["attributes"]:
+            roots[s["traceId"]] = s["name"]
+
+    stages: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    for s in spans:
+        route = roots.get(s["traceId"])
+        if route is None:
+            continue
+        duration = (s["endTimeUnixNano"] - s["startTimeUnixNano"]) / 1_000_000
+        name = "request" if s["name"] == route else s["name"]
+        stages[route][name].append(duration)
+    return stages
+
+
+def format_summary(stages: dict[str, dict[str, list[float]]]) -> str:
+    lines = []
+    for route, by_name in sorted(stages.items()):
+        lines.append(route)
+        for name, durations in sorted(by_name.items(), key=lambda i: -sum(i[1])):
+            p95 = (
+                statistics.quantiles(durations, n=20)[-1]
+                if len(durations) > 1
+                else durations[0]
+            )
+            lines.append(
+                f"  {name:<28} n={len(durations):<6} "
+                f"p50={statistics.median(durations):8.2f}ms p95={p95:8.2f}ms"
+            )
+    return "\n".join(lines)
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def init_tracing(app: Flask, router: ShardRouter) -> None:
+    """Trace a ``TRACE_SAMPLE_RATE`` share of requests, plus sampled W3C parents.
+
+    Nothing is registered unless ``TRACING_ENABLED`` is set; ``span()`` call
+    sites then cost one ``g`` lookup.
+    """
+    app.config.setdefault("TRACING_ENABLED", False)
+    app.config.setdefault("TRACE_SAMPLE_RATE", 1.0)
+    app.config.setdefault("TRACE_EXPORT_PATH", "./traces.ndjson")
+    if not app.config["TRACING_ENABLED"]:
+        return
+
+    app.extensions["trace_exporter"] = NDJSONExporter(app.config["TRACE_EXPORT_PATH"])
+
+    router.instrument(instrument_engine)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
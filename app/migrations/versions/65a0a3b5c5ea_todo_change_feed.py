@@ -0,0 +1,73 @@
+"""todo change feed
+
+Revision ID: 65a0a3b5c5ea
+Revises: 78f2291d1b94
+Create Date: 2026-10-19 13:35:55.914938
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "65a0a3b5c5ea"
+down_revision: Union[str, Sequence[str], None] = "78f2291d1b94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "todo_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("todo_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_todo_tombstones_user_id_change_seq",
+        "todo_tombstones",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+    op.add_column(
+        "todos",
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "users",
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Existing todos get their id as sequence number: ids only grow, so each
+    # user's order is preserved, and counters continue from the highest one
+    op.execute("UPDATE todos SET change_seq = id")
+    op.execute(
+        "UPDATE users SET change_seq = COALESCE("
+        "(SELECT MAX(todos.id) FROM todos WHERE todos.user_id = users.id), 0)"
+    )
+
+    op.create_index(
+        "ix_todos_user_id_change_seq",
+        "todos",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "change_seq")
+    op.drop_index("ix_todos_user_id_change_seq", table_name="todos")
+    op.drop_column("todos", "change_seq")
+    op.drop_index("ix_todo_tombstones_user_id_change_seq", table_name="todo_tombstones")
+    op.drop_table("todo_tombstones")
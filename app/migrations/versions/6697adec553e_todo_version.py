@@ -0,0 +1,33 @@
+"""todo version
+
+Revision ID: 6697adec553e
+Revises: aa6f581d9e8f
+Create Date: 2026-10-19 14:35:02.118734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6697adec553e"
+down_revision: Union[str, Sequence[str], None] = "aa6f581d9e8f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("todos", "archived_todos"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("archived_todos", "version")
+    op.drop_column("todos", "version")
@@ -0,0 +1,42 @@
+"""user shards
+
+Revision ID: aa6f581d9e8f
+Revises: db7966df4f39
+Create Date: 2026-10-19 14:29:23.319419
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "aa6f581d9e8f"
+down_revision: Union[str, Sequence[str], None] = "db7966df4f39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "id_blocks",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("next_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "user_shards",
+        sa.Column("user_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("moving", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_shards")
+    op.drop_table("id_blocks")
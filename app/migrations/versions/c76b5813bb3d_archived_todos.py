@@ -0,0 +1,61 @@
+"""archived todos
+
+Revision ID: c76b5813bb3d
+Revises: 65a0a3b5c5ea
+Create Date: 2026-10-19 14:00:00.271817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c76b5813bb3d"
+down_revision: Union[str, Sequence[str], None] = "65a0a3b5c5ea"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archived_todos",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.String(length=1000), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column(
+            "priority",
+            # The type already exists on PostgreSQL, created with todos
+            sa.Enum("LOW", "MEDIUM", "HIGH", name="priority").with_variant(
+                postgresql.ENUM(
+                    "LOW", "MEDIUM", "HIGH", name="priority", create_type=False
+                ),
+                "postgresql",
+            ),
+            nullable=False,
+        ),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_archived_todos_user_id", "archived_todos", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_archived_todos_user_id", table_name="archived_todos")
+    op.drop_table("archived_todos")
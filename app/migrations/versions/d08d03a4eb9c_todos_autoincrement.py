@@ -0,0 +1,45 @@
+"""todos autoincrement
+
+Revision ID: d08d03a4eb9c
+Revises: 6697adec553e
+Create Date: 2026-10-19 16:05:41.503217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d08d03a4eb9c"
+down_revision: Union[str, Sequence[str], None] = "6697adec553e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL sequences never go back, only SQLite reuses freed ids
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "todos", recreate="always", table_kwargs={"sqlite_autoincrement": True}
+    ):
+        pass
+    # Start above every id already handed out, archived ones included
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'todos'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'todos', max(id) FROM ("
+        "SELECT coalesce(max(id), 0) AS id FROM todos UNION ALL "
+        "SELECT coalesce(max(id), 0) FROM archived_todos)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "todos", recreate="always", table_kwargs={"sqlite_autoincrement": False}
+    ):
+        pass
@@ -1,5 +1,17 @@
-from app.models.enums import Priority
-from app.models.todo import Todo
+from app.models.enums import JobStatus, Priority
+from app.models.job import Job
+from app.models.shard import IdBlock, UserShard
+from app.models.todo import ArchivedTodo, Todo, TodoTombstone
 from app.models.user import User
 
-__all__ = ["Priority", "Todo", "User"]
+__all__ = [
+    "ArchivedTodo",
+    "IdBlock",
+    "Job",
+    "JobStatus",
+    "Priority",
+    "Todo",
+    "TodoTombstone",
+    "User",
+    "UserShard",
+]
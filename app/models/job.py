@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from app.models.enums import JobStatus
+
+
+class Job(SQLModel, table=True):
+    """A unit of deferred work; see :mod:`app.core.jobs`."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_run_at", "status", "run_at"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(max_length=100)
+    payload: str = Field(default="{}")  # JSON keyword arguments for the task
+    # Deduplicates enqueues, e.g. one periodic run per interval
+    key: str | None = Field(default=None, max_length=200, unique=True)
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=5)
+    # When workers may next claim the job: its scheduled time while queued,
+    # the end of the visibility timeout while running
+    run_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_error: str | None = Field(default=None)
+    result: str | None = Field(default=None)  # JSON return value of the task
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = Field(default=None)
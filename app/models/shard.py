@@ -0,0 +1,29 @@
+from sqlmodel import Field, SQLModel
+
+
+class UserShard(SQLModel, table=True):
+    """Which shard holds a user's todos; see :class:`app.core.database.ShardRouter`.
+
+    Lives in the main database. Users without a row are on shard 0.
+    """
+
+    __tablename__ = "user_shards"
+
+    user_id: int = Field(
+        primary_key=True,
+        foreign_key="users.id",
+        sa_column_kwargs={"autoincrement": False},
+    )
+    shard: int
+    # Set by `manage.py reshard` while it copies the user's last changes;
+    # writes are refused meanwhile
+    moving: bool = Field(default=False)
+
+
+class IdBlock(SQLModel, table=True):
+    """The next free id of a table whose ids are unique across shards."""
+
+    __tablename__ = "id_blocks"
+
+    name: str = Field(primary_key=True, max_length=100)
+    next_id: int
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.enums import Priority
@@ -9,8 +11,8 @@ if TYPE_CHECKING:
     from app.models.user import User
 
 
-class Todo(SQLModel, table=True):
-    __tablename__ = "todos"
+class TodoBase(SQLModel):
+    """Columns shared by the hot ``todos`` table and ``archived_todos``."""
 
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(min_length=1, max_length=200)
@@ -21,5 +23,52 @@ class Todo(SQLModel, table=True):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     user_id: int = Field(foreign_key="users.id", index=True)
+    # Per-user sequence number of the last write; see User.change_seq
+    change_seq: int = Field(default=0)
+    # Bumped by every write and sent as the ETag; see Todo.__mapper_args__
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+
+
+class Todo(TodoBase, table=True):
+    __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_change_seq", "user_id", "change_seq"),
+        # Archived todos keep their ids, so SQLite must never hand one out
+        # again once it has left this table
+        {"sqlite_autoincrement": True},
+    )
 
     user: "User" = Relationship(back_populates="todos")
+
+    @declared_attr
+    def __mapper_args__(cls):
+        # The ORM adds "AND version = <loaded version>" to each UPDATE and
+        # DELETE and raises StaleDataError when another write got there first
+        return {"version_id_col": cls.__table__.c.version}
+
+
+class ArchivedTodo(TodoBase, table=True):
+    """A completed todo moved out of ``todos`` by ``manage.py archive``.
+
+    Keeps the id it had in ``todos``. Archived todos are read-only.
+    """
+
+    __tablename__ = "archived_todos"
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TodoTombstone(SQLModel, table=True):
+    """Marks a deleted todo so ``/todos/changes`` can report the deletion."""
+
+    __tablename__ = "todo_tombstones"
+    __table_args__ = (
+        Index("ix_todo_tombstones_user_id_change_seq", "user_id", "change_seq"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    todo_id: int
+    user_id: int = Field(foreign_key="users.id")
+    change_seq: int
+    deleted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
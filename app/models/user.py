@@ -14,5 +14,7 @@ class User(SQLModel, table=True):
     username: str = Field(unique=True, index=True, min_length=3, max_length=100)
     password_hash: str = Field(max_length=255)
     is_active: bool = Field(default=True)
+    # Last change sequence number handed out to this user's todos
+    change_seq: int = Field(default=0)
 
     todos: list["Todo"] = Relationship(back_populates="user")
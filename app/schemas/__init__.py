@@ -1,15 +1,28 @@
 from app.schemas.auth import TokenResponse
 from app.schemas.common import ErrorResponse, MessageResponse
-from app.schemas.todo import TodoCreate, TodoListResponse, TodoResponse, TodoUpdate
+from app.schemas.todo import (
+    TodoChangesResponse,
+    TodoCreate,
+    TodoDeleted,
+    TodoExportResponse,
+    TodoListResponse,
+    TodoResponse,
+    TodoStatsResponse,
+    TodoUpdate,
+)
 from app.schemas.user import UserLogin, UserRegister, UserResponse
 
 __all__ = [
     "ErrorResponse",
     "MessageResponse",
     "TokenResponse",
+    "TodoChangesResponse",
     "TodoCreate",
+    "TodoDeleted",
+    "TodoExportResponse",
     "TodoListResponse",
     "TodoResponse",
+    "TodoStatsResponse",
     "TodoUpdate",
     "UserLogin",
     "UserRegister",
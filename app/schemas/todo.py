@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
-from app.models.enums import Priority
+from app.models.enums import JobStatus, Priority
 
 
 class TodoCreate(BaseModel):
@@ -30,6 +30,8 @@ class TodoResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     user_id: int
+    # Also the ETag; send it back in If-Match to update only this version
+    version: int
 
     model_config = {"from_attributes": True}
 
@@ -40,3 +42,37 @@ class TodoListResponse(BaseModel):
     page: int
     per_page: int
     pages: int
+
+
+class TodoDeleted(BaseModel):
+    id: int
+    deleted_at: datetime
+
+
+class TodoChangesResponse(BaseModel):
+    changed: list[TodoResponse]
+    deleted: list[TodoDeleted]
+    cursor: str
+    has_more: bool
+
+
+class TodoStatsResponse(BaseModel):
+    total: int
+    completed: int
+    active: int
+    by_priority: dict[Priority, int]
+    # Active todos due before today (UTC)
+    overdue: int
+    # Active todos due today (UTC)
+    due_today: int
+
+
+class TodoExportResponse(BaseModel):
+    id: int
+    status: JobStatus
+    # Set once the export is done
+    todos: int | None = None
+    size: int | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+    expires_at: datetime | None = None
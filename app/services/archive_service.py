@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, literal
+from sqlmodel import Session, select
+
+from app.core.config import Config
+from app.core.database import router
+from app.core.jobs import task
+from app.models import ArchivedTodo, Todo
+from app.services.todo_service import TODO_COLUMNS
+
+
+def archive_batch(session: Session, cutoff: datetime, batch_size: int) -> int:
+    """Move up to ``batch_size`` todos completed before ``cutoff`` in one commit.
+
+    A todo counts as completed at its last write, so anything touched since
+    the cutoff stays hot. Returns the number of todos moved.
+    """
+    ids = session.exec(
+        select(Todo.id)
+        .where(Todo.completed.is_(True), Todo.updated_at < cutoff)
+        .order_by(Todo.id)
+        .limit(batch_size)
+        # Concurrent movers take different rows, and a write to a todo being
+        # moved waits for the move (no-op on SQLite, which has one writer)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if ids:
+        archived_at = literal(
+            datetime.now(timezone.utc), ArchivedTodo.__table__.c.archived_at.type
+        )
+        rows = select(*Todo.__table__.columns, archived_at).where(Todo.id.in_(ids))
+        session.exec(
+            insert(ArchivedTodo).from_select([*TODO_COLUMNS, "archived_at"], rows)
+        )
+        session.exec(delete(Todo).where(Todo.id.in_(ids)))
+    session.commit()
+    return len(ids)
+
+
+def archive_completed(session: Session, older_than: timedelta, batch_size: int) -> int:
+    """Archive every todo completed more than ``older_than`` ago.
+
+    Each batch is its own transaction, so row locks are short and an
+    interrupted run keeps the batches it finished.
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    total = 0
+    while moved := archive_batch(session, cutoff, batch_size):
+        total += moved
+    return total
+
+
+def archive_all_shards(older_than: timedelta, batch_size: int) -> int:
+    """:func:`archive_completed` on every shard, each holding its own tiers."""
+    total = 0
+    for engine in router.engines:
+        with Session(engine) as session:
+            total += archive_completed(session, older_than, batch_size)
+    return total
+
+
+@task("archive_completed", every=Config.ARCHIVE_INTERVAL_SECONDS, timeout=3600)
+def archive_task(session: Session) -> int:
+    return archive_all_shards(
+        timedelta(days=Config.ARCHIVE_AFTER_DAYS), Config.ARCHIVE_BATCH_SIZE
+    )
@@ -0,0 +1,54 @@
+import asyncio
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import router
+from app.models import User
+from app.schemas import UserRegister
+from app.services.auth_service import hash_password, verify_password
+
+
+async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
+    return await session.get(User, user_id)
+
+
+async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    return (await session.exec(statement)).first()
+
+
+async def get_user_by_username(session: AsyncSession, username: str) -> User | None:
+    statement = select(User).where(User.username == username)
+    return (await session.exec(statement)).first()
+
+
+async def create_user(session: AsyncSession, data: UserRegister) -> User:
+    # bcrypt holds the CPU for ~100ms; keep it off the event loop
+    password_hash = await asyncio.to_thread(hash_password, data.password)
+    user = User(
+        email=data.email,
+        username=data.username,
+        password_hash=password_hash,
+    )
+    session.add(user)
+    await session.flush()
+    # As in the sync service, place the user before committing; the shard
+    # write blocks, so it runs in a thread
+    shard = router.place_user(session, user)
+    if shard:
+        await asyncio.to_thread(router.copy_user, shard, User(**user.model_dump()))
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def authenticate_user(
+    session: AsyncSession, email: str, password: str
+) -> User | None:
+    user = await get_user_by_email(session, email)
+    if user is None:
+        return None
+    if not await asyncio.to_thread(verify_password, password, user.password_hash):
+        return None
+    return user
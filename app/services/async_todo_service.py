@@ -0,0 +1,165 @@
+from collections.abc import Collection
+from datetime import date, datetime, timezone
+
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Todo, User
+from app.schemas import (
+    TodoChangesResponse,
+    TodoCreate,
+    TodoListResponse,
+    TodoStatsResponse,
+    TodoUpdate,
+)
+from app.services.todo_service import (
+    VersionConflict,
+    apply_update,
+    change_seq_statement,
+    changes_response,
+    changes_statements,
+    check_version,
+    list_response,
+    list_statements,
+    publish_change,
+    publish_delete,
+    stats_response,
+    stats_statement,
+    tombstone,
+)
+
+
+async def next_change_seq(session: AsyncSession, user_id: int) -> int:
+    return (await session.exec(change_seq_statement(user_id))).scalar_one()
+
+
+async def commit_write(session: AsyncSession, if_match: Collection[int] | None) -> None:
+    try:
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        raise VersionConflict(precondition=if_match is not None) from None
+
+
+async def create_todo(session: AsyncSession, user_id: int, data: TodoCreate) -> Todo:
+    todo = Todo(
+        title=data.title,
+        description=data.description,
+        priority=data.priority,
+        due_date=data.due_date,
+        user_id=user_id,
+        change_seq=await next_change_seq(session, user_id),
+    )
+    session.add(todo)
+    await session.commit()
+    await session.refresh(todo)
+    publish_change("created", todo)
+    return todo
+
+
+async def get_todo(session: AsyncSession, todo_id: int, user_id: int) -> Todo | None:
+    statement = select(Todo).where(Todo.id == todo_id, Todo.user_id == user_id)
+    return (await session.exec(statement)).first()
+
+
+async def list_todos(
+    session: AsyncSession,
+    user_id: int,
+    page: int = 1,
+    per_page: int = 10,
+    completed: bool | None = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    include_archived: bool = False,
+) -> TodoListResponse:
+    count_statement, statement, params = list_statements(
+        user_id, page, per_page, completed, sort_by, order, include_archived
+    )
+    total = (await session.exec(count_statement, params=params)).one()
+    todos = (await session.exec(statement, params=params)).all()
+    return list_response(todos, total, page, per_page)
+
+
+async def update_todo(
+    session: AsyncSession,
+    todo_id: int,
+    user_id: int,
+    data: TodoUpdate,
+    if_match: Collection[int] | None = None,
+) -> Todo | None:
+    todo = await get_todo(session, todo_id, user_id)
+    if todo is None:
+        return None
+    check_version(todo, if_match)
+
+    change_seq = await next_change_seq(session, user_id)
+    apply_update(todo, data)
+    todo.change_seq = change_seq
+    session.add(todo)
+    await commit_write(session, if_match)
+    await session.refresh(todo)
+    publish_change("updated", todo)
+    return todo
+
+
+async def delete_todo(
+    session: AsyncSession,
+    todo_id: int,
+    user_id: int,
+    if_match: Collection[int] | None = None,
+) -> bool:
+    todo = await get_todo(session, todo_id, user_id)
+    if todo is None:
+        return False
+    check_version(todo, if_match)
+
+    change_seq = await next_change_seq(session, user_id)
+    session.add(tombstone(todo, change_seq))
+    await session.delete(todo)
+    await commit_write(session, if_match)
+    publish_delete(user_id, todo_id, change_seq)
+    return True
+
+
+async def toggle_todo(
+    session: AsyncSession,
+    todo_id: int,
+    user_id: int,
+    if_match: Collection[int] | None = None,
+) -> Todo | None:
+    todo = await get_todo(session, todo_id, user_id)
+    if todo is None:
+        return None
+    check_version(todo, if_match)
+
+    todo.change_seq = await next_change_seq(session, user_id)
+    todo.completed = not todo.completed
+    todo.updated_at = datetime.now(timezone.utc)
+    session.add(todo)
+    await commit_write(session, if_match)
+    await session.refresh(todo)
+    publish_change("toggled", todo)
+    return todo
+
+
+async def current_change_seq(session: AsyncSession, user_id: int) -> int:
+    statement = select(User.change_seq).where(User.id == user_id)
+    return (await session.exec(statement)).one()
+
+
+async def list_changes(
+    session: AsyncSession, user_id: int, since: int = 0, limit: int = 100
+) -> TodoChangesResponse:
+    todos_statement, tombstones_statement = changes_statements(user_id, since, limit)
+    todos = (await session.exec(todos_statement)).all()
+    tombstones = (await session.exec(tombstones_statement)).all()
+    return changes_response(todos, tombstones, since, limit)
+
+
+async def todo_stats(
+    session: AsyncSession, user_id: int, today: date | None = None
+) -> TodoStatsResponse:
+    today = today or datetime.now(timezone.utc).date()
+    rows = (await session.exec(stats_statement(user_id, today))).all()
+    return stats_response(rows)
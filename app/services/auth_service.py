@@ -1,6 +1,7 @@
 import bcrypt
 from sqlmodel import Session, select
 
+from app.core.database import router
 from app.models import User
 from app.schemas import UserRegister
 
@@ -34,6 +35,10 @@ def create_user(session: Session, data: UserRegister) -> User:
         password_hash=hash_password(data.password),
     )
     session.add(user)
+    session.flush()
+    # Place the user before committing so a failed shard write fails the
+    # registration instead of leaving the user on shard 0
+    router.add_user(session, user)
     session.commit()
     session.refresh(user)
     return user
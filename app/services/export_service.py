@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+import secrets
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+
+from sqlmodel import Session, select
+
+from app.core.config import Config
+from app.core.database import router
+from app.core.jobs import enqueue, task
+from app.models import ArchivedTodo, Job, JobStatus, Todo
+from app.schemas import TodoExportResponse, TodoResponse
+
+EXPORT_TASK = "export_todos"
+
+
+def export_path(file: str) -> Path:
+    return Path(Config.EXPORT_DIR) / file
+
+
+def export_response(job: Job) -> TodoExportResponse:
+    result = json.loads(job.result) if job.result else {}
+    expires_at = None
+    if job.status == JobStatus.DONE:
+        expires_at = job.finished_at + timedelta(hours=Config.EXPORT_RETENTION_HOURS)
+    return TodoExportResponse(
+        id=job.id,
+        status=job.status,
+        todos=result.get("todos"),
+        size=result.get("size"),
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        expires_at=expires_at,
+    )
+
+
+def start_export(session: Session, user_id: int) -> TodoExportResponse:
+    """Queue an export of all of ``user_id``'s todos, archived ones included."""
+    # Random file names, so one user cannot guess another's export
+    job = enqueue(
+        session,
+        EXPORT_TASK,
+        {"user_id": user_id, "file": f"{secrets.token_hex(16)}.ndjson.gz"},
+    )
+    session.flush()
+    export = export_response(job)
+    session.commit()
+    return export
+
+
+def get_export(session: Session, export_id: int, user_id: int) -> Job | None:
+    job = session.get(Job, export_id)
+    if job is None or job.name != EXPORT_TASK:
+        return None
+    if json.loads(job.payload)["user_id"] != user_id:
+        return None
+    return job
+
+
+def export_file(job: Job) -> Path | None:
+    """The finished file of an export, or ``None`` if not done or expired."""
+    path = export_path(json.loads(job.payload)["file"])
+    return path if path.is_file() else None
+
+
+def export_rows(session: Session, user_id: int) -> Iterator[TodoResponse]:
+    """Every todo of ``user_id``, hot then archived, in id order.
+
+    Each tier is one query off its ``user_id`` index, fetched
+    ``EXPORT_CHUNK_SIZE`` rows at a time, so memory stays flat however large
+    the account is.
+    """
+    for model in (Todo, ArchivedTodo):
+        rows = session.exec(
+            select(model)
+            .where(model.user_id == user_id)
+            .order_by(model.id)
+            .execution_options(yield_per=Config.EXPORT_CHUNK_SIZE)
+        )
+        for todo in rows:
+            yield TodoResponse.model_validate(todo)
+
+
+@task(EXPORT_TASK, timeout=3600)
+def export_todos(session: Session, user_id: int, file: str) -> dict:
+    """Write ``user_id``'s todos to ``EXPORT_DIR/file`` as gzipped NDJSON.
+
+    The file only appears under its name once complete, so a download never
+    sees a partial file and a retried job simply starts over.
+    """
+    path = export_path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.partial")
+    count = 0
+    with gzip.open(partial, "wb") as out, router.session(user_id) as shard:
+        for todo in export_rows(shard, user_id):
+            out.write(todo.model_dump_json().encode() + b"\n")
+            count += 1
+    os.replace(partial, path)
+    return {"todos": count, "size": path.stat().st_size}
+
+
+@task("prune_exports", every=60 * 60)
+def prune_exports(session: Session) -> int:
+    """Delete export files older than ``EXPORT_RETENTION_HOURS``."""
+    directory = Path(Config.EXPORT_DIR)
+    if not directory.is_dir():
+        return 0
+    cutoff = time.time() - Config.EXPORT_RETENTION_HOURS * 60 * 60
+    removed = 0
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            # Pruned by another worker meanwhile
+            pass
+    return removed
@@ -0,0 +1,181 @@
+import time
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, func, select
+
+from app.core.database import ShardRouter
+from app.models import ArchivedTodo, Todo, TodoTombstone, User, UserShard
+
+COPY_BATCH = 1000
+# Copies made while the user can still write; each one only carries what
+# changed during the previous, so the last, write-paused copy is short
+LIVE_PASSES = 3
+
+
+def row_ids(session: Session, model, user_id: int) -> set[int]:
+    return set(session.exec(select(model.id).where(model.user_id == user_id)).all())
+
+
+def delete_rows(session: Session, model, ids: Iterable[int]) -> None:
+    ids = sorted(ids)
+    for start in range(0, len(ids), COPY_BATCH):
+        chunk = ids[start : start + COPY_BATCH]
+        session.exec(delete(model).where(model.id.in_(chunk)))
+
+
+def copy_rows(source: Session, target: Session, model, ids: Iterable[int]) -> None:
+    """Copy ``model`` rows ``ids`` from ``source``, replacing any in ``target``."""
+    ids = sorted(ids)
+    columns = model.__table__.columns
+    for start in range(0, len(ids), COPY_BATCH):
+        chunk = ids[start : start + COPY_BATCH]
+        rows = source.exec(select(*columns).where(model.id.in_(chunk))).all()
+        target.exec(delete(model).where(model.id.in_(chunk)))
+        if rows:
+            target.exec(insert(model), params=[row._asdict() for row in rows])
+
+
+def sync_user(source: Session, target: Session, user: User, since: int | None) -> int:
+    """Bring ``target`` up to date with the user's rows in ``source``.
+
+    Only todos written after ``since`` (a ``change_seq``) are copied again,
+    plus any ``target`` lacks. Returns the counter to pass as ``since`` next
+    time. Safe to repeat, and to run while the user writes: whatever lands
+    meanwhile is picked up by the next pass.
+    """
+    seq = source.exec(select(User.change_seq).where(User.id == user.id)).one()
+
+    source_ids = row_ids(source, Todo, user.id)
+    target_ids = row_ids(target, Todo, user.id)
+    changed = source_ids
+    if since is not None:
+        written = select(Todo.id).where(
+            Todo.user_id == user.id, Todo.change_seq > since
+        )
+        changed = (source_ids - target_ids) | set(source.exec(written).all())
+    delete_rows(target, Todo, target_ids - source_ids)
+    copy_rows(source, target, Todo, changed)
+
+    # Archived todos never change, and move between tiers keeping their id
+    source_ids = row_ids(source, ArchivedTodo, user.id)
+    target_ids = row_ids(target, ArchivedTodo, user.id)
+    delete_rows(target, ArchivedTodo, target_ids - source_ids)
+    copy_rows(source, target, ArchivedTodo, source_ids - target_ids)
+
+    # Tombstones are append-only in change_seq order; their ids are per shard
+    copied = target.exec(
+        select(func.max(TodoTombstone.change_seq)).where(
+            TodoTombstone.user_id == user.id
+        )
+    ).one()
+    tombstones = source.exec(
+        select(
+            TodoTombstone.todo_id, TodoTombstone.change_seq, TodoTombstone.deleted_at
+        ).where(
+            TodoTombstone.user_id == user.id, TodoTombstone.change_seq > (copied or 0)
+        )
+    ).all()
+    for row in tombstones:
+        target.add(TodoTombstone(user_id=user.id, **row._asdict()))
+
+    mirror = target.get(User, user.id)
+    if mirror is None:
+        target.add(User(**user.model_dump() | {"change_seq": seq}))
+    else:
+        mirror.change_seq = seq
+    target.commit()
+    return seq
+
+
+def purge_user(session: Session, user_id: int, keep_user: bool) -> None:
+    """Delete a moved user's rows from the shard they left."""
+    for model in (Todo, ArchivedTodo, TodoTombstone):
+        session.exec(delete(model).where(model.user_id == user_id))
+    if not keep_user:
+        session.exec(delete(User).where(User.id == user_id))
+    session.commit()
+
+
+def set_location(session: Session, user_id: int, shard: int, moving: bool) -> None:
+    row = session.get(UserShard, user_id)
+    if row is None:
+        row = UserShard(user_id=user_id, shard=shard)
+    row.shard, row.moving = shard, moving
+    session.add(row)
+    session.commit()
+
+
+def move_user(
+    router: ShardRouter,
+    user_id: int,
+    target: int,
+    wait: Callable[[float], None] = time.sleep,
+) -> bool:
+    """Move a user's todos to shard ``target`` while the app keeps serving them.
+
+    The rows are copied while the user can still write, then writes are
+    refused (``503``) for one cache period plus a last copy of what changed.
+    Reads never stop: until the switch they are served from the old shard,
+    which is only emptied once no process can still be reading from it.
+    An interrupted move is resumed by running it again. Returns ``False``
+    if the user is already on ``target``.
+    """
+    if not 0 <= target < len(router.engines):
+        raise ValueError(f"No shard {target}")
+    source = router.locate(user_id, cached=False).shard
+    if source == target:
+        return False
+
+    with (
+        Session(router.main) as main,
+        Session(router.engines[source]) as old,
+        Session(router.engines[target]) as new,
+    ):
+        user = main.get(User, user_id)
+        if user is None:
+            raise LookupError(f"No user {user_id}")
+        since = None
+        for _ in range(LIVE_PASSES):
+            since = sync_user(old, new, user, since)
+
+        # Stop writes, and wait until every process has seen that
+        set_location(main, user_id, source, moving=True)
+        wait(router.cache_seconds)
+        sync_user(old, new, user, since)
+        set_location(main, user_id, target, moving=False)
+        router.forget(user_id)
+
+        # Processes that cached the old location still read from it
+        wait(router.cache_seconds)
+        # Shard 0's users row is also the user's login
+        purge_user(old, user_id, keep_user=source == 0)
+    return True
+
+
+def rebalance(
+    router: ShardRouter,
+    dry_run: bool = False,
+    wait: Callable[[float], None] = time.sleep,
+) -> list[tuple[int, int, int]]:
+    """Move every user whose shard differs from the hash ring's choice.
+
+    Run after adding a shard: the ring hands it about ``1/N`` of the users
+    and leaves the rest where they are. Returns ``(user_id, from, to)`` for
+    each move.
+    """
+    with Session(router.main) as session:
+        placements = session.exec(
+            select(User.id, UserShard.shard)
+            .outerjoin(UserShard, UserShard.user_id == User.id)
+            .order_by(User.id)
+        ).all()
+    moves = [
+        (user_id, shard or 0, router.ring.shard_for(user_id))
+        for user_id, shard in placements
+        if (shard or 0) != router.ring.shard_for(user_id)
+    ]
+    if not dry_run:
+        for user_id, _, target in moves:
+            move_user(router, user_id, target, wait)
+    return moves
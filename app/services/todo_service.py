@@ -1,9 +1,81 @@
-from datetime import datetime, timezone
+from collections.abc import Collection
+from datetime import date, datetime, time, timedelta, timezone
 
-from sqlmodel import Session, func, select
+from sqlalchemy import and_, bindparam, case, literal, union_all
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import Session, func, select, update
 
-from app.models import Todo
-from app.schemas import TodoCreate, TodoListResponse, TodoResponse, TodoUpdate
+from app.core.events import TodoEvent, broker
+from app.core.statement_cache import StatementCache
+from app.models import ArchivedTodo, Priority, Todo, TodoTombstone, User
+from app.schemas import (
+    TodoChangesResponse,
+    TodoCreate,
+    TodoDeleted,
+    TodoListResponse,
+    TodoResponse,
+    TodoStatsResponse,
+    TodoUpdate,
+)
+
+
+class VersionConflict(Exception):
+    """The todo is not at a version the client named, or changed mid-write.
+
+    ``version`` is the current one, when known. ``precondition`` says whether
+    the client named versions (``If-Match``) or wrote unconditionally.
+    """
+
+    def __init__(self, version: int | None = None, precondition: bool = True):
+        super().__init__(version)
+        self.version = version
+        self.precondition = precondition
+
+
+def check_version(todo: Todo, if_match: Collection[int] | None) -> None:
+    """Refuse the write unless ``todo`` is at one of ``if_match`` (``None``: any)."""
+    if if_match is not None and todo.version not in if_match:
+        raise VersionConflict(todo.version)
+
+
+def commit_write(session: Session, if_match: Collection[int] | None) -> None:
+    """Commit, or raise :class:`VersionConflict` if the todo's conditional
+    ``UPDATE``/``DELETE`` matched no row: another write committed first."""
+    try:
+        session.commit()
+    except StaleDataError:
+        session.rollback()
+        raise VersionConflict(precondition=if_match is not None) from None
+
+
+def change_seq_statement(user_id: int):
+    """Claim the user's next change sequence number.
+
+    The UPDATE holds the user's row lock until commit, so one user's writes
+    commit in sequence order and a cursor never skips a change still in flight.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(change_seq=User.change_seq + 1)
+        .returning(User.change_seq)
+    )
+
+
+def next_change_seq(session: Session, user_id: int) -> int:
+    return session.exec(change_seq_statement(user_id)).scalar_one()
+
+
+def publish_change(event_type: str, todo: Todo) -> None:
+    """Announce a committed create, update or toggle to event streams."""
+    if broker.has_listeners(todo.user_id):
+        data = TodoResponse.model_validate(todo).model_dump(mode="json")
+        broker.publish(TodoEvent(todo.user_id, todo.change_seq, event_type, data))
+
+
+def publish_delete(user_id: int, todo_id: int, change_seq: int) -> None:
+    if broker.has_listeners(user_id):
+        broker.publish(TodoEvent(user_id, change_seq, "deleted", {"id": todo_id}))
 
 
 def create_todo(session: Session, user_id: int, data: TodoCreate) -> Todo:
@@ -13,10 +85,12 @@ def create_todo(session: Session, user_id: int, data: TodoCreate) -> Todo:
         priority=data.priority,
         due_date=data.due_date,
         user_id=user_id,
+        change_seq=next_change_seq(session, user_id),
     )
     session.add(todo)
     session.commit()
     session.refresh(todo)
+    publish_change("created", todo)
     return todo
 
 
@@ -35,32 +109,31 @@ SORTABLE_FIELDS = {
 }
 
 
-def list_todos(
-    session: Session,
-    user_id: int,
-    page: int = 1,
-    per_page: int = 10,
-    completed: bool | None = None,
-    sort_by: str = "created_at",
-    order: str = "desc",
-) -> TodoListResponse:
+def list_variant(sort_by: str, order: str, filtered: bool, include_archived: bool):
+    """Build the count and page statements for one shape of list request.
+
+    Values that change per request are bound at execution: ``user_id``,
+    ``offset``, ``limit`` and, when ``filtered``, ``completed``.
+    """
+    if include_archived:
+        return all_tiers_variant(sort_by, order, filtered)
+
     # Base query
-    statement = select(Todo).where(Todo.user_id == user_id)
+    statement = select(Todo).where(Todo.user_id == bindparam("user_id"))
     count_statement = (
-        select(func.count()).select_from(Todo).where(Todo.user_id == user_id)
+        select(func.count())
+        .select_from(Todo)
+        .where(Todo.user_id == bindparam("user_id"))
     )
 
     # Apply completed filter
-    if completed is not None:
-        statement = statement.where(Todo.completed == completed)
-        count_statement = count_statement.where(Todo.completed == completed)
-
-    # Get total count
-    total = session.exec(count_statement).one()
+    if filtered:
+        statement = statement.where(Todo.completed == bindparam("completed"))
+        count_statement = count_statement.where(
+            Todo.completed == bindparam("completed")
+        )
 
     # Apply sorting
-    if sort_by not in SORTABLE_FIELDS:
-        sort_by = "created_at"
     sort_column = getattr(Todo, sort_by)
     if order == "asc":
         statement = statement.order_by(sort_column.asc())
@@ -68,10 +141,72 @@ def list_todos(
         statement = statement.order_by(sort_column.desc())
 
     # Apply pagination
-    offset = (page - 1) * per_page
-    statement = statement.offset(offset).limit(per_page)
+    statement = statement.offset(bindparam("offset")).limit(bindparam("limit"))
+
+    return count_statement, statement
+
+
+TODO_COLUMNS = [column.name for column in Todo.__table__.columns]
+
+
+def tier_statement(model: type[Todo] | type[ArchivedTodo], filtered: bool):
+    columns = [model.__table__.c[name] for name in TODO_COLUMNS]
+    statement = select(*columns).where(model.user_id == bindparam("user_id"))
+    if filtered:
+        statement = statement.where(model.completed == bindparam("completed"))
+    return statement
+
+
+def all_tiers_variant(sort_by: str, order: str, filtered: bool):
+    """Like :func:`list_variant`, over ``todos`` and ``archived_todos``.
+
+    The page holds rows rather than ``Todo`` objects.
+    """
+    tiers = union_all(
+        tier_statement(Todo, filtered),
+        tier_statement(ArchivedTodo, filtered),
+    ).subquery("tiers")
+    count_statement = select(func.count()).select_from(tiers)
+
+    sort_column = tiers.c[sort_by]
+    statement = (
+        select(*tiers.c)
+        .order_by(sort_column.asc() if order == "asc" else sort_column.desc())
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    return count_statement, statement
 
-    todos = session.exec(statement).all()
+
+# At most 6 sort fields x 2 orders x filtered or not x tiers: 48 variants
+LIST_STATEMENTS = StatementCache("list_todos", list_variant)
+
+
+def list_statements(
+    user_id: int,
+    page: int,
+    per_page: int,
+    completed: bool | None,
+    sort_by: str,
+    order: str,
+    include_archived: bool = False,
+):
+    """The count and page statements behind :func:`list_todos`, and the
+    parameters to execute both with."""
+    if sort_by not in SORTABLE_FIELDS:
+        sort_by = "created_at"
+    if order != "asc":
+        order = "desc"
+    count_statement, statement = LIST_STATEMENTS.get(
+        sort_by, order, completed is not None, include_archived
+    )
+    params = {"user_id": user_id, "offset": (page - 1) * per_page, "limit": per_page}
+    if completed is not None:
+        params["completed"] = completed
+    return count_statement, statement, params
+
+
+def list_response(todos, total: int, page: int, per_page: int) -> TodoListResponse:
     pages = (total + per_page - 1) // per_page if total > 0 else 1
 
     return TodoListResponse(
@@ -83,42 +218,229 @@ def list_todos(
     )
 
 
-def update_todo(
-    session: Session, todo_id: int, user_id: int, data: TodoUpdate
-) -> Todo | None:
-    todo = get_todo(session, todo_id, user_id)
-    if todo is None:
-        return None
+def list_todos(
+    session: Session,
+    user_id: int,
+    page: int = 1,
+    per_page: int = 10,
+    completed: bool | None = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    include_archived: bool = False,
+) -> TodoListResponse:
+    """A page of the user's todos; archived ones only with ``include_archived``."""
+    count_statement, statement, params = list_statements(
+        user_id, page, per_page, completed, sort_by, order, include_archived
+    )
+    total = session.exec(count_statement, params=params).one()
+    todos = session.exec(statement, params=params).all()
+    return list_response(todos, total, page, per_page)
+
 
+def apply_update(todo: Todo, data: TodoUpdate) -> None:
     update_data = data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(todo, key, value)
 
     todo.updated_at = datetime.now(timezone.utc)
+
+
+def update_todo(
+    session: Session,
+    todo_id: int,
+    user_id: int,
+    data: TodoUpdate,
+    if_match: Collection[int] | None = None,
+) -> Todo | None:
+    todo = get_todo(session, todo_id, user_id)
+    if todo is None:
+        return None
+    check_version(todo, if_match)
+
+    # Claimed before the changes so autoflush doesn't write the row twice
+    change_seq = next_change_seq(session, user_id)
+    apply_update(todo, data)
+    todo.change_seq = change_seq
     session.add(todo)
-    session.commit()
+    commit_write(session, if_match)
     session.refresh(todo)
+    publish_change("updated", todo)
     return todo
 
 
-def delete_todo(session: Session, todo_id: int, user_id: int) -> bool:
+def tombstone(todo: Todo, change_seq: int) -> TodoTombstone:
+    return TodoTombstone(todo_id=todo.id, user_id=todo.user_id, change_seq=change_seq)
+
+
+def delete_todo(
+    session: Session,
+    todo_id: int,
+    user_id: int,
+    if_match: Collection[int] | None = None,
+) -> bool:
     todo = get_todo(session, todo_id, user_id)
     if todo is None:
         return False
+    check_version(todo, if_match)
 
+    change_seq = next_change_seq(session, user_id)
+    session.add(tombstone(todo, change_seq))
     session.delete(todo)
-    session.commit()
+    commit_write(session, if_match)
+    publish_delete(user_id, todo_id, change_seq)
     return True
 
 
-def toggle_todo(session: Session, todo_id: int, user_id: int) -> Todo | None:
+def toggle_todo(
+    session: Session,
+    todo_id: int,
+    user_id: int,
+    if_match: Collection[int] | None = None,
+) -> Todo | None:
     todo = get_todo(session, todo_id, user_id)
     if todo is None:
         return None
+    check_version(todo, if_match)
 
+    todo.change_seq = next_change_seq(session, user_id)
     todo.completed = not todo.completed
     todo.updated_at = datetime.now(timezone.utc)
     session.add(todo)
-    session.commit()
+    commit_write(session, if_match)
     session.refresh(todo)
+    publish_change("toggled", todo)
     return todo
+
+
+def changes_statements(user_id: int, since: int, limit: int):
+    """Build the todo and tombstone statements behind :func:`list_changes`.
+
+    Each fetches one row past ``limit`` so the merge can tell if more remain.
+    """
+    todos = (
+        select(Todo)
+        .where(Todo.user_id == user_id, Todo.change_seq > since)
+        .order_by(Todo.change_seq)
+        .limit(limit + 1)
+    )
+    tombstones = (
+        select(TodoTombstone)
+        .where(TodoTombstone.user_id == user_id, TodoTombstone.change_seq > since)
+        .order_by(TodoTombstone.change_seq)
+        .limit(limit + 1)
+    )
+    return todos, tombstones
+
+
+def changes_response(todos, tombstones, since: int, limit: int) -> TodoChangesResponse:
+    """Merge both feeds in sequence order and keep the first ``limit``."""
+    changes = sorted([*todos, *tombstones], key=lambda row: row.change_seq)
+    page = changes[:limit]
+    return TodoChangesResponse(
+        changed=[
+            TodoResponse.model_validate(row) for row in page if isinstance(row, Todo)
+        ],
+        deleted=[
+            TodoDeleted(id=row.todo_id, deleted_at=row.deleted_at)
+            for row in page
+            if isinstance(row, TodoTombstone)
+        ],
+        cursor=str(page[-1].change_seq if page else since),
+        has_more=len(changes) > limit,
+    )
+
+
+def current_change_seq(session: Session, user_id: int) -> int:
+    """The cursor a client that has seen every change would hold."""
+    return session.exec(select(User.change_seq).where(User.id == user_id)).one()
+
+
+def list_changes(
+    session: Session, user_id: int, since: int = 0, limit: int = 100
+) -> TodoChangesResponse:
+    """Todos written and deleted after the ``since`` cursor, oldest change first.
+
+    Reads only the changed rows, through the ``(user_id, change_seq)`` indexes.
+    """
+    todos_statement, tombstones_statement = changes_statements(user_id, since, limit)
+    todos = session.exec(todos_statement).all()
+    tombstones = session.exec(tombstones_statement).all()
+    return changes_response(todos, tombstones, since, limit)
+
+
+def stats_statement(user_id: int, today: date):
+    """Count the user's todos per ``(completed, priority)`` in one pass.
+
+    Overdue and due-today counts ride along as conditional aggregates, so
+    every figure comes from the same read of the user's rows. Archived todos
+    are all completed and only add to the priority counts; including them
+    keeps the stats (and their ETag) unchanged when todos are archived.
+    """
+    start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    active = Todo.completed.is_(False)
+    overdue = case((and_(active, Todo.due_date < start), 1))
+    due_today = case(
+        (
+            and_(
+                active,
+                Todo.due_date >= start,
+                Todo.due_date < start + timedelta(days=1),
+            ),
+            1,
+        )
+    )
+    hot = (
+        select(
+            Todo.completed,
+            Todo.priority,
+            func.count(),
+            func.count(overdue),
+            func.count(due_today),
+        )
+        .where(Todo.user_id == user_id)
+        .group_by(Todo.completed, Todo.priority)
+    )
+    archived = (
+        select(
+            literal(True),
+            ArchivedTodo.priority,
+            func.count(),
+            literal(0),
+            literal(0),
+        )
+        .where(ArchivedTodo.user_id == user_id)
+        .group_by(ArchivedTodo.priority)
+    )
+    return union_all(hot, archived)
+
+
+def stats_response(rows) -> TodoStatsResponse:
+    stats = TodoStatsResponse(
+        total=0,
+        completed=0,
+        active=0,
+        by_priority=dict.fromkeys(Priority, 0),
+        overdue=0,
+        due_today=0,
+    )
+    for completed, priority, count, overdue, due_today in rows:
+        stats.total += count
+        if completed:
+            stats.completed += count
+        else:
+            stats.active += count
+        stats.by_priority[priority] += count
+        stats.overdue += overdue
+        stats.due_today += due_today
+    return stats
+
+
+def todo_stats(
+    session: Session, user_id: int, today: date | None = None
+) -> TodoStatsResponse:
+    """Totals by completion and priority, plus overdue and due-today counts.
+
+    "Today" is the UTC date unless given.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    return stats_response(session.exec(stats_statement(user_id, today)).all())
@@ -0,0 +1,16 @@
+from app import create_app
+from app.api.v1.async_routes import use_async_views
+from app.core.asgi import ThreadPoolWsgiToAsgi
+from app.core.config import Config
+from app.core.events import broker
+from app.core.sse import STREAM_PATH, EventStream
+
+flask_app = create_app()
+use_async_views(flask_app)
+
+# uvicorn asgi:app
+app = ThreadPoolWsgiToAsgi(
+    flask_app,
+    threads=Config.ASGI_THREADS,
+    routes={STREAM_PATH: EventStream(flask_app, broker)},
+)
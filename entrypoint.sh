@@ -1,8 +1,14 @@
 #!/bin/bash
 set -e
 
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    # Metric files from a previous run would be summed into the new one
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "Running database migrations..."
-alembic upgrade head
+python migrate.py
 
 echo "Starting application..."
 exec "$@"
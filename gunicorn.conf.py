@@ -0,0 +1,26 @@
+from app.core.config import Config
+from app.core.metrics import mark_process_dead
+
+# Import and build the app once in the master; workers fork from it
+preload_app = Config.FAST_STARTUP
+
+
+def post_fork(server, worker):
+    from app.core.database import engine
+
+    # Connections opened in the master must not be shared with the worker
+    engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Probe before the load balancer's first /ready instead of on it
+    worker.wsgi.extensions["readiness"].start()
+    if Config.FAST_STARTUP:
+        from app.core.database import engine
+        from app.core.startup import warmup
+
+        warmup(worker.wsgi, engine)
+
+
+def child_exit(server, worker):
+    mark_process_dead(worker.pid)
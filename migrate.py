@@ -0,0 +1,53 @@
+"""Upgrade the database to the latest migration; a no-op when it is current.
+
+Runs on every container start, for DATABASE_URL and then each of SHARD_URLS.
+``alembic upgrade head`` imports the whole app through env.py even when there
+is nothing to do, so this first compares the version table with the script
+heads using only SQLAlchemy and alembic, and never imports ``app``.
+"""
+
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def pending_migrations(url: str, alembic_ini: str = ALEMBIC_INI) -> bool:
+    """Whether the database revision differs from the migration scripts' head."""
+    script = ScriptDirectory.from_config(AlembicConfig(alembic_ini))
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            current = set(MigrationContext.configure(conn).get_current_heads())
+    finally:
+        engine.dispose()
+    return current != set(script.get_heads())
+
+
+def database_urls() -> list[str]:
+    """The main database and every shard, parsed as Config does."""
+    # Same default as Config.DATABASE_URL and migrations/env.py
+    urls = [os.getenv("DATABASE_URL", "sqlite:///./app.db")]
+    shards = os.getenv("SHARD_URLS", "").split(",")
+    return urls + [url.strip() for url in shards if url.strip()]
+
+
+def main() -> int:
+    for url in database_urls():
+        if not pending_migrations(url):
+            print("Schema is up to date")
+            continue
+        # migrations/env.py connects to DATABASE_URL
+        os.environ["DATABASE_URL"] = url
+        command.upgrade(AlembicConfig(ALEMBIC_INI), "head")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Compare the sync WSGI deployment with the async ASGI one under the same load.
+
+Run with ``python -m tests.benchmarks.bench_async``. Each deployment is started
+as a single process on a fresh, migrated SQLite database and driven over HTTP
+by the ``bench_load`` request mix at the same concurrency:
+
+* ``gunicorn`` - one sync worker, the ``Dockerfile`` default per process
+* ``gunicorn-gthread`` - one worker with ``--threads`` equal to the concurrency
+* ``uvicorn`` - ``asgi:app`` with the async views and async engine
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from tests.benchmarks.bench_load import (
+    DEFAULT_MIX,
+    HTTPTransport,
+    load_mix,
+    run,
+    setup_user,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def deployments(port: int, concurrency: int) -> dict[str, list[str]]:
+    bind = f"127.0.0.1:{port}"
+    gunicorn = [sys.executable, "-m", "gunicorn", "-c", "/dev/null", "-b", bind]
+    return {
+        "gunicorn": [*gunicorn, "-w", "1", "run:app"],
+        "gunicorn-gthread": [
+            *gunicorn,
+            "-w",
+            "1",
+            "--threads",
+            str(concurrency),
+            "run:app",
+        ],
+        "uvicorn": [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "asgi:app",
+        ],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/api/v1/health", timeout=1).close()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    raise RuntimeError(f"{base_url} did not come up within {timeout}s")
+
+
+def bench(command: list[str], env: dict, port: int, args, mix: list[dict]) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        command,
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    transports = [HTTPTransport(base_url) for _ in range(args.concurrency)]
+    try:
+        wait_until_up(base_url)
+        run_id = uuid.uuid4().hex[:8]
+        users = [setup_user(t, run_id, vu) for vu, t in enumerate(transports)]
+        return run(transports, users, mix, args.duration)
+    finally:
+        # Open keep-alive connections would hold up a graceful shutdown
+        for transport in transports:
+            if transport.conn is not None:
+                transport.conn.close()
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def p95(results: dict) -> float:
+    return max(route["p95_ms"] for route in results["routes"].values())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="JSONL request mix")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    mix = load_mix(args.mix)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'async.db')}",
+            "RATE_LIMIT_ENABLED": "0",
+            "ADMISSION_ENABLED": "0",
+        }
+        subprocess.run(
+            [sys.executable, "migrate.py"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+        port = free_port()
+        for name, command in deployments(port, args.concurrency).items():
+            results[name] = bench(command, env, port, args, mix)
+
+    print(
+        f"{'deployment':<18}{'requests':>10}{'req/s':>10}"
+        f"{'err':>8}{'worst p95':>12}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<18}{r['requests']:>10}{r['rps']:>10.1f}"
+            f"{r['error_rate']:>8.1%}{p95(r):>12.2f}"
+        )
+    print(f"\n{args.concurrency} concurrent users for {args.duration:.0f}s each")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Per-request JWT auth overhead, with and without the verified-token cache.
+
+Run with ``python -m tests.benchmarks.bench_auth``.
+"""
+
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from flask_jwt_extended import (  # noqa: E402
+    create_access_token,
+    decode_token,
+    jwt_required,
+)
+
+from app import create_app, jwt  # noqa: E402
+
+ITERATIONS = 5000
+
+
+def _per_call_us(func, number: int = ITERATIONS) -> float:
+    func()  # warmup
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1_000_000
+
+
+def main() -> None:
+    app = create_app()
+
+    @app.route("/_bench/public")
+    def public():
+        return ""
+
+    @app.route("/_bench/protected")
+    @jwt_required()
+    def protected():
+        return ""
+
+    client = app.test_client()
+
+    with app.app_context():
+        token = create_access_token(identity="1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {}
+    for label, size in (("uncached", 0), ("cached", 1024)):
+        jwt.token_cache.maxsize = size
+        jwt.token_cache.clear()
+
+        with app.app_context():
+            results[f"decode_token ({label})"] = _per_call_us(
+                lambda: decode_token(token)
+            )
+
+        public_us = _per_call_us(lambda: client.get("/_bench/public"), 1000)
+        protected_us = _per_call_us(
+            lambda: client.get("/_bench/protected", headers=headers), 1000
+        )
+        results[f"request auth overhead ({label})"] = protected_us - public_us
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Replay a recorded request mix against the app and report per-route latency.
+
+Run with ``python -m tests.benchmarks.bench_load``. The target is an in-process
+app on a temporary SQLite file (``--target app``, the default) or a live server
+(``--target http://localhost:8000``). Each virtual user registers its own
+account and creates one todo, so the mix can use ``{{token}}``,
+``{{todo_id}}`` and ``{{vu}}`` placeholders.
+
+Closed loop (``--concurrency`` users back to back) is the default. With
+``--rate`` requests are issued on a fixed schedule instead, and latency is
+measured from the scheduled start, so a slow server cannot hide its queueing.
+
+Record a mix from real traffic by setting ``REQUEST_RECORD_PATH`` on the server.
+Live targets should allow ``--concurrency`` registrations, for example with
+``RATE_LIMITS=auth.register=off``.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+DEFAULT_MIX = os.path.join(os.path.dirname(__file__), "requests.jsonl")
+PASSWORD = "load-test-password"
+
+
+def load_mix(path: str) -> list[dict]:
+    with open(path) as f:
+        mix = [json.loads(line) for line in f if line.strip()]
+    if not mix:
+        raise SystemExit(f"{path} has no requests")
+    return mix
+
+
+def render(value, variables: dict):
+    """Substitute ``{{name}}`` placeholders in strings, lists and dicts."""
+    if isinstance(value, str):
+        for name, replacement in variables.items():
+            value = value.replace(f"{{{{{name}}}}}", str(replacement))
+        return value
+    if isinstance(value, dict):
+        return {k: render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render(v, variables) for v in value]
+    return value
+
+
+def route_name(entry: dict) -> str:
+    return entry.get("name") or f"{entry['method']} {entry['path'].split('?')[0]}"
+
+
+class AppTransport:
+    """In-process requests through the Flask test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, headers=None, json_body=None):
+        response = self.client.open(
+            path, method=method, headers=headers, json=json_body
+        )
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPTransport:
+    """One keep-alive HTTP/1.1 connection per virtual user."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.conn = None
+
+    def request(self, method, path, headers=None, json_body=None):
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # The server closed an idle keep-alive connection; retry once
+                self.conn.close()
+                self.conn = None
+                if attempt == 2:
+                    raise
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+
+def create_in_process_app():
+    db_dir = tempfile.mkdtemp(prefix="bench-load-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_dir}/load.db")
+    # Every virtual user registers from the same address
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+    from sqlmodel import SQLModel
+
+    from app import create_app
+    from app.core.database import engine
+
+    SQLModel.metadata.create_all(engine)
+    return create_app()
+
+
+def setup_user(transport, run_id: str, vu: int) -> dict:
+    email = f"load-{run_id}-{vu}@example.com"
+    status, _ = transport.request(
+        "POST",
+        "/api/v1/auth/register",
+        json_body={
+            "email": email,
+            "username": f"load-{run_id}-{vu}",
+            "password": PASSWORD,
+        },
+    )
+    if status not in (201, 409):
+        raise SystemExit(f"Registering virtual user {vu} failed with HTTP {status}")
+    status, body = transport.request(
+        "POST", "/api/v1/auth/login", json_body={"email": email, "password": PASSWORD}
+    )
+    if status != 200:
+        raise SystemExit(f"Logging in virtual user {vu} failed with HTTP {status}")
+    token = body["access_token"]
+    _, todo = transport.request(
+        "POST",
+        "/api/v1/todos",
+        headers={"Authorization": f"Bearer {token}"},
+        json_body={"title": f"Load test todo {vu}"},
+    )
+    return {"vu": vu, "token": token, "todo_id": todo["id"]}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    index = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def summarize(samples: dict[str, list], errors: dict[str, int], elapsed: float) -> dict:
+    routes = {}
+    for name, latencies in sorted(samples.items()):
+        latencies = sorted(latencies)
+        routes[name] = {
+            "count": len(latencies),
+            "errors": errors.get(name, 0),
+            "error_rate": errors.get(name, 0) / len(latencies),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1],
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {
+        "elapsed_s": elapsed,
+        "requests": total,
+        "rps": total / elapsed,
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "routes": routes,
+    }
+
+
+def run(
+    transports: list,
+    users: list[dict],
+    mix: list[dict],
+    duration: float,
+    rate: float | None = None,
+) -> dict:
+    samples: dict[str, list] = {}
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+    counter = itertools.count()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def virtual_user(vu: int) -> None:
+        transport, variables = transports[vu], users[vu]
+        # Offset each user so the mix is spread across users from the start
+        offset = vu * len(mix) // len(users)
+        for i in itertools.count():
+            if rate is None:
+                scheduled = time.perf_counter()
+                entry = mix[(offset + i) % len(mix)]
+            else:
+                n = next(counter)
+                scheduled = start + n / rate
+                entry = mix[n % len(mix)]
+            if scheduled >= deadline:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                status, _ = transport.request(
+                    entry["method"],
+                    render(entry["path"], variables),
+                    render(entry.get("headers"), variables),
+                    render(entry.get("json"), variables),
+                )
+                failed = status >= 400
+            except Exception:
+                failed = True
+            latency_ms = (time.perf_counter() - scheduled) * 1000
+
+            name = route_name(entry)
+            with lock:
+                samples.setdefault(name, []).append(latency_ms)
+                if failed:
+                    errors[name] = errors.get(name, 0) + 1
+
+    threads = [
+        threading.Thread(target=virtual_user, args=(vu,)) for vu in range(len(users))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return the routes whose p95 or error rate regressed against the baseline."""
+    regressions = []
+    for name, current in results["routes"].items():
+        before = baseline["routes"].get(name)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.2f}ms -> {current['p95_ms']:.2f}ms"
+            )
+        if current["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(
+                f"{name}: error rate {before['error_rate']:.1%} -> "
+                f"{current['error_rate']:.1%}"
+            )
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    width = max(len(name) for name in results["routes"])
+    print(
+        f"{'route':<{width}}  {'count':>7} {'rps':>8} {'err':>6} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    )
+    for name, r in results["routes"].items():
+        print(
+            f"{name:<{width}}  {r['count']:>7} {r['rps']:>8.1f} "
+            f"{r['error_rate']:>6.1%} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}"
+        )
+    print(
+        f"\n{results['requests']} requests in {results['elapsed_s']:.1f}s "
+        f"({results['rps']:.1f} req/s), error rate {results['error_rate']:.2%}; "
+        "latencies in ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="app", help='"app" or a base URL')
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="JSONL request mix")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--rate", type=float, help="requests/second (open loop)")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="fail on regression against this JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    mix = load_mix(args.mix)
+    if args.target == "app":
+        app = create_in_process_app()
+        transports = [AppTransport(app) for _ in range(args.concurrency)]
+    else:
+        transports = [HTTPTransport(args.target) for _ in range(args.concurrency)]
+
+    run_id = uuid.uuid4().hex[:8]
+    users = [setup_user(t, run_id, vu) for vu, t in enumerate(transports)]
+    results = run(transports, users, mix, args.duration, args.rate)
+    results["config"] = {
+        "target": args.target,
+        "mix": os.path.relpath(args.mix),
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "rate": args.rate,
+    }
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:", *regressions, sep="\n  ")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
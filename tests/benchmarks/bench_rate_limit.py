@@ -0,0 +1,42 @@
+"""Cost of one token-bucket check per store backend.
+
+Run with ``python -m tests.benchmarks.bench_rate_limit``.
+"""
+
+import os
+import tempfile
+import time
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from app.core.rate_limit import Limit, MemoryStore, SQLiteStore  # noqa: E402
+
+ITERATIONS = 20000
+
+
+def _per_call_us(func, number: int = ITERATIONS) -> float:
+    func()  # warmup
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1_000_000
+
+
+def main() -> None:
+    limit = Limit.parse("1000000/second")
+    with tempfile.TemporaryDirectory() as tmp:
+        stores = {
+            "memory://": MemoryStore(),
+            "sqlite (shared)": SQLiteStore(os.path.join(tmp, "buckets.db")),
+        }
+        results = {
+            name: _per_call_us(lambda: store.consume("user:1", limit, time.time()))
+            for name, store in stores.items()
+        }
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:8.2f} us/check")
+
+
+if __name__ == "__main__":
+    main()
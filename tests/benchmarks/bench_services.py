@@ -0,0 +1,221 @@
+"""Service-layer micro-benchmarks with a regression gate.
+
+Run with ``python -m tests.benchmarks.bench_services``. Fixture databases with
+1k/100k/1M todos for one user are built once into ``--data-dir`` and reused.
+
+``--save-baseline`` stores the results as the baseline; later runs fail when a
+benchmark's median is more than ``--tolerance`` slower than it. Only compare
+baselines recorded on the same machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import batched
+
+import sqlalchemy
+from sqlalchemy import create_engine, insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.seed import TextPool, insert_todos, todo_rows
+from app.models import Todo, User
+from app.models.enums import Priority
+from app.schemas import TodoCreate, TodoResponse
+from app.services.auth_service import hash_password, verify_password
+from app.services.todo_service import (
+    SORTABLE_FIELDS,
+    create_todo,
+    list_todos,
+    toggle_todo,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "services.json")
+DEFAULT_SIZES = "1000,100000,1000000"
+BATCH = 10_000
+# A second user's rows make the user_id filter do real work
+OTHER_USER_ROWS = 1000
+
+
+def build_database(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(rows)
+    with engine.begin() as conn:
+        for user_id in (1, 2):
+            conn.execute(
+                insert(User),
+                {
+                    "id": user_id,
+                    "email": f"bench{user_id}@example.com",
+                    "username": f"bench{user_id}",
+                    "password_hash": "unused",
+                    "is_active": True,
+                },
+            )
+        text = TextPool(rng)
+        for user_id, count in ((1, rows), (2, OTHER_USER_ROWS)):
+            todos = todo_rows(rng, user_id, count, datetime(2025, 1, 1), text)
+            for batch in batched(todos, BATCH):
+                insert_todos(conn, list(batch))
+    engine.dispose()
+
+
+def fixture_database(data_dir: str, rows: int) -> str:
+    path = os.path.join(data_dir, f"todos-{rows}.db")
+    if not os.path.exists(path):
+        print(f"Building {path} ...", file=sys.stderr)
+        os.makedirs(data_dir, exist_ok=True)
+        partial = f"{path}.partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        build_database(partial, rows)
+        os.rename(partial, path)
+    return path
+
+
+def measure(func, warmup: int, min_runs: int, min_time: float) -> dict:
+    """Time ``func`` at least ``min_runs`` times and for at least ``min_time``."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "median_ms": statistics.median(timings),
+        "min_ms": timings[0],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def benchmarks(sizes: list[int], data_dir: str, scratch_dir: str, name_filter: str):
+    """Yield ``(name, callable)`` pairs; setup happens lazily per group."""
+    for rows in sizes:
+        if not any(
+            name_filter in f"list_todos[{rows}][{sort_by}]"
+            for sort_by in SORTABLE_FIELDS
+        ):
+            # Don't build a million-row fixture nobody asked for
+            continue
+        engine = create_engine(f"sqlite:///{fixture_database(data_dir, rows)}")
+        session = Session(engine)
+        for sort_by in sorted(SORTABLE_FIELDS):
+            yield f"list_todos[{rows}][{sort_by}]", (
+                lambda s=sort_by: list_todos(session, 1, 1, 20, None, s, "desc")
+            )
+        session.close()
+        engine.dispose()
+
+    # Writes go to a private copy so the shared fixtures stay unchanged
+    smallest = fixture_database(data_dir, min(sizes))
+    scratch = os.path.join(scratch_dir, "writes.db")
+    shutil.copy(smallest, scratch)
+    engine = create_engine(f"sqlite:///{scratch}")
+    session = Session(engine)
+    data = TodoCreate(title="Benchmark todo", priority=Priority.HIGH)
+    yield "create_todo", lambda: create_todo(session, 1, data)
+    todo_id = session.exec(select(Todo.id).where(Todo.user_id == 1)).first()
+    yield "toggle_todo", lambda: toggle_todo(session, todo_id, 1)
+
+    todos = session.exec(select(Todo).where(Todo.user_id == 1).limit(100)).all()
+    yield "serialize_100_todos", lambda: [
+        TodoResponse.model_validate(todo).model_dump() for todo in todos
+    ]
+    session.close()
+    engine.dispose()
+
+    password_hash = hash_password("benchmark-password")
+    yield "hash_password", lambda: hash_password("benchmark-password")
+    yield "verify_password", lambda: verify_password(
+        "benchmark-password", password_hash
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before and current["median_ms"] > before["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {before['median_ms']:.3f}ms -> {current['median_ms']:.3f}ms "
+                f"(+{current['median_ms'] / before['median_ms'] - 1:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="rows per user")
+    parser.add_argument("--filter", default="", help="only names containing this")
+    parser.add_argument(
+        "--data-dir",
+        default=os.path.join(tempfile.gettempdir(), "todo-bench"),
+        help="where fixture databases are cached",
+    )
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        for name, func in benchmarks(sizes, args.data_dir, scratch_dir, args.filter):
+            if args.filter not in name:
+                continue
+            results[name] = measure(func, args.warmup, args.min_runs, args.min_time)
+            r = results[name]
+            print(
+                f"{name:<40} median {r['median_ms']:10.3f}ms  "
+                f"min {r['min_ms']:10.3f}ms  p95 {r['p95_ms']:10.3f}ms  "
+                f"({r['runs']} runs)"
+            )
+
+    document = {
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f)["results"], args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:", *regressions, sep="\n  ")
+        return 1
+    print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
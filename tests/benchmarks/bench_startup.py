@@ -0,0 +1,159 @@
+"""Measure import time, app creation and first-request latency in fresh processes.
+
+Run with ``python -m tests.benchmarks.bench_startup``. Every run starts a new
+interpreter so nothing is cached, and compares the default startup with
+``FAST_STARTUP=1`` and with ``FAST_STARTUP=1`` plus the post-fork warmup.
+It also times the migration check run by ``entrypoint.sh`` against a no-op
+``alembic upgrade head`` on an up-to-date database.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODES = {
+    "default": ({"FAST_STARTUP": "0"}, False),
+    "fast": ({"FAST_STARTUP": "1"}, False),
+    "fast+warmup": ({"FAST_STARTUP": "1"}, True),
+}
+METRICS = (
+    "process_ms",
+    "import_ms",
+    "create_app_ms",
+    "warmup_ms",
+    "first_list_ms",
+    "second_list_ms",
+    "first_openapi_ms",
+    "first_docs_ms",
+)
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def child(warm: bool) -> None:
+    """Runs in the fresh interpreter; prints one JSON object of timings."""
+    timings = {}
+    started = time.perf_counter()
+    from app import create_app
+    from app.core.database import engine
+    from app.core.startup import warmup
+
+    timings["import_ms"] = _ms(started)
+
+    started = time.perf_counter()
+    app = create_app()
+    timings["create_app_ms"] = _ms(started)
+
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        token = create_access_token(identity="1")
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    timings["warmup_ms"] = warmup(app, engine) if warm else 0.0
+
+    for name, path, request_headers in (
+        ("first_list_ms", "/api/v1/todos", headers),
+        ("second_list_ms", "/api/v1/todos", headers),
+        ("first_openapi_ms", "/openapi.yaml", {"Accept-Encoding": "gzip"}),
+        ("first_docs_ms", "/docs/", {}),
+    ):
+        started = time.perf_counter()
+        response = client.get(path, headers=request_headers)
+        timings[name] = _ms(started)
+        assert response.status_code == 200, (path, response.status_code)
+    print(json.dumps(timings))
+
+
+def run_child(env: dict, warm: bool) -> dict:
+    command = [sys.executable, "-m", "tests.benchmarks.bench_startup", "--child"]
+    if warm:
+        command.append("--warm")
+    started = time.perf_counter()
+    output = subprocess.run(
+        command, cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    timings = json.loads(output.splitlines()[-1])
+    timings["process_ms"] = _ms(started)
+    return timings
+
+
+def time_command(command: list[str], env: dict, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, capture_output=True, check=True)
+        timings.append(_ms(started))
+    return statistics.median(timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="processes per mode")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.warm)
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+            "RATE_LIMIT_ENABLED": "0",
+        }
+        subprocess.run(
+            [sys.executable, "migrate.py"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            check=True,
+        )
+
+        for mode, (overrides, warm) in MODES.items():
+            runs = [run_child({**env, **overrides}, warm) for _ in range(args.runs)]
+            results[mode] = {
+                metric: statistics.median(run[metric] for run in runs)
+                for metric in METRICS
+            }
+
+        results["migrations (up to date)"] = {
+            "migrate.py_ms": time_command(
+                [sys.executable, "migrate.py"], env, args.runs
+            ),
+            "alembic_upgrade_ms": time_command(
+                [sys.executable, "-m", "alembic", "upgrade", "head"], env, args.runs
+            ),
+        }
+
+    print(f"{'metric (median ms)':<20}" + "".join(f"{m:>14}" for m in MODES))
+    for metric in METRICS:
+        print(
+            f"{metric.removesuffix('_ms'):<20}"
+            + "".join(f"{results[mode][metric]:>14.2f}" for mode in MODES)
+        )
+    print()
+    for name, value in results["migrations (up to date)"].items():
+        print(f"{name.removesuffix('_ms'):<20}{value:>14.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
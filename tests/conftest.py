@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass, field
 
 import pytest
 
@@ -6,6 +7,55 @@ import pytest
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "sql_budget(n): fail if any request made by the test issues more than n "
+        "SQL statements",
+    )
+
+
+@dataclass
+class RequestStatements:
+    method: str
+    route: str
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def shapes(self) -> list[str]:
+        from app.core.query_log import statement_shape
+
+        return [statement_shape(statement) for statement in self.statements]
+
+
+class SQLRecorder:
+    """Collects the statements each test-client request executes.
+
+    Only statements run inside a request context count, so fixture setup and
+    direct ``session`` use in the test body stay out of the budget.
+    """
+
+    def __init__(self):
+        self.requests: list[RequestStatements] = []
+
+    @property
+    def last(self) -> RequestStatements:
+        return self.requests[-1]
+
+    def request_started(self, sender, **extra):
+        from flask import request
+
+        rule = request.url_rule
+        route = rule.rule if rule is not None else request.path
+        self.requests.append(RequestStatements(request.method, route))
+
+    def before_cursor_execute(self, conn, cursor, statement, *args):
+        from flask import has_request_context
+
+        if has_request_context() and self.requests:
+            self.requests[-1].statements.append(statement)
+
+
 @pytest.fixture
 def app():
     from sqlmodel import SQLModel
@@ -27,6 +77,47 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def sql_statements(app):
+    from flask import request_started
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    recorder = SQLRecorder()
+    request_started.connect(recorder.request_started, app)
+    event.listen(engine, "before_cursor_execute", recorder.before_cursor_execute)
+    yield recorder
+    event.remove(engine, "before_cursor_execute", recorder.before_cursor_execute)
+    request_started.disconnect(recorder.request_started, app)
+
+
+@pytest.fixture(autouse=True)
+def _sql_budget(request):
+    if request.node.get_closest_marker("sql_budget") is not None:
+        request.node.sql_statements = request.getfixturevalue("sql_statements")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    marker = item.get_closest_marker("sql_budget")
+    if marker is not None:
+        budget = marker.args[0]
+        over = [r for r in item.sql_statements.requests if len(r.statements) > budget]
+        if over:
+            pytest.fail(
+                f"SQL budget of {budget} exceeded:\n"
+                + "\n".join(
+                    f"  {r.method} {r.route}: {len(r.statements)} statements\n    "
+                    + "\n    ".join(r.shapes)
+                    for r in over
+                ),
+                pytrace=False,
+            )
+    return result
+
+
 @pytest.fixture
 def session(app):
     from sqlmodel import Session
@@ -37,6 +128,47 @@ def session(app):
         yield sess
 
 
+@pytest.fixture
+def async_engine(tmp_path, monkeypatch):
+    """An aiosqlite engine on a file, installed as the app's async engine.
+
+    ``:memory:`` databases are per connection, so the async tests use a file
+    whose tables are created through a sync engine.
+    """
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlmodel import SQLModel, create_engine
+
+    from app.core import database
+
+    path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(database, "_async_engine", engine)
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def shards(app, tmp_path):
+    """Two SQLite files as shards 1 and 2; the test database is shard 0."""
+    from sqlmodel import SQLModel
+
+    from app.core.database import router
+
+    router.configure([f"sqlite:///{tmp_path / f'shard{i}.db'}" for i in (1, 2)])
+    for shard_engine in router.engines[1:]:
+        SQLModel.metadata.create_all(shard_engine)
+    yield router
+    for shard_engine in router.engines[1:]:
+        shard_engine.dispose()
+    router.configure([])
+
+
 @pytest.fixture
 def test_user(app, session):
     from app.models import User
@@ -0,0 +1,127 @@
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.admission import AdmissionController, parse_request_start
+
+NOW = 1_700_000_000.0
+
+
+class TestParseRequestStart:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            f"t={NOW - 0.25:.3f}",
+            f"{NOW - 0.25:.3f}",
+            f"t={int((NOW - 0.25) * 1000)}",
+            f"t={int((NOW - 0.25) * 1_000_000)}",
+        ],
+    )
+    def test_seconds_milliseconds_microseconds(self, value):
+        assert parse_request_start(value, NOW) == pytest.approx(250, abs=1)
+
+    def test_missing_or_invalid(self):
+        assert parse_request_start(None, time.time()) is None
+        assert parse_request_start("t=abc", time.time()) is None
+
+    def test_clock_skew_clamped(self):
+        assert parse_request_start("t=2000", now=1000.0) == 0.0
+
+    def test_implausibly_old_ignored(self):
+        assert parse_request_start("t=1", NOW) is None
+        assert parse_request_start(f"t={NOW - 120:.3f}", NOW) is None
+
+
+def decisions(priority, result, reason):
+    labels = {"priority": priority, "result": result, "reason": reason}
+    return REGISTRY.get_sample_value("admission_decisions_total", labels) or 0
+
+
+@pytest.fixture
+def controller():
+    controller = AdmissionController()
+    controller.max_limit = controller.limit = 4
+    return controller
+
+
+class TestAdmissionController:
+    def test_low_priority_shed_first_on_concurrency(self, controller):
+        assert controller.admit("high", None) is None
+        assert controller.admit("high", None) is None
+
+        assert controller.admit("low", None) == "concurrency"
+        assert controller.admit("normal", None) is None
+        assert controller.admit("high", None) is None
+
+    def test_queue_time_sheds_by_priority(self, controller):
+        controller.queue_target_ms = 100
+
+        assert controller.admit("low", 150) == "queue_time"
+        assert controller.admit("normal", 150) is None
+        assert controller.admit("high", 900) is None
+        assert controller.admit("high", 1100) == "queue_time"
+
+    def test_limit_decreases_on_queueing_and_recovers(self, controller):
+        controller.admit("high", None)
+        controller.release(queue_ms=500)
+        assert controller.limit == pytest.approx(3.6)
+
+        for _ in range(10):
+            controller.admit("high", None)
+            controller.release(queue_ms=None)
+        assert controller.limit == 4
+
+    def test_limit_never_below_minimum(self, controller):
+        for _ in range(100):
+            controller._last_decrease = 0
+            controller._decrease(time.monotonic())
+
+        assert controller.limit == controller.min_limit
+
+    def test_shed_requests_leave_limit_alone(self, controller):
+        for _ in range(100):
+            controller._last_decrease = 0
+            assert controller.admit("low", 10_000) == "queue_time"
+
+        assert controller.limit == 4
+
+    def test_decisions_are_exported(self, controller):
+        shed_before = decisions("low", "shed", "queue_time")
+        admitted_before = decisions("high", "admitted", "none")
+
+        controller.admit("low", 10_000)
+        controller.admit("high", None)
+        controller.release(queue_ms=500)
+
+        assert decisions("low", "shed", "queue_time") == shed_before + 1
+        assert decisions("high", "admitted", "none") == admitted_before + 1
+        assert REGISTRY.get_sample_value("admission_limit") == pytest.approx(3.6)
+
+
+class TestAdmissionMiddleware:
+    def test_stale_list_request_shed_but_write_admitted(
+        self, app, client, auth_headers, monkeypatch
+    ):
+        monkeypatch.setattr(app.extensions["admission"], "trust_request_start", True)
+        stale = {"X-Request-Start": f"t={time.time() - 0.5:.3f}", **auth_headers}
+
+        response = client.get("/api/v1/todos", headers=stale)
+        assert response.status_code == 503
+        assert response.get_json()["error"] == "overloaded"
+        assert response.headers["Retry-After"] == "1"
+
+        response = client.post("/api/v1/todos", headers=stale, json={"title": "x"})
+        assert response.status_code == 201
+
+    def test_request_start_ignored_without_trusted_proxy(self, client, auth_headers):
+        stale = {"X-Request-Start": "t=1", **auth_headers}
+
+        response = client.get("/api/v1/todos", headers=stale)
+
+        assert response.status_code == 200
+
+    def test_in_flight_released_after_request(self, app, client, auth_headers):
+        client.get("/api/v1/todos", headers=auth_headers)
+
+        assert app.extensions["admission"].in_flight == 0
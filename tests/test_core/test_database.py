@@ -0,0 +1,204 @@
+from collections import Counter
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event, text
+from sqlmodel import Session, select
+
+from app.core.database import (
+    HashRing,
+    ShardLocation,
+    ShardMoving,
+    async_database_url,
+    engine,
+    router,
+)
+from app.models import IdBlock, Todo, User, UserShard
+from app.schemas import TodoCreate
+from app.services.todo_service import create_todo
+
+
+class TestAsyncDatabaseUrl:
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+            ("sqlite+pysqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+            (
+                "postgresql://user:pw@db:5432/todos",
+                "postgresql+asyncpg://user:pw@db:5432/todos",
+            ),
+            (
+                "postgresql+psycopg2://user@db/todos",
+                "postgresql+asyncpg://user@db/todos",
+            ),
+        ],
+    )
+    def test_swaps_driver(self, url, expected):
+        assert async_database_url(url) == expected
+
+    def test_unknown_dialect(self):
+        with pytest.raises(ValueError, match="mysql"):
+            async_database_url("mysql://user@db/todos")
+
+
+def user_on(router, shard: int) -> int:
+    """A user id the hash ring places on ``shard``."""
+    return next(i for i in range(1, 1000) if router.ring.shard_for(i) == shard)
+
+
+class TestHashRing:
+    def test_spreads_users(self):
+        ring = HashRing(3)
+
+        counts = Counter(ring.shard_for(user_id) for user_id in range(3000))
+
+        assert set(counts) == {0, 1, 2}
+        assert min(counts.values()) > 700
+
+    def test_new_shard_only_takes_users(self):
+        before, after = HashRing(3), HashRing(4)
+
+        moved = [i for i in range(3000) if before.shard_for(i) != after.shard_for(i)]
+
+        assert all(after.shard_for(i) == 3 for i in moved)
+        assert 500 < len(moved) < 1000
+
+
+class TestShardRouter:
+    def test_unsharded_uses_main_database(self, app):
+        assert router.sharded is False
+        assert router.locate(1) == ShardLocation(0)
+        assert router.session(1).bind is engine
+
+    def test_shard_engines_instrumented(self, app, shards):
+        from app.core import metrics, query_log
+
+        # The shards were configured after create_app registered its hooks
+        for shard_engine in shards.engines:
+            for module in (metrics, query_log):
+                assert event.contains(
+                    shard_engine,
+                    "before_cursor_execute",
+                    module._before_cursor_execute,
+                )
+
+        def statements():
+            return sum(
+                REGISTRY.get_sample_value("sql_compiled_cache_total", {"result": r})
+                or 0
+                for r in ("hit", "miss", "uncached")
+            )
+
+        before = statements()
+        with shards.engines[2].connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert statements() == before + 1
+
+    def test_registration_places_user(self, client, shards, session):
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": "new@example.com",
+                "username": "newuser",
+                "password": "password123",
+            },
+        )
+
+        user_id = response.get_json()["id"]
+        shard = shards.ring.shard_for(user_id)
+        assert session.get(UserShard, user_id).shard == shard
+        with Session(shards.engines[shard]) as shard_session:
+            assert shard_session.get(User, user_id).email == "new@example.com"
+
+    def test_failed_shard_write_fails_registration(
+        self, client, shards, session, monkeypatch
+    ):
+        def copy_user(shard, user):
+            raise OSError("shard down")
+
+        monkeypatch.setattr(shards.ring, "shard_for", lambda user_id: 2)
+        monkeypatch.setattr(shards, "copy_user", copy_user)
+
+        with pytest.raises(OSError):
+            client.post(
+                "/api/v1/auth/register",
+                json={
+                    "email": "new@example.com",
+                    "username": "newuser",
+                    "password": "password123",
+                },
+            )
+
+        assert session.exec(select(User)).all() == []
+        assert session.exec(select(UserShard)).all() == []
+
+    def test_todos_written_to_users_shard(self, shards, session):
+        user_id = user_on(shards, 2)
+        user = User(
+            id=user_id, email="a@example.com", username="alice", password_hash="x"
+        )
+        session.add(user)
+        session.flush()
+        shards.add_user(session, user)
+        session.commit()
+
+        with shards.session(user_id, write=True) as shard_session:
+            todo_id = create_todo(shard_session, user_id, TodoCreate(title="t")).id
+
+        with Session(shards.engines[2]) as shard_session:
+            assert shard_session.get(Todo, todo_id).title == "t"
+        assert session.get(Todo, todo_id) is None
+
+    def test_ids_unique_across_shards(self, shards, session, test_todo, monkeypatch):
+        monkeypatch.setattr(shards, "id_block_size", 2)
+
+        ids = [shards.next_todo_id() for _ in range(5)]
+
+        assert ids == list(range(test_todo.id + 1, test_todo.id + 6))
+        assert session.get(IdBlock, "todos").next_id == test_todo.id + 7
+
+    def test_writes_refused_while_moving(self, shards, session, test_user):
+        session.add(UserShard(user_id=test_user.id, shard=0, moving=True))
+        session.commit()
+
+        with shards.session(test_user.id) as shard_session:
+            assert shard_session.bind is engine
+        with pytest.raises(ShardMoving):
+            shards.session(test_user.id, write=True)
+
+    def test_locations_cached(self, shards, session, test_user):
+        assert shards.locate(test_user.id) == ShardLocation(0)
+        session.add(UserShard(user_id=test_user.id, shard=1))
+        session.commit()
+
+        assert shards.locate(test_user.id) == ShardLocation(0)
+        shards.forget(test_user.id)
+        assert shards.locate(test_user.id) == ShardLocation(1)
+
+    def test_async_session_on_users_shard(self, shards, session, test_user):
+        import asyncio
+
+        session.add(UserShard(user_id=test_user.id, shard=1))
+        session.commit()
+        # The in-memory main database is per thread: look up and reserve here
+        # rather than from the worker thread async_session would use
+        shards.locate(test_user.id)
+        shards.next_todo_id()
+
+        async def add_todo() -> int:
+            async with shards.async_session(test_user.id, write=True) as shard:
+                todo = Todo(title="async", user_id=test_user.id)
+                shard.add(todo)
+                await shard.flush()
+                todo_id = todo.id
+                await shard.commit()
+                return todo_id
+
+        todo_id = asyncio.run(add_todo())
+
+        assert todo_id is not None
+        with Session(shards.engines[1]) as shard_session:
+            assert shard_session.get(Todo, todo_id).title == "async"
+        for async_engine in shards._async_engines.values():
+            asyncio.run(async_engine.dispose())
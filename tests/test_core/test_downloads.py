@@ -0,0 +1,24 @@
+import io
+
+from app.core.downloads import FileRange
+
+
+class TestFileRange:
+    def test_reads_only_the_range(self, tmp_path):
+        path = tmp_path / "file"
+        path.write_bytes(b"0123456789")
+
+        with open(path, "rb") as file:
+            part = FileRange(file, 2, 5)
+
+            assert part.read(3) == b"234"
+            assert part.read() == b"56"
+            assert part.read() == b""
+            assert part.fileno() == file.fileno()
+
+    def test_close_closes_file(self):
+        file = io.BytesIO(b"data")
+
+        FileRange(file, 0, 4).close()
+
+        assert file.closed
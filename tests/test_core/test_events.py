@@ -0,0 +1,104 @@
+import asyncio
+import os
+import socket
+import threading
+
+from app.core.events import EventBroker, TodoEvent
+
+
+def event(user_id=1, event_id=1, event_type="created"):
+    return TodoEvent(user_id, event_id, event_type, {"id": 7})
+
+
+async def receive(subscription, timeout=1.0):
+    return await asyncio.wait_for(subscription.queue.get(), timeout)
+
+
+class TestEventBroker:
+    def test_delivers_to_the_users_subscribers(self):
+        broker = EventBroker()
+
+        async def scenario():
+            mine = broker.subscribe(1)
+            other = broker.subscribe(2)
+            # Services publish from request threads
+            thread = threading.Thread(target=broker.publish, args=(event(),))
+            thread.start()
+            thread.join()
+            return await receive(mine), other.queue.empty()
+
+        assert asyncio.run(scenario()) == (event(), True)
+
+    def test_has_listeners(self):
+        broker = EventBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            listening = broker.has_listeners(1), broker.has_listeners(2)
+            broker.unsubscribe(subscription)
+            return listening, broker.has_listeners(1)
+
+        assert asyncio.run(scenario()) == ((True, False), False)
+
+    def test_full_queue_marks_subscription_lagged(self, monkeypatch):
+        monkeypatch.setattr("app.core.events.QUEUE_SIZE", 1)
+        broker = EventBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            broker.publish(event(event_id=1))
+            broker.publish(event(event_id=2))
+            await asyncio.sleep(0)
+            return subscription.queue.qsize(), subscription.lagged
+
+        assert asyncio.run(scenario()) == (1, True)
+
+
+class TestSocketFanOut:
+    def test_fans_out_between_processes(self, tmp_path):
+        # Two brokers stand in for two processes sharing the directory
+        streaming, worker = EventBroker(), EventBroker()
+        streaming.socket_dir = worker.socket_dir = str(tmp_path)
+
+        async def scenario():
+            subscription = streaming.subscribe(1)
+            worker.publish(event())
+            received = await receive(subscription)
+            streaming.close()
+            return received
+
+        assert asyncio.run(scenario()) == event()
+        # Only processes with subscribers bind a socket
+        assert os.listdir(tmp_path) == []
+
+    def test_own_socket_skipped(self, tmp_path):
+        broker = EventBroker()
+        broker.socket_dir = str(tmp_path)
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            broker.publish(event())
+            first = await receive(subscription)
+            await asyncio.sleep(0.05)
+            broker.close()
+            return first, subscription.queue.empty()
+
+        assert asyncio.run(scenario()) == (event(), True)
+
+    def test_stale_socket_removed(self, tmp_path):
+        stale = tmp_path / "123-dead.sock"
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(stale))
+        sock.close()
+        broker = EventBroker()
+        broker.socket_dir = str(tmp_path)
+
+        broker.publish(event())
+
+        assert not stale.exists()
+
+    def test_missing_directory_ignored(self, tmp_path):
+        broker = EventBroker()
+        broker.socket_dir = str(tmp_path / "missing")
+
+        broker.publish(event())
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import select
+
+from app.core import jobs
+from app.core.jobs import Worker, enqueue, prune_jobs, retry_delay, task
+from app.models import Job, JobStatus
+
+
+@pytest.fixture
+def worker(app, monkeypatch):
+    from app.core.database import engine
+
+    worker = Worker(engine, threads=1, poll_seconds=0)
+    # Only the tasks registered below exist during a test
+    monkeypatch.setattr(jobs, "tasks", {})
+    worker.calls = []
+
+    @task("echo")
+    def echo(session, value):
+        worker.calls.append(value)
+        return {"value": value}
+
+    @task("boom", max_attempts=2)
+    def boom(session):
+        raise ValueError("boom")
+
+    return worker
+
+
+def load(session, job_id) -> Job:
+    session.expire_all()
+    return session.get(Job, job_id)
+
+
+def past(seconds=1) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+class TestEnqueue:
+    def test_unknown_task(self, worker, session):
+        with pytest.raises(LookupError, match="nope"):
+            enqueue(session, "nope")
+
+    def test_runs_after_commit(self, worker, session):
+        job = enqueue(session, "echo", {"value": 1})
+        session.commit()
+
+        assert worker.work_one() is True
+
+        job = load(session, job.id)
+        assert worker.calls == [1]
+        assert job.status == JobStatus.DONE
+        assert job.result == '{"value": 1}'
+        assert job.attempts == 1 and job.finished_at is not None
+        assert worker.work_one() is False
+
+    def test_delayed_job_waits(self, worker, session):
+        job = enqueue(session, "echo", {"value": 1}, delay=60)
+        session.commit()
+
+        assert worker.work_one() is False
+
+        job.run_at = past()
+        session.commit()
+        assert worker.work_one() is True
+
+
+class TestRetries:
+    def test_failure_retried_with_backoff(self, worker, session):
+        job = enqueue(session, "boom")
+        session.commit()
+        before = datetime.now(timezone.utc)
+
+        worker.work_one()
+
+        job = load(session, job.id)
+        assert job.status == JobStatus.QUEUED
+        assert job.last_error == "ValueError: boom"
+        delay = job.run_at.replace(tzinfo=timezone.utc) - before
+        assert timedelta(seconds=4) < delay <= timedelta(seconds=11)
+
+    def test_fails_after_max_attempts(self, worker, session):
+        job = enqueue(session, "boom")
+        session.commit()
+
+        worker.work_one()
+        job = load(session, job.id)
+        job.run_at = past()
+        session.commit()
+        worker.work_one()
+
+        job = load(session, job.id)
+        assert (job.status, job.attempts) == (JobStatus.FAILED, 2)
+        assert job.finished_at is not None
+
+    def test_backoff_doubles_up_to_cap(self, monkeypatch):
+        monkeypatch.setattr("app.core.jobs.random.uniform", lambda low, high: high)
+
+        assert [retry_delay(n) for n in (1, 2, 3)] == [10, 20, 40]
+        assert retry_delay(30) == 3600
+
+
+class TestVisibilityTimeout:
+    def test_expired_claim_taken_over(self, worker, session):
+        job = enqueue(session, "echo", {"value": 1})
+        session.commit()
+        stalled = worker.claim()
+
+        # The first worker stalls past its visibility timeout
+        assert worker.claim() is None
+        load(session, job.id).run_at = past()
+        session.commit()
+        worker.work_one()
+
+        assert load(session, job.id).attempts == 2
+        # A late outcome from the first claim is discarded
+        worker.fail(stalled, "late")
+        job = load(session, job.id)
+        assert job.status == JobStatus.DONE and job.last_error is None
+
+    def test_expired_last_attempt_fails(self, worker, session):
+        job = enqueue(session, "boom")
+        job.attempts = 2
+        job.status = JobStatus.RUNNING
+        job.run_at = past()
+        session.commit()
+
+        assert worker.claim() is None
+
+        job = load(session, job.id)
+        assert job.status == JobStatus.FAILED
+        assert job.last_error == "Visibility timeout expired"
+
+
+class TestPeriodic:
+    def test_one_run_per_interval_across_workers(self, worker, session):
+        task("tick", every=3600)(lambda session: None)
+        other = Worker(worker.engine, threads=1, poll_seconds=0)
+
+        worker.schedule_periodic()
+        other.schedule_periodic()
+        worker._scheduled.clear()
+        worker.schedule_periodic()
+
+        (job,) = session.exec(select(Job).where(Job.name == "tick")).all()
+        assert job.key.startswith("tick:")
+        assert job.run_at.replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc)
+
+    def test_prune_jobs(self, worker, session):
+        old = Job(
+            name="echo", status=JobStatus.DONE, finished_at=past(8 * 24 * 60 * 60)
+        )
+        recent = Job(name="echo", status=JobStatus.DONE, finished_at=past())
+        queued = Job(name="echo")
+        session.add_all([old, recent, queued])
+        session.commit()
+
+        assert prune_jobs(session) == 1
+        assert len(session.exec(select(Job)).all()) == 2
@@ -0,0 +1,169 @@
+import os
+import time
+
+import jwt as pyjwt
+import pytest
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from app.core.keys import KeyRing, write_private_key
+
+
+def age(keys_dir, kid, seconds):
+    then = time.time() - seconds
+    os.utime(os.path.join(keys_dir, f"{kid}.pem"), (then, then))
+
+
+def write_old_key(keys_dir, kid="20000101000000"):
+    # Keys are named by the second, so rename to make room for a new one
+    os.rename(
+        os.path.join(keys_dir, f"{write_private_key(keys_dir, 'EdDSA')}.pem"),
+        os.path.join(keys_dir, f"{kid}.pem"),
+    )
+    age(keys_dir, kid, 10_000)
+    return kid
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    return str(tmp_path / "keys")
+
+
+@pytest.fixture
+def asymmetric_app(monkeypatch, keys_dir):
+    from sqlmodel import SQLModel
+
+    from app import create_app
+    from app.core.config import Config
+    from app.core.database import engine
+
+    write_private_key(keys_dir, "RS256")
+    monkeypatch.setattr(Config, "JWT_ALGORITHM", "RS256")
+    monkeypatch.setattr(Config, "JWT_KEYS_DIR", keys_dir)
+
+    test_app = create_app()
+    test_app.config["TESTING"] = True
+    with test_app.app_context():
+        SQLModel.metadata.create_all(engine)
+        yield test_app
+        SQLModel.metadata.drop_all(engine)
+
+
+class TestKeyRing:
+    def test_missing_keys_dir_fails_fast(self, keys_dir):
+        with pytest.raises(RuntimeError):
+            KeyRing.from_directory("RS256", keys_dir)
+
+    def test_wrong_key_type_rejected(self, keys_dir):
+        write_private_key(keys_dir, "EdDSA")
+
+        with pytest.raises(RuntimeError):
+            KeyRing.from_directory("RS256", keys_dir)
+
+    def test_newest_key_is_active(self, keys_dir):
+        write_private_key(keys_dir, "EdDSA")
+        older = sorted(os.listdir(keys_dir))[0]
+        os.rename(
+            os.path.join(keys_dir, older), os.path.join(keys_dir, "20000101000000.pem")
+        )
+        write_private_key(keys_dir, "EdDSA")
+
+        keyring = KeyRing.from_directory("EdDSA", keys_dir)
+
+        assert keyring.active_kid != "20000101000000"
+        assert len(keyring.jwks()["keys"]) == 2
+
+    def test_new_key_signs_once_published(self, keys_dir):
+        old = write_old_key(keys_dir)
+        new = write_private_key(keys_dir, "EdDSA")
+
+        pending = KeyRing.from_directory("EdDSA", keys_dir, publish_seconds=7200)
+        age(keys_dir, new, 7200)
+        published = KeyRing.from_directory("EdDSA", keys_dir, publish_seconds=7200)
+
+        assert pending.active_kid == old
+        assert new in {key["kid"] for key in pending.jwks()["keys"]}
+        assert published.active_kid == new
+
+    def test_first_key_signs_immediately(self, keys_dir):
+        kid = write_private_key(keys_dir, "EdDSA")
+
+        keyring = KeyRing.from_directory("EdDSA", keys_dir, publish_seconds=7200)
+
+        assert keyring.active_kid == kid
+
+    def test_active_kid_overrides(self, keys_dir):
+        write_old_key(keys_dir)
+        new = write_private_key(keys_dir, "EdDSA")
+
+        keyring = KeyRing.from_directory(
+            "EdDSA", keys_dir, active_kid=new, publish_seconds=7200
+        )
+
+        assert keyring.active_kid == new
+
+    @pytest.mark.parametrize(
+        "algorithm,algorithm_cls", [("RS256", RSAAlgorithm), ("EdDSA", OKPAlgorithm)]
+    )
+    def test_jwks_verifies_signed_tokens(self, keys_dir, algorithm, algorithm_cls):
+        kid = write_private_key(keys_dir, algorithm)
+        keyring = KeyRing.from_directory(algorithm, keys_dir)
+        token = pyjwt.encode(
+            {"sub": "1"}, keyring.signing_key, algorithm=algorithm, headers={"kid": kid}
+        )
+
+        (jwk,) = keyring.jwks()["keys"]
+        public_key = algorithm_cls.from_jwk(jwk)
+
+        assert jwk["kid"] == kid
+        assert pyjwt.decode(token, public_key, algorithms=[algorithm])["sub"] == "1"
+
+
+class TestAsymmetricApp:
+    def test_tokens_are_signed_with_active_kid(self, asymmetric_app, test_user):
+        from flask_jwt_extended import create_access_token
+
+        from app.core.keys import get_keyring
+
+        token = create_access_token(identity=str(test_user.id))
+
+        header = pyjwt.get_unverified_header(token)
+        assert header["alg"] == "RS256"
+        assert header["kid"] == get_keyring().active_kid
+
+    def test_protected_route_accepts_token(self, asymmetric_app, test_user):
+        from flask_jwt_extended import create_access_token
+
+        token = create_access_token(identity=str(test_user.id))
+        response = asymmetric_app.test_client().get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+
+    def test_unknown_kid_rejected(self, asymmetric_app, test_user, keys_dir):
+        from app.core.keys import generate_private_key
+
+        foreign_key = generate_private_key("RS256")
+        token = pyjwt.encode(
+            {"sub": str(test_user.id), "type": "access", "jti": "x", "fresh": False},
+            foreign_key,
+            algorithm="RS256",
+            headers={"kid": "unknown"},
+        )
+        response = asymmetric_app.test_client().get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 401
+
+    def test_hs256_token_rejected(self, asymmetric_app, test_user):
+        token = pyjwt.encode(
+            {"sub": str(test_user.id), "type": "access"},
+            "dev-jwt-secret-key",
+            algorithm="HS256",
+        )
+        response = asymmetric_app.test_client().get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 401
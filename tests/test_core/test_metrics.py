@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client import REGISTRY
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsEndpoint:
+    def test_metrics_exposition_format(self, client):
+        client.get("/api/v1/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert b"http_requests_total" in response.data
+        assert b"db_pool_checkout_wait_seconds" in response.data
+
+    def test_requests_counted_by_route_template(self, client, auth_headers, test_todo):
+        labels = {"method": "GET", "route": "/api/v1/todos/<int:todo_id>"}
+        before = _sample("http_requests_total", status="200", **labels)
+
+        client.get(f"/api/v1/todos/{test_todo.id}", headers=auth_headers)
+
+        assert _sample("http_requests_total", status="200", **labels) == before + 1
+        assert _sample("http_request_duration_seconds_count", **labels) > 0
+
+    def test_sql_queries_per_request(self, client, auth_headers, test_todo):
+        route = "/api/v1/todos/<int:todo_id>"
+        count_before = _sample("http_request_sql_queries_count", route=route)
+        sum_before = _sample("http_request_sql_queries_sum", route=route)
+
+        client.get(f"/api/v1/todos/{test_todo.id}", headers=auth_headers)
+
+        assert (
+            _sample("http_request_sql_queries_count", route=route) == count_before + 1
+        )
+        assert _sample("http_request_sql_queries_sum", route=route) == sum_before + 1
+
+    def test_compiled_cache_hits(self, client, auth_headers, test_todo):
+        url = f"/api/v1/todos/{test_todo.id}"
+        client.get(url, headers=auth_headers)
+        hits = _sample("sql_compiled_cache_total", result="hit")
+
+        client.get(url, headers=auth_headers)
+
+        assert _sample("sql_compiled_cache_total", result="hit") == hits + 1
+
+    def test_in_flight_returns_to_zero(self, client):
+        client.get("/api/v1/health")
+
+        assert _sample("http_requests_in_flight") == 0
+
+
+class TestPoolCheckoutWait:
+    def test_timed_after_dispose(self):
+        from sqlalchemy import create_engine
+
+        from app.core.metrics import instrument_engine
+
+        engine = create_engine("sqlite://")
+        instrument_engine(engine)
+        # As gunicorn's post_fork does in each worker
+        engine.dispose(close=False)
+        before = _sample("db_pool_checkout_wait_seconds_count")
+
+        with engine.connect():
+            pass
+
+        assert _sample("db_pool_checkout_wait_seconds_count") == before + 1
+
+
+WORKER = """
+from app.core.metrics import REQUESTS
+REQUESTS.labels("GET", "/api/v1/todos", "200").inc()
+"""
+
+COLLECTOR = """
+from app import create_app
+print(create_app().test_client().get("/metrics").get_data(as_text=True))
+"""
+
+
+class TestMultiProcessAggregation:
+    def test_counters_summed_across_processes(self, tmp_path):
+        env = {
+            **os.environ,
+            "PROMETHEUS_MULTIPROC_DIR": str(tmp_path),
+            "DATABASE_URL": "sqlite:///:memory:",
+        }
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", WORKER], env=env, cwd=ROOT_DIR, check=True
+            )
+
+        output = subprocess.run(
+            [sys.executable, "-c", COLLECTOR],
+            env=env,
+            cwd=ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        assert (
+            'http_requests_total{method="GET",route="/api/v1/todos",status="200"} 2.0'
+            in output
+        )
@@ -0,0 +1,92 @@
+import os
+import pstats
+import time
+
+import pytest
+from flask import Flask
+
+from app.core.profiling import _before_request, init_profiling
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    return str(tmp_path / "profiles")
+
+
+@pytest.fixture
+def profiled_app(monkeypatch, profile_dir):
+    from sqlmodel import SQLModel
+
+    from app import create_app
+    from app.core.config import Config
+    from app.core.database import engine
+
+    monkeypatch.setattr(Config, "PROFILE_TOKEN", "let-me-profile")
+    monkeypatch.setattr(Config, "PROFILE_DIR", profile_dir)
+
+    test_app = create_app()
+    test_app.config["TESTING"] = True
+    with test_app.app_context():
+        SQLModel.metadata.create_all(engine)
+        yield test_app
+        SQLModel.metadata.drop_all(engine)
+
+
+class TestInitProfiling:
+    def test_disabled_registers_no_hooks(self):
+        app = Flask(__name__)
+        init_profiling(app)
+
+        assert _before_request not in app.before_request_funcs.get(None, [])
+
+    def test_unknown_profiler_rejected(self):
+        app = Flask(__name__)
+        app.config["PROFILER"] = "perf"
+
+        with pytest.raises(RuntimeError):
+            init_profiling(app)
+
+
+class TestProfiling:
+    def test_requests_without_token_not_profiled(self, profiled_app, profile_dir):
+        client = profiled_app.test_client()
+
+        response = client.get("/api/v1/health", headers={"X-Profile": "wrong"})
+
+        assert "X-Profile-File" not in response.headers
+        assert not os.path.exists(profile_dir)
+
+    def test_sampling_profile_written_per_endpoint(self, profiled_app, profile_dir):
+        @profiled_app.route("/_slow")
+        def slow():
+            time.sleep(0.05)
+            return ""
+
+        client = profiled_app.test_client()
+        response = client.get("/_slow", headers={"X-Profile": "let-me-profile"})
+
+        path = response.headers["X-Profile-File"]
+        assert path.startswith("slow/") and path.endswith(".collapsed")
+        with open(os.path.join(profile_dir, path)) as f:
+            lines = f.read().splitlines()
+        assert lines
+        assert any("slow (test_profiling.py" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_cprofile_writes_pstats(self, profiled_app, profile_dir):
+        profiled_app.config["PROFILER"] = "cprofile"
+        client = profiled_app.test_client()
+
+        response = client.get("/api/v1/health", headers={"X-Profile": "let-me-profile"})
+
+        path = os.path.join(profile_dir, response.headers["X-Profile-File"])
+        assert path.endswith(".pstats")
+        assert pstats.Stats(path).total_calls > 0
+
+    def test_sample_rate_profiles_without_header(self, profiled_app):
+        profiled_app.config["PROFILE_SAMPLE_RATE"] = 1.0
+        client = profiled_app.test_client()
+
+        response = client.get("/api/v1/health")
+
+        assert "X-Profile-File" in response.headers
@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+
+from app.core.query_log import redact, statement_shape
+
+
+class TestStatementShape:
+    def test_whitespace_normalized(self):
+        assert statement_shape("SELECT *\n  FROM todos\tWHERE id = ?") == (
+            "SELECT * FROM todos WHERE id = ?"
+        )
+
+    def test_placeholder_lists_collapsed(self):
+        assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == (
+            statement_shape("SELECT * FROM t WHERE id IN (?, ?)")
+        )
+
+
+class TestRedact:
+    def test_positional(self):
+        assert redact((1, "secret@example.com")) == "(int, str)"
+
+    def test_named(self):
+        assert redact({"email": "secret@example.com"}) == "{email: str}"
+
+    def test_executemany(self):
+        assert redact([(1,), (2,)]) == "[2 rows]"
+
+
+@pytest.fixture
+def logged_app(app):
+    app.config["QUERY_LOG_SAMPLE_RATE"] = 1.0
+    return app
+
+
+class TestQueryLog:
+    def test_request_id_generated_and_echoed(self, client):
+        response = client.get("/api/v1/health")
+
+        assert len(response.headers["X-Request-ID"]) == 32
+
+    def test_incoming_request_id_honoured(self, client):
+        response = client.get("/api/v1/health", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["X-Request-ID"] == "abc-123"
+
+    def test_slow_query_logged_with_redacted_params(
+        self, logged_app, client, test_user, caplog
+    ):
+        logged_app.config["SLOW_QUERY_MS"] = 0
+
+        with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+            client.post(
+                "/api/v1/auth/login",
+                json={"email": test_user.email, "password": "wrong-password"},
+            )
+
+        slow = [
+            r.getMessage() for r in caplog.records if "Slow query" in r.getMessage()
+        ]
+        assert slow
+        assert "route=/api/v1/auth/login" in slow[0]
+        assert test_user.email not in slow[0]
+
+    def test_repeated_statement_shape_flagged(
+        self, logged_app, session, test_user, caplog
+    ):
+        from sqlmodel import Session
+
+        from app.core.database import engine
+        from app.services.todo_service import get_todo
+
+        @logged_app.route("/_n_plus_one")
+        def n_plus_one():
+            with Session(engine) as s:
+                for todo_id in range(3):
+                    get_todo(s, todo_id, test_user.id)
+            return ""
+
+        with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+            logged_app.test_client().get("/_n_plus_one")
+
+        suspects = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+        assert len(suspects) == 1
+        assert suspects[0].startswith("N+1 suspect: 3 x SELECT")
+
+    def test_unsampled_requests_record_nothing(self, app, client, test_user, caplog):
+        app.config["QUERY_LOG_SAMPLE_RATE"] = 0.0
+        app.config["SLOW_QUERY_MS"] = 0
+
+        with caplog.at_level(logging.WARNING, logger="app.core.query_log"):
+            client.post(
+                "/api/v1/auth/login",
+                json={"email": test_user.email, "password": "wrong-password"},
+            )
+
+        assert not caplog.records
@@ -0,0 +1,55 @@
+from app.core.query_plan import (
+    BASELINE_PATH,
+    inspect_query_plans,
+    load_baseline,
+    new_findings,
+)
+
+
+class TestNewFindings:
+    def test_accepted_findings_ignored(self):
+        findings = {"q": ["USE TEMP B-TREE FOR ORDER BY"], "r": []}
+
+        assert new_findings(findings, {"q": ["USE TEMP B-TREE FOR ORDER BY"]}) == {}
+
+    def test_unlisted_findings_reported(self):
+        findings = {"q": ["SCAN todos", "USE TEMP B-TREE FOR ORDER BY"]}
+
+        assert new_findings(findings, {"q": ["USE TEMP B-TREE FOR ORDER BY"]}) == {
+            "q": ["SCAN todos"]
+        }
+
+
+class TestQueryPlans:
+    def test_every_service_query_explained(self, app):
+        from app.core.database import engine
+
+        findings = inspect_query_plans(engine)
+
+        # 6 sort fields x 2 orders x 3 filters, each a count and a page query
+        assert sum(name.startswith("list_todos sort_by") for name in findings) == 72
+        assert {"get_todo", "get_user_by_email", "get_user_by_username"} <= set(
+            findings
+        )
+
+    def test_no_regressions_against_baseline(self, app):
+        from app.core.database import engine
+
+        findings = inspect_query_plans(engine)
+
+        assert new_findings(findings, load_baseline(BASELINE_PATH, "sqlite")) == {}
+
+    def test_dropped_index_flagged(self, app):
+        from app.core.database import engine
+
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_todos_user_id")
+            # Its user_id prefix would otherwise serve the same lookups
+            conn.exec_driver_sql("DROP INDEX ix_todos_user_id_change_seq")
+
+        findings = inspect_query_plans(engine)
+
+        count_query = "list_todos sort_by=title order=asc completed=None [1]"
+        assert findings[count_query] == ["SCAN todos"]
+        regressions = new_findings(findings, load_baseline(BASELINE_PATH, "sqlite"))
+        assert any(name.startswith("list_todos") for name in regressions)
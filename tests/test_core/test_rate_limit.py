@@ -0,0 +1,127 @@
+import pytest
+
+from app.core.rate_limit import Limit, MemoryStore, RateLimiter, SQLiteStore
+
+
+class TestLimit:
+    def test_parse(self):
+        limit = Limit.parse("120/minute")
+
+        assert limit.capacity == 120
+        assert limit.rate == 2
+
+    @pytest.mark.parametrize("value", ["abc", "10/fortnight", "0/second", "-1/second"])
+    def test_parse_invalid(self, value):
+        with pytest.raises(ValueError):
+            Limit.parse(value)
+
+    def test_parse_overrides(self):
+        overrides = RateLimiter._parse_overrides("auth.login=20/minute, todos=off")
+
+        assert overrides["auth.login"] == Limit.parse("20/minute")
+        assert overrides["todos"] is None
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "buckets.db"))
+
+
+class TestStores:
+    def test_allows_up_to_capacity(self, store):
+        limit = Limit.parse("3/second")
+
+        results = [store.consume("k", limit, now=100.0)[0] for _ in range(4)]
+
+        assert results == [True, True, True, False]
+
+    def test_retry_after_reflects_refill_rate(self, store):
+        limit = Limit.parse("1/minute")
+        store.consume("k", limit, now=100.0)
+
+        allowed, retry_after = store.consume("k", limit, now=130.0)
+
+        assert allowed is False
+        assert retry_after == pytest.approx(30.0)
+
+    def test_refills_over_time(self, store):
+        limit = Limit.parse("1/second")
+        store.consume("k", limit, now=100.0)
+
+        assert store.consume("k", limit, now=100.5)[0] is False
+        assert store.consume("k", limit, now=101.6)[0] is True
+
+    def test_keys_are_independent(self, store):
+        limit = Limit.parse("1/minute")
+
+        assert store.consume("a", limit, now=100.0)[0] is True
+        assert store.consume("b", limit, now=100.0)[0] is True
+
+
+class TestSQLiteStoreSharing:
+    def test_buckets_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "buckets.db")
+        worker_a, worker_b = SQLiteStore(path), SQLiteStore(path)
+        limit = Limit.parse("2/minute")
+
+        assert worker_a.consume("k", limit, now=100.0)[0] is True
+        assert worker_b.consume("k", limit, now=100.0)[0] is True
+        assert worker_a.consume("k", limit, now=100.0)[0] is False
+
+
+class TestRateLimitedRoutes:
+    def test_login_returns_429_with_retry_after(self, client):
+        payload = {"email": "nobody@example.com", "password": "password123"}
+        for _ in range(10):
+            assert client.post("/api/v1/auth/login", json=payload).status_code == 401
+
+        response = client.post("/api/v1/auth/login", json=payload)
+
+        assert response.status_code == 429
+        assert response.get_json()["error"] == "rate_limited"
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_blueprint_limit_is_per_user(
+        self, app, client, auth_headers, second_user_auth_headers
+    ):
+        limiter = app.extensions["rate_limiter"]
+        limiter.overrides["todos"] = Limit.parse("2/minute")
+
+        for _ in range(2):
+            assert client.get("/api/v1/todos", headers=auth_headers).status_code == 200
+        assert client.get("/api/v1/todos", headers=auth_headers).status_code == 429
+
+        response = client.get("/api/v1/todos", headers=second_user_auth_headers)
+        assert response.status_code == 200
+
+    def test_preflight_not_charged(self, app, client, auth_headers):
+        limiter = app.extensions["rate_limiter"]
+        limiter.overrides["todos"] = Limit.parse("1/minute")
+        preflight = {
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "Authorization",
+        }
+
+        for _ in range(3):
+            assert client.options("/api/v1/todos", headers=preflight).status_code == 200
+
+        assert limiter.checks == 0
+        assert client.get("/api/v1/todos", headers=auth_headers).status_code == 200
+
+    def test_scope_disabled_by_override(self, app, client, auth_headers):
+        limiter = app.extensions["rate_limiter"]
+        limiter.overrides["todos"] = None
+
+        client.get("/api/v1/todos", headers=auth_headers)
+
+        assert limiter.checks == 0
+
+    def test_overhead_is_recorded(self, app, client, auth_headers):
+        client.get("/api/v1/todos", headers=auth_headers)
+
+        limiter = app.extensions["rate_limiter"]
+        assert limiter.checks == 1
+        assert limiter.overhead_us > 0
@@ -0,0 +1,69 @@
+from sqlalchemy import create_engine, text
+
+from app.core.readiness import DatabaseProber
+
+
+def _prober(url: str, **engine_kwargs) -> DatabaseProber:
+    return DatabaseProber(create_engine(url, **engine_kwargs), interval=1, max_age=5)
+
+
+class TestDatabaseProber:
+    def test_not_ready_before_first_probe(self, tmp_path):
+        prober = _prober(f"sqlite:///{tmp_path / 'app.db'}")
+
+        ready, body = prober.report(0)
+
+        assert not ready
+        assert body["reason"] == "no database probe has completed yet"
+
+    def test_reports_revision_latency_and_pool(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        with create_engine(url).begin() as conn:
+            conn.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+            conn.execute(text("INSERT INTO alembic_version VALUES ('abc123')"))
+        prober = _prober(url)
+
+        result = prober.probe()
+        ready, body = prober.report(result.checked_at)
+
+        assert ready
+        assert body["status"] == "ready"
+        assert body["database"]["revision"] == "abc123"
+        assert body["database"]["latency_ms"] > 0
+        assert body["pool"]["checked_out"] == 0
+
+    def test_failed_probe(self, tmp_path):
+        prober = _prober(f"sqlite:///{tmp_path / 'missing' / 'app.db'}")
+
+        result = prober.probe()
+        ready, body = prober.report(result.checked_at)
+
+        assert not ready
+        assert body["reason"].startswith("database probe failed: unable to open")
+
+    def test_stale_probe(self, tmp_path):
+        prober = _prober(f"sqlite:///{tmp_path / 'app.db'}")
+
+        result = prober.probe()
+        ready, body = prober.report(result.checked_at + 6)
+
+        assert not ready
+        assert body["reason"] == "database probe is stale"
+
+    def test_exhausted_pool(self, tmp_path):
+        prober = _prober(
+            f"sqlite:///{tmp_path / 'app.db'}", pool_size=1, max_overflow=0
+        )
+        result = prober.probe()
+
+        with prober.engine.connect():
+            ready, body = prober.report(result.checked_at)
+
+        assert not ready
+        assert body["reason"] == "connection pool exhausted"
+        assert body["pool"] == {
+            "size": 1,
+            "checked_out": 1,
+            "overflow": 0,
+            "max_overflow": 0,
+        }
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from app.core.recorder import RequestRecorder
+
+
+@pytest.fixture
+def record_path(app, tmp_path):
+    path = tmp_path / "recorded.jsonl"
+    app.wsgi_app = RequestRecorder(app.wsgi_app, str(path))
+    return path
+
+
+def read_entries(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRequestRecorder:
+    def test_token_and_todo_id_templated(
+        self, client, record_path, auth_headers, test_todo
+    ):
+        client.get(f"/api/v1/todos/{test_todo.id}?x=1", headers=auth_headers)
+
+        assert read_entries(record_path) == [
+            {
+                "method": "GET",
+                "path": "/api/v1/todos/{{todo_id}}?x=1",
+                "headers": {"Authorization": "Bearer {{token}}"},
+            }
+        ]
+
+    def test_stream_query_token_templated(self, client, record_path, auth_headers):
+        token = auth_headers["Authorization"].removeprefix("Bearer ")
+
+        client.get(f"/api/v1/todos/stream?jwt={token}&x=1")
+
+        (entry,) = read_entries(record_path)
+        assert entry["path"] == "/api/v1/todos/stream?jwt={{token}}&x=1"
+        assert token not in json.dumps(entry)
+
+    def test_json_body_recorded_and_still_readable(
+        self, client, record_path, auth_headers
+    ):
+        response = client.post(
+            "/api/v1/todos", json={"title": "Recorded"}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert read_entries(record_path)[0]["json"] == {"title": "Recorded"}
+
+    def test_auth_requests_not_recorded(self, client, record_path, test_user):
+        client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "password123"},
+        )
+
+        assert not record_path.exists()
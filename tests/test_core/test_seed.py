@@ -0,0 +1,109 @@
+import random
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, func, select
+
+from app.core.seed import TextPool, seed, todo_rows, todos_per_user
+from app.models import Todo, User
+
+
+class TestTodosPerUser:
+    def test_sums_to_total(self):
+        assert sum(todos_per_user(100, 12345, 1.1)) == 12345
+
+    def test_skewed(self):
+        counts = todos_per_user(1000, 1_000_000, 1.1)
+
+        assert counts == sorted(counts, reverse=True)
+        assert counts[0] > 50_000
+        assert counts[-1] < 1000
+
+    def test_zero_skew_is_even(self):
+        assert set(todos_per_user(10, 100, 0)) == {10}
+
+
+class TestTodoRows:
+    def test_reproducible(self):
+        def rows(seed_value):
+            rng = random.Random(seed_value)
+            return list(todo_rows(rng, 1, 50, datetime(2025, 1, 1), TextPool(rng)))
+
+        assert rows(7) == rows(7)
+        assert rows(7) != rows(8)
+
+    def test_values_fit_the_schema(self):
+        rows = list(todo_rows(random.Random(0), 1, 2000, datetime(2025, 1, 1)))
+
+        assert all(1 <= len(row["title"]) <= 200 for row in rows)
+        assert all(len(row["description"] or "") <= 1000 for row in rows)
+        assert all(row["updated_at"] >= row["created_at"] for row in rows)
+        assert 0.3 < sum(row["completed"] for row in rows) / len(rows) < 0.9
+        assert any(row["due_date"] is None for row in rows)
+
+
+class TestSeed:
+    def test_inserts_users_and_todos(self, app, session):
+        from app.core.database import engine
+
+        result = seed(engine, users=20, todos=500, batch_size=128)
+
+        assert result.todos == 500
+        assert session.exec(select(func.count()).select_from(User)).one() == 20
+        assert session.exec(select(func.count()).select_from(Todo)).one() == 500
+        largest = session.exec(
+            select(func.count())
+            .select_from(Todo)
+            .group_by(Todo.user_id)
+            .order_by(func.count().desc())
+        ).first()
+        assert largest == result.max_todos_per_user
+        # Change feeds continue from the seeded sequence numbers
+        for user in session.exec(select(User)).all():
+            seqs = session.exec(
+                select(Todo.change_seq).where(Todo.user_id == user.id)
+            ).all()
+            assert sorted(seqs) == list(range(1, user.change_seq + 1))
+
+    def test_seeded_users_can_log_in_and_list(self, app, client):
+        from app.core.database import engine
+
+        seed(engine, users=3, todos=30, password="seeded-password")
+
+        login = client.post(
+            "/api/v1/auth/login",
+            json={"email": "seed0@example.com", "password": "seeded-password"},
+        )
+        token = login.get_json()["access_token"]
+        response = client.get(
+            "/api/v1/todos?sort_by=due_date",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["total"] > 0
+
+    def test_existing_prefix_rejected(self, app):
+        from app.core.database import engine
+
+        seed(engine, users=1, todos=1)
+
+        with pytest.raises(RuntimeError):
+            seed(engine, users=1, todos=1)
+
+    def test_sharded(self, app, shards):
+        from app.core.database import engine
+
+        seed(engine, users=20, todos=500, batch_size=128, router=shards)
+
+        todo_ids = []
+        for shard, shard_engine in enumerate(shards.engines):
+            with Session(shard_engine) as session:
+                for todo in session.exec(select(Todo)).all():
+                    # Each user's todos are on the shard the directory names
+                    assert shards.locate(todo.user_id).shard == shard
+                    assert session.get(User, todo.user_id) is not None
+                    todo_ids.append(todo.id)
+        assert len(todo_ids) == len(set(todo_ids)) == 500
+        # Ids handed out later do not collide with seeded ones
+        assert shards.claim_ids(1).start > max(todo_ids)
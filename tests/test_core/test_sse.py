@@ -0,0 +1,279 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.events import broker
+from app.core.sse import STREAM_PATH, EventStream, format_changes
+from app.models import User
+from app.schemas import TodoChangesResponse, TodoCreate, TodoDeleted, TodoResponse
+from app.services.async_todo_service import create_todo, delete_todo
+
+
+class Client:
+    """Drives an ASGI app like a server whose client disconnects on demand."""
+
+    def __init__(self):
+        self.messages = []
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    @property
+    def status(self) -> int:
+        return self.messages[0]["status"]
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(m.get("body", b"") for m in self.messages[1:])
+
+    async def wait_for(self, text: bytes, timeout: float = 2.0) -> None:
+        async def poll():
+            while text not in self.body:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(poll(), timeout)
+
+
+def scope(
+    token: str | None,
+    last_event_id: str | None = None,
+    method: str = "GET",
+    headers: list | None = None,
+) -> dict:
+    headers = list(headers or [])
+    if token is not None:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    if last_event_id is not None:
+        headers.append((b"last-event-id", last_event_id.encode()))
+    return {
+        "type": "http",
+        "method": method,
+        "path": STREAM_PATH,
+        "headers": headers,
+        "query_string": b"",
+    }
+
+
+@pytest.fixture
+def stream(app, async_engine):
+    app.config["SSE_HEARTBEAT_SECONDS"] = 0.1
+    return EventStream(app, broker)
+
+
+@pytest.fixture
+def user_id(app, async_engine):
+    async def create():
+        async with AsyncSession(async_engine) as session:
+            user = User(email="s@example.com", username="stream", password_hash="x")
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+            return user.id
+
+    return asyncio.run(create())
+
+
+@pytest.fixture
+def token(app, user_id):
+    with app.app_context():
+        return create_access_token(identity=str(user_id))
+
+
+class TestFormatChanges:
+    def test_deletions_first_and_cursor_on_last_event(self):
+        now = datetime(2025, 1, 1)
+        todo = TodoResponse(
+            id=2,
+            title="Kept",
+            description=None,
+            completed=False,
+            priority="low",
+            due_date=None,
+            created_at=now,
+            updated_at=now,
+            user_id=1,
+            version=1,
+        )
+        page = TodoChangesResponse(
+            changed=[todo],
+            deleted=[TodoDeleted(id=1, deleted_at=now)],
+            cursor="9",
+            has_more=False,
+        )
+
+        events = format_changes(page).decode().split("\n\n")
+
+        assert events[0] == 'event: deleted\ndata: {"id": 1}'
+        assert events[1].startswith('id: 9\nevent: updated\ndata: {"id": 2,')
+
+
+class TestEventStream:
+    def test_pushes_live_events(self, stream, async_engine, user_id, token):
+        async def scenario():
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token), client.receive, client.send)
+            )
+            await client.wait_for(b"id: 0\n\n")
+            async with AsyncSession(async_engine) as session:
+                todo = await create_todo(session, user_id, TodoCreate(title="Live"))
+                await delete_todo(session, todo.id, user_id)
+            await client.wait_for(b"event: deleted")
+            client.gone.set()
+            await task
+            return client
+
+        client = asyncio.run(scenario())
+
+        assert client.status == 200
+        assert b"id: 1\nevent: created\ndata: " in client.body
+        assert b'id: 2\nevent: deleted\ndata: {"id": 1}' in client.body
+
+    def test_resumes_from_last_event_id(self, stream, async_engine, user_id, token):
+        async def scenario():
+            async with AsyncSession(async_engine) as session:
+                first = (await create_todo(session, user_id, TodoCreate(title="A"))).id
+                await create_todo(session, user_id, TodoCreate(title="B"))
+                await delete_todo(session, first, user_id)
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token, "1"), client.receive, client.send)
+            )
+            await client.wait_for(b"id: 3\n")
+            client.gone.set()
+            await task
+            return client.body.decode()
+
+        body = asyncio.run(scenario())
+
+        assert body.startswith("retry: 3000\nid: 1\n\n")
+        assert body.index("event: deleted") < body.index("event: updated")
+        assert '"title": "A"' not in body
+
+    def test_gap_reloaded_from_change_feed(
+        self, stream, async_engine, user_id, token, monkeypatch
+    ):
+        async def scenario():
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token), client.receive, client.send)
+            )
+            await client.wait_for(b"id: 0\n\n")
+            async with AsyncSession(async_engine) as session:
+                # The first event is lost, as a dropped datagram would be
+                with monkeypatch.context() as patch:
+                    patch.setattr(
+                        "app.services.async_todo_service.publish_change",
+                        lambda *args: None,
+                    )
+                    await create_todo(session, user_id, TodoCreate(title="Lost"))
+                await create_todo(session, user_id, TodoCreate(title="Seen"))
+            await client.wait_for(b"id: 2\n")
+            client.gone.set()
+            await task
+            return client.body.decode()
+
+        body = asyncio.run(scenario())
+
+        assert '"title": "Lost"' in body and '"title": "Seen"' in body
+
+    def test_heartbeat(self, stream, token):
+        async def scenario():
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token), client.receive, client.send)
+            )
+            await client.wait_for(b": keepalive\n\n")
+            client.gone.set()
+            await task
+
+        asyncio.run(scenario())
+
+    def test_unsubscribes_on_disconnect(self, stream, user_id, token):
+        async def scenario():
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token), client.receive, client.send)
+            )
+            await client.wait_for(b"id: 0\n\n")
+            listening = broker.has_listeners(user_id)
+            client.gone.set()
+            await task
+            return listening, broker.has_listeners(user_id)
+
+        assert asyncio.run(scenario()) == (True, False)
+
+    @pytest.mark.parametrize("token", [None, "not-a-jwt"])
+    def test_rejects_missing_or_invalid_token(self, stream, token):
+        client = Client()
+
+        asyncio.run(stream(scope(token), client.receive, client.send))
+
+        assert client.status == 401
+
+
+class TestCors:
+    ORIGIN = (b"origin", b"https://app.example.com")
+
+    def test_allowed_origin_echoed(self, stream, token):
+        async def scenario():
+            client = Client()
+            task = asyncio.ensure_future(
+                stream(scope(token, headers=[self.ORIGIN]), client.receive, client.send)
+            )
+            await client.wait_for(b"id: 0\n\n")
+            client.gone.set()
+            await task
+            return dict(client.messages[0]["headers"])
+
+        headers = asyncio.run(scenario())
+
+        assert headers[b"access-control-allow-origin"] == b"https://app.example.com"
+        assert headers[b"vary"] == b"Origin"
+
+    def test_preflight(self, stream):
+        client = Client()
+        request = scope(
+            None,
+            method="OPTIONS",
+            headers=[
+                self.ORIGIN,
+                (b"access-control-request-method", b"GET"),
+                (b"access-control-request-headers", b"authorization, last-event-id"),
+            ],
+        )
+
+        asyncio.run(stream(request, client.receive, client.send))
+
+        headers = dict(client.messages[0]["headers"])
+        assert client.status == 200
+        assert headers[b"access-control-allow-origin"] == b"https://app.example.com"
+        assert b"GET" in headers[b"access-control-allow-methods"]
+        assert headers[b"access-control-allow-headers"] == (
+            b"authorization, last-event-id"
+        )
+
+    @pytest.mark.parametrize(
+        "origin", [b"https://evil.example.com", b"https://app.example"]
+    )
+    def test_other_origins_not_allowed(self, app, monkeypatch, origin):
+        monkeypatch.setattr(
+            "app.core.config.Config.CORS_ORIGINS", "https://app.example.com"
+        )
+        stream = EventStream(app, broker)
+        client = Client()
+        request = scope(None, headers=[(b"origin", origin)])
+
+        asyncio.run(stream(request, client.receive, client.send))
+
+        headers = dict(client.messages[0]["headers"])
+        assert client.status == 401
+        assert b"access-control-allow-origin" not in headers
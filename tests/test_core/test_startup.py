@@ -0,0 +1,101 @@
+import gzip
+
+from sqlalchemy import create_engine, text
+
+from app.core.startup import LazyMount, warmup
+from migrate import ALEMBIC_INI, pending_migrations
+
+
+class TestOpenAPI:
+    def test_served_gzipped_with_etag(self, client):
+        response = client.get("/openapi.yaml", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert gzip.decompress(response.data).startswith(b"openapi:")
+
+    def test_identity_has_its_own_etag(self, client):
+        plain = client.get("/openapi.yaml")
+        gzipped = client.get("/openapi.yaml", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in plain.headers
+        assert plain.data.startswith(b"openapi:")
+        assert plain.headers["ETag"] != gzipped.headers["ETag"]
+
+    def test_not_modified(self, client):
+        etag = client.get("/openapi.yaml").headers["ETag"]
+
+        response = client.get("/openapi.yaml", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+
+class TestLazyMount:
+    def test_built_on_first_matching_request(self):
+        built = []
+
+        def inner(environ, start_response):
+            start_response("200 OK", [])
+            return [b"main"]
+
+        def factory():
+            built.append(True)
+
+            def docs(environ, start_response):
+                start_response("200 OK", [])
+                return [b"docs"]
+
+            return docs
+
+        mount = LazyMount(inner, "/docs", factory)
+
+        def call(path):
+            return mount({"PATH_INFO": path}, lambda *args: None)
+
+        assert call("/docsearch") == [b"main"]
+        assert built == []
+        assert call("/docs/") == [b"docs"]
+        assert call("/docs") == [b"docs"]
+        assert built == [True]
+
+    def test_docs_served_in_fast_startup_mode(self, monkeypatch):
+        from app import create_app
+        from app.core.config import Config
+
+        monkeypatch.setattr(Config, "FAST_STARTUP", True)
+        client = create_app().test_client()
+
+        response = client.get("/docs/")
+
+        assert response.status_code == 200
+        assert b"swagger" in response.data.lower()
+
+
+class TestPendingMigrations:
+    def test_compares_revision_with_head(self, tmp_path):
+        from alembic.config import Config as AlembicConfig
+        from alembic.script import ScriptDirectory
+
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        assert pending_migrations(url)
+
+        (head,) = ScriptDirectory.from_config(AlembicConfig(ALEMBIC_INI)).get_heads()
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+            conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": head})
+        engine.dispose()
+
+        assert not pending_migrations(url)
+
+
+class TestWarmup:
+    def test_leaves_no_data_behind(self, app, client, auth_headers):
+        from app.core.database import engine
+
+        assert warmup(app, engine) > 0
+
+        response = client.get("/api/v1/todos", headers=auth_headers)
+        assert response.get_json()["total"] == 0
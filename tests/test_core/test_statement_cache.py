@@ -0,0 +1,64 @@
+from prometheus_client import REGISTRY
+
+from app.core.statement_cache import StatementCache
+from app.services.todo_service import LIST_STATEMENTS, list_statements
+
+
+def _sample(cache, result):
+    labels = {"cache": cache, "result": result}
+    return REGISTRY.get_sample_value("statement_cache_total", labels) or 0
+
+
+class TestStatementCache:
+    def test_builds_each_variant_once(self):
+        built = []
+        cache = StatementCache("test", lambda *key: built.append(key) or object())
+
+        first = cache.get("title", "asc")
+        assert cache.get("title", "asc") is first
+        cache.get("title", "desc")
+
+        assert built == [("title", "asc"), ("title", "desc")]
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+    def test_counts_exported(self):
+        cache = StatementCache("exported", lambda *key: object())
+        hits = _sample("exported", "hit")
+
+        cache.get("a")
+        cache.get("a")
+        cache.get("a")
+
+        assert _sample("exported", "hit") == hits + 2
+        assert _sample("exported", "miss") == 1
+
+    def test_clear(self):
+        cache = StatementCache("cleared", lambda *key: object())
+        cache.get("a")
+
+        cache.clear()
+
+        assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+class TestListStatements:
+    def test_requests_share_a_variant(self):
+        count, page, params = list_statements(1, 1, 10, True, "title", "asc")
+
+        again = list_statements(2, 3, 20, False, "title", "asc")
+
+        assert again[:2] == (count, page)
+        assert params == {"user_id": 1, "offset": 0, "limit": 10, "completed": True}
+        assert again[2] == {"user_id": 2, "offset": 40, "limit": 20, "completed": False}
+
+    def test_variant_per_shape(self):
+        base = list_statements(1, 1, 10, None, "title", "asc")[1]
+
+        assert list_statements(1, 1, 10, True, "title", "asc")[1] is not base
+        assert list_statements(1, 1, 10, None, "title", "desc")[1] is not base
+        assert list_statements(1, 1, 10, None, "title", "asc", True)[1] is not base
+        # Unknown values fall back to the default variant
+        assert list_statements(1, 1, 10, None, "bogus", "up")[1] is (
+            list_statements(1, 1, 10, None, "created_at", "desc")[1]
+        )
+        assert len(LIST_STATEMENTS) <= 48
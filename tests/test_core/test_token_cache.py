@@ -0,0 +1,92 @@
+import time
+
+from app.core.token_cache import TokenCache
+
+
+class TestTokenCache:
+    def test_get_miss_then_hit(self):
+        cache = TokenCache(maxsize=4)
+        claims = {"sub": "1", "exp": time.time() + 60}
+
+        assert cache.get("token") is None
+        cache.put("token", claims)
+
+        assert cache.get("token") == claims
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_expired_entry_is_evicted(self):
+        cache = TokenCache(maxsize=4)
+        cache.put("token", {"sub": "1", "exp": time.time() - 1})
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_bounded_lru_eviction(self):
+        cache = TokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put("a", {"sub": "a", "exp": exp})
+        cache.put("b", {"sub": "b", "exp": exp})
+        cache.get("a")
+        cache.put("c", {"sub": "c", "exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = TokenCache(maxsize=4)
+        cache.put("token", {"sub": "1"})
+
+        assert len(cache) == 0
+
+    def test_returned_claims_are_copies(self):
+        cache = TokenCache(maxsize=4)
+        cache.put("token", {"sub": "1", "exp": time.time() + 60})
+
+        cache.get("token")["sub"] = "2"
+
+        assert cache.get("token")["sub"] == "1"
+
+
+class TestCachingJWTManager:
+    def test_repeated_requests_hit_cache(self, app, client, auth_headers):
+        from app import jwt
+
+        client.get("/api/v1/auth/me", headers=auth_headers)
+        client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert jwt.token_cache.misses == 1
+        assert jwt.token_cache.hits == 1
+
+    def test_revocation_check_runs_on_cached_token(self, app, client, auth_headers):
+        from app import jwt
+
+        revoked = set()
+        original = jwt._token_in_blocklist_callback
+        jwt.token_in_blocklist_loader(lambda header, data: data["jti"] in revoked)
+        try:
+            response = client.get("/api/v1/auth/me", headers=auth_headers)
+            assert response.status_code == 200
+
+            with app.app_context():
+                from flask_jwt_extended import decode_token
+
+                token = auth_headers["Authorization"].split()[1]
+                revoked.add(decode_token(token)["jti"])
+
+            response = client.get("/api/v1/auth/me", headers=auth_headers)
+            assert response.status_code == 401
+            assert response.get_json()["message"] == "Token has been revoked"
+        finally:
+            jwt._token_in_blocklist_callback = original
+
+    def test_cache_disabled_with_zero_size(self, app, client, auth_headers):
+        from app import jwt
+
+        jwt.token_cache.maxsize = 0
+        client.get("/api/v1/auth/me", headers=auth_headers)
+        client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert len(jwt.token_cache) == 0
+        assert jwt.token_cache.hits == 0
@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+from app.core.tracing import NOOP_SPAN, parse_traceparent, span, summarize
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class TestParseTraceparent:
+    def test_valid(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (
+            TRACE_ID,
+            PARENT_ID,
+            True,
+        )
+
+    def test_not_sampled(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            None,
+            "garbage",
+            f"00-{'0' * 32}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{'0' * 16}-01",
+            f"ff-{TRACE_ID}-{PARENT_ID}-01",
+            f"00-{TRACE_ID.upper()}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+        ],
+    )
+    def test_invalid(self, value):
+        assert parse_traceparent(value) is None
+
+    def test_future_version_may_extend(self):
+        assert parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-01-extra") is not None
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    return tmp_path / "traces.ndjson"
+
+
+@pytest.fixture
+def traced_app(app, trace_path):
+    from app.core.database import router
+    from app.core.tracing import init_tracing
+
+    app.config["TRACING_ENABLED"] = True
+    app.config["TRACE_EXPORT_PATH"] = str(trace_path)
+    init_tracing(app, router)
+    return app
+
+
+def read_spans(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestTracing:
+    def test_span_outside_trace_is_noop(self, app):
+        with app.test_request_context():
+            assert span("anything") is NOOP_SPAN
+
+    def test_request_stages_recorded(self, traced_app, trace_path, auth_headers):
+        client = traced_app.test_client()
+
+        response = client.post(
+            "/api/v1/todos", json={"title": "Traced"}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        spans = read_spans(trace_path)
+        names = {s["name"] for s in spans}
+        assert {
+            "POST /api/v1/todos",
+            "jwt.decode",
+            "validate",
+            "service.create_todo",
+            "db.query",
+            "serialize",
+        } <= names
+
+        root = next(s for s in spans if s["name"] == "POST /api/v1/todos")
+        assert root["parentSpanId"] is None
+        assert root["attributes"]["http.status_code"] == 201
+        assert {s["traceId"] for s in spans} == {root["traceId"]}
+
+        service = next(s for s in spans if s["name"] == "service.create_todo")
+        queries = [s for s in spans if s["name"] == "db.query"]
+        assert any(q["parentSpanId"] == service["spanId"] for q in queries)
+        assert any(
+            q["attributes"]["db.statement"].startswith("INSERT INTO todo")
+            for q in queries
+        )
+
+    def test_incoming_traceparent_continued(self, traced_app, trace_path):
+        client = traced_app.test_client()
+
+        response = client.get(
+            "/api/v1/health",
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+
+        root = read_spans(trace_path)[-1]
+        assert root["traceId"] == TRACE_ID
+        assert root["parentSpanId"] == PARENT_ID
+        assert response.headers["traceresponse"] == (
+            f"00-{TRACE_ID}-{root['spanId']}-01"
+        )
+
+    def test_unsampled_parent_not_traced(self, traced_app, trace_path):
+        client = traced_app.test_client()
+
+        response = client.get(
+            "/api/v1/health",
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"},
+        )
+
+        assert "traceresponse" not in response.headers
+        assert not trace_path.exists()
+
+    def test_summary_groups_by_route_and_stage(
+        self, traced_app, trace_path, auth_headers
+    ):
+        client = traced_app.test_client()
+        for _ in range(3):
+            client.get("/api/v1/todos", headers=auth_headers)
+
+        stages = summarize(trace_path.read_text().splitlines())
+
+        route = stages["GET /api/v1/todos"]
+        assert len(route["request"]) == 3
+        assert len(route["service.list_todos"]) == 3
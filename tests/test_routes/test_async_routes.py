@@ -0,0 +1,104 @@
+import pytest
+
+from app.api.v1.async_routes import ASYNC_VIEWS, use_async_views
+
+
+@pytest.fixture
+def async_client(app, async_engine):
+    use_async_views(app)
+    return app.test_client()
+
+
+def login(client) -> dict:
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "async@example.com",
+            "username": "asyncuser",
+            "password": "password123",
+        },
+    )
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "async@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+class TestAsyncViews:
+    def test_swaps_view_functions(self, app):
+        use_async_views(app)
+
+        for endpoint, view in ASYNC_VIEWS.items():
+            assert app.view_functions[endpoint] is view
+
+    def test_missing_endpoint(self, app):
+        del app.view_functions["v1.auth.me"]
+
+        with pytest.raises(RuntimeError, match="v1.auth.me"):
+            use_async_views(app)
+
+    def test_todo_lifecycle(self, async_client):
+        headers = login(async_client)
+
+        created = async_client.post(
+            "/api/v1/todos", json={"title": "Async todo"}, headers=headers
+        )
+        assert created.status_code == 201
+        todo_id = created.get_json()["id"]
+
+        toggled = async_client.post(f"/api/v1/todos/{todo_id}/toggle", headers=headers)
+        assert toggled.get_json()["completed"] is True
+
+        listing = async_client.get("/api/v1/todos?completed=true", headers=headers)
+        assert listing.get_json()["total"] == 1
+
+        stats = async_client.get("/api/v1/todos/stats", headers=headers)
+        assert stats.get_json()["completed"] == 1
+        cached = async_client.get(
+            "/api/v1/todos/stats",
+            headers={**headers, "If-None-Match": stats.headers["ETag"]},
+        )
+        assert cached.status_code == 304
+
+        assert (
+            async_client.delete(f"/api/v1/todos/{todo_id}", headers=headers).status_code
+            == 200
+        )
+        assert (
+            async_client.get(f"/api/v1/todos/{todo_id}", headers=headers).status_code
+            == 404
+        )
+
+        changes = async_client.get("/api/v1/todos/changes", headers=headers)
+        assert changes.get_json()["deleted"][0]["id"] == todo_id
+        assert changes.get_json()["cursor"] == "3"
+
+    def test_validation_and_auth_errors(self, async_client):
+        headers = login(async_client)
+
+        assert (
+            async_client.post("/api/v1/todos", json={}, headers=headers).status_code
+            == 400
+        )
+        assert async_client.get("/api/v1/todos").status_code == 401
+        me = async_client.get("/api/v1/auth/me", headers=headers)
+        assert me.get_json()["username"] == "asyncuser"
+
+    def test_if_match(self, async_client):
+        headers = login(async_client)
+        created = async_client.post(
+            "/api/v1/todos", json={"title": "Async todo"}, headers=headers
+        )
+        url = f"/api/v1/todos/{created.get_json()['id']}"
+        assert created.headers["ETag"] == '"1"'
+
+        updated = async_client.put(
+            url, json={"title": "Mine"}, headers={**headers, "If-Match": '"1"'}
+        )
+        assert updated.headers["ETag"] == '"2"'
+
+        stale = async_client.delete(url, headers={**headers, "If-Match": '"1"'})
+        assert stale.status_code == 412
+        assert stale.headers["ETag"] == '"2"'
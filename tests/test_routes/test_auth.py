@@ -1,3 +1,7 @@
+import pytest
+
+
+@pytest.mark.sql_budget(4)
 class TestRegister:
     def test_register_success(self, client):
         response = client.post(
@@ -90,6 +94,7 @@ class TestRegister:
         assert data["error"] == "validation_error"
 
 
+@pytest.mark.sql_budget(1)
 class TestLogin:
     def test_login_success(self, client, test_user, test_user_password):
         response = client.post(
@@ -145,6 +150,7 @@ class TestLogin:
         assert data["error"] == "validation_error"
 
 
+@pytest.mark.sql_budget(0)
 class TestRefresh:
     def test_refresh_success(self, client, refresh_headers):
         response = client.post(
@@ -180,6 +186,7 @@ class TestRefresh:
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(1)
 class TestMe:
     def test_me_success(self, client, auth_headers, test_user):
         response = client.get(
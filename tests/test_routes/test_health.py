@@ -12,3 +12,27 @@ class TestHealthEndpoint:
         assert data["status"] == "healthy"
         assert "service" in data
         assert data["service"] == "flask-todo-api"
+
+
+class TestReadyEndpoint:
+    def test_ready_after_probe(self, app, client):
+        prober = app.extensions["readiness"]
+        prober.probe()
+
+        response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-store"
+        data = response.get_json()
+        assert data["status"] == "ready"
+        assert data["database"]["error"] is None
+        prober.stop()
+
+    def test_ready_does_no_io(self, app, client, sql_statements):
+        app.extensions["readiness"].probe()
+        app.extensions["readiness"].stop()
+
+        for _ in range(3):
+            client.get("/ready")
+
+        assert all(r.statements == [] for r in sql_statements.requests)
@@ -1,6 +1,10 @@
+import pytest
+from sqlmodel import update
+
 from app.models import Todo
 
 
+@pytest.mark.sql_budget(2)
 class TestListTodos:
     def test_list_todos_empty(self, client, auth_headers):
         response = client.get("/api/v1/todos", headers=auth_headers)
@@ -134,12 +138,46 @@ class TestListTodos:
 
         assert response.status_code == 200
 
+    def test_list_todos_statements(
+        self, client, auth_headers, session, test_user, sql_statements
+    ):
+        for i in range(15):
+            session.add(Todo(title=f"Todo {i}", user_id=test_user.id))
+        session.commit()
+
+        client.get("/api/v1/todos?per_page=5", headers=auth_headers)
+
+        # A count and one page query, however many rows come back
+        count, page = sql_statements.last.shapes
+        assert count.startswith("SELECT count(*)")
+        assert page.startswith("SELECT todos.id") and page.endswith("LIMIT ? OFFSET ?")
+
+    def test_list_todos_include_archived(
+        self, client, auth_headers, session, test_user
+    ):
+        from app.models import ArchivedTodo
+
+        session.add(ArchivedTodo(id=100, title="Archived", user_id=test_user.id))
+        session.add(Todo(title="Hot", user_id=test_user.id))
+        session.commit()
+
+        hot = client.get("/api/v1/todos", headers=auth_headers).get_json()
+        both = client.get(
+            "/api/v1/todos?include_archived=true&sort_by=title&order=asc",
+            headers=auth_headers,
+        ).get_json()
+
+        assert [todo["title"] for todo in hot["items"]] == ["Hot"]
+        assert [todo["title"] for todo in both["items"]] == ["Archived", "Hot"]
+        assert both["items"][0]["id"] == 100 and both["total"] == 2
+
     def test_list_todos_unauthorized(self, client):
         response = client.get("/api/v1/todos")
 
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(3)
 class TestCreateTodo:
     def test_create_todo_success(self, client, auth_headers):
         response = client.post(
@@ -217,6 +255,7 @@ class TestCreateTodo:
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(1)
 class TestGetTodo:
     def test_get_todo_success(self, client, auth_headers, test_todo):
         response = client.get(
@@ -253,6 +292,7 @@ class TestGetTodo:
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(4)
 class TestUpdateTodo:
     def test_update_todo_success(self, client, auth_headers, test_todo):
         response = client.put(
@@ -307,6 +347,7 @@ class TestUpdateTodo:
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(4)
 class TestDeleteTodo:
     def test_delete_todo_success(self, client, auth_headers, test_todo):
         response = client.delete(
@@ -348,6 +389,7 @@ class TestDeleteTodo:
         assert response.status_code == 401
 
 
+@pytest.mark.sql_budget(4)
 class TestToggleTodo:
     def test_toggle_todo_success(self, client, auth_headers, test_todo):
         assert test_todo.completed is False
@@ -398,3 +440,503 @@ class TestToggleTodo:
         response = client.post(f"/api/v1/todos/{test_todo.id}/toggle")
 
         assert response.status_code == 401
+
+
+@pytest.mark.sql_budget(4)
+class TestIfMatch:
+    def url(self, todo):
+        return f"/api/v1/todos/{todo.id}"
+
+    def test_etag_is_version(self, client, auth_headers, test_todo):
+        response = client.get(self.url(test_todo), headers=auth_headers)
+
+        assert response.headers["ETag"] == '"1"'
+        assert response.get_json()["version"] == 1
+
+    def test_update_with_current_version(self, client, auth_headers, test_todo):
+        response = client.put(
+            self.url(test_todo),
+            json={"title": "Mine"},
+            headers={**auth_headers, "If-Match": '"1"'},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"2"'
+        assert response.get_json()["version"] == 2
+
+    def test_update_with_stale_version(self, client, auth_headers, test_todo):
+        client.put(self.url(test_todo), json={"title": "Theirs"}, headers=auth_headers)
+
+        response = client.put(
+            self.url(test_todo),
+            json={"title": "Mine"},
+            headers={**auth_headers, "If-Match": '"1"'},
+        )
+
+        assert response.status_code == 412
+        assert response.get_json()["error"] == "version_conflict"
+        assert response.headers["ETag"] == '"2"'
+        current = client.get(self.url(test_todo), headers=auth_headers)
+        assert current.get_json()["title"] == "Theirs"
+
+    def test_toggle_and_delete_checked(self, client, auth_headers, test_todo):
+        stale = {**auth_headers, "If-Match": '"7"'}
+
+        assert (
+            client.post(f"{self.url(test_todo)}/toggle", headers=stale).status_code
+            == 412
+        )
+        assert client.delete(self.url(test_todo), headers=stale).status_code == 412
+        toggled = client.post(
+            f"{self.url(test_todo)}/toggle",
+            headers={**auth_headers, "If-Match": '"0", "1"'},
+        )
+        assert toggled.status_code == 200
+        deleted = client.delete(
+            self.url(test_todo), headers={**auth_headers, "If-Match": '"2"'}
+        )
+        assert deleted.status_code == 200
+
+    def test_weak_tag_never_matches(self, client, auth_headers, test_todo):
+        response = client.delete(
+            self.url(test_todo), headers={**auth_headers, "If-Match": 'W/"1"'}
+        )
+
+        assert response.status_code == 412
+
+    @pytest.mark.parametrize("if_match,status", [(None, 409), ("*", 409), ('"1"', 412)])
+    def test_write_loses_race(
+        self, client, auth_headers, test_todo, monkeypatch, if_match, status
+    ):
+        from sqlalchemy.orm import object_session
+
+        from app.services import todo_service
+
+        def concurrent_write(todo, data):
+            # Another request's write lands between our read and our UPDATE
+            object_session(todo).exec(
+                update(Todo)
+                .values(version=Todo.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            todo.title = data.title
+
+        monkeypatch.setattr(todo_service, "apply_update", concurrent_write)
+        headers = dict(auth_headers)
+        if if_match is not None:
+            headers["If-Match"] = if_match
+
+        response = client.put(
+            self.url(test_todo), json={"title": "Lost"}, headers=headers
+        )
+
+        assert response.status_code == status
+        assert response.get_json()["error"] == "version_conflict"
+
+    def test_any_version(self, client, auth_headers, test_todo):
+        response = client.put(
+            self.url(test_todo),
+            json={"title": "Mine"},
+            headers={**auth_headers, "If-Match": "*"},
+        )
+
+        assert response.status_code == 200
+
+
+@pytest.mark.sql_budget(2)
+class TestTodoChanges:
+    def create(self, session, user, title):
+        from app.schemas import TodoCreate
+        from app.services.todo_service import create_todo
+
+        return create_todo(session, user.id, TodoCreate(title=title)).id
+
+    def changes(self, client, headers, query=""):
+        response = client.get(f"/api/v1/todos/changes{query}", headers=headers)
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_initial_sync(self, client, auth_headers, session, test_user):
+        ids = [self.create(session, test_user, f"Todo {i}") for i in range(3)]
+
+        data = self.changes(client, auth_headers)
+
+        assert [todo["id"] for todo in data["changed"]] == ids
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+
+    def test_only_changes_after_cursor(self, client, auth_headers, session, test_user):
+        from app.schemas import TodoUpdate
+        from app.services.todo_service import delete_todo, update_todo
+
+        kept, updated, deleted = (
+            self.create(session, test_user, title) for title in ("a", "b", "c")
+        )
+        cursor = self.changes(client, auth_headers)["cursor"]
+
+        update_todo(session, updated, test_user.id, TodoUpdate(title="B"))
+        delete_todo(session, deleted, test_user.id)
+        data = self.changes(client, auth_headers, f"?since={cursor}")
+
+        assert [todo["title"] for todo in data["changed"]] == ["B"]
+        assert [todo["id"] for todo in data["deleted"]] == [deleted]
+        assert kept not in {todo["id"] for todo in data["changed"]}
+        assert self.changes(client, auth_headers, f"?since={data['cursor']}") == {
+            "changed": [],
+            "deleted": [],
+            "cursor": data["cursor"],
+            "has_more": False,
+        }
+
+    def test_paginates_in_change_order(self, client, auth_headers, session, test_user):
+        from app.services.todo_service import delete_todo
+
+        first, second, third = (
+            self.create(session, test_user, title) for title in ("a", "b", "c")
+        )
+        delete_todo(session, first, test_user.id)
+
+        page = self.changes(client, auth_headers, "?limit=2")
+        assert [todo["id"] for todo in page["changed"]] == [second, third]
+        assert page["has_more"] is True
+
+        page = self.changes(client, auth_headers, f"?limit=2&since={page['cursor']}")
+        assert page["changed"] == []
+        assert [todo["id"] for todo in page["deleted"]] == [first]
+        assert page["has_more"] is False
+
+    def test_other_users_changes_hidden(
+        self, client, auth_headers, session, second_user
+    ):
+        self.create(session, second_user, "Not yours")
+
+        data = self.changes(client, auth_headers)
+
+        assert data["changed"] == [] and data["cursor"] == "0"
+
+    def test_invalid_cursor(self, client, auth_headers):
+        response = client.get("/api/v1/todos/changes?since=abc", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "invalid_cursor"
+
+    def test_reads_only_changed_rows(
+        self, client, auth_headers, session, test_user, sql_statements
+    ):
+        self.create(session, test_user, "a")
+
+        self.changes(client, auth_headers, "?since=1")
+
+        todos, tombstones = sql_statements.last.shapes
+        assert "todos.change_seq > ?" in todos and todos.endswith("LIMIT ? OFFSET ?")
+        assert tombstones.startswith("SELECT todo_tombstones.id")
+
+    def test_changes_unauthorized(self, client):
+        assert client.get("/api/v1/todos/changes").status_code == 401
+
+
+@pytest.mark.sql_budget(2)
+class TestTodoStats:
+    def test_stats(self, client, auth_headers, test_todo):
+        response = client.get("/api/v1/todos/stats", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.get_json() == {
+            "total": 1,
+            "completed": 0,
+            "active": 1,
+            "by_priority": {"low": 0, "medium": 1, "high": 0},
+            "overdue": 0,
+            "due_today": 0,
+        }
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+    def test_matching_etag_skips_counting(self, client, auth_headers, sql_statements):
+        etag = client.get("/api/v1/todos/stats", headers=auth_headers).headers["ETag"]
+
+        response = client.get(
+            "/api/v1/todos/stats", headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert len(sql_statements.last.shapes) == 1
+
+    def test_write_changes_etag(self, client, auth_headers, session, test_user):
+        from app.schemas import TodoCreate
+        from app.services.todo_service import create_todo
+
+        etag = client.get("/api/v1/todos/stats", headers=auth_headers).headers["ETag"]
+        create_todo(session, test_user.id, TodoCreate(title="New"))
+
+        response = client.get(
+            "/api/v1/todos/stats", headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["total"] == 1
+
+    def test_etag_not_shared_between_users(
+        self, client, auth_headers, second_user_auth_headers
+    ):
+        # Both users have made no writes, so only the user id tells them apart
+        etag = client.get("/api/v1/todos/stats", headers=auth_headers).headers["ETag"]
+
+        response = client.get(
+            "/api/v1/todos/stats",
+            headers={**second_user_auth_headers, "If-None-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_stats_unauthorized(self, client):
+        assert client.get("/api/v1/todos/stats").status_code == 401
+
+
+@pytest.mark.sql_budget(3)
+class TestTodoStream:
+    def create(self, session, user, title):
+        from app.schemas import TodoCreate
+        from app.services.todo_service import create_todo
+
+        return create_todo(session, user.id, TodoCreate(title=title)).id
+
+    def test_new_client_starts_at_current_cursor(
+        self, client, auth_headers, session, test_user
+    ):
+        self.create(session, test_user, "Existing")
+
+        response = client.get("/api/v1/todos/stream", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert response.get_data(as_text=True) == "retry: 3000\nid: 1\n\n"
+
+    def test_replays_since_last_event_id(
+        self, client, auth_headers, session, test_user
+    ):
+        from app.services.todo_service import delete_todo
+
+        first = self.create(session, test_user, "a")
+        self.create(session, test_user, "b")
+        delete_todo(session, first, test_user.id)
+
+        response = client.get(
+            "/api/v1/todos/stream", headers={**auth_headers, "Last-Event-ID": "1"}
+        )
+
+        body = response.get_data(as_text=True)
+        assert body.startswith("retry: 3000\nid: 1\n\n")
+        assert f'event: deleted\ndata: {{"id": {first}}}' in body
+        assert body.endswith("\n\n") and "id: 3\nevent: updated" in body
+
+    def test_token_in_query_string(self, client, auth_headers):
+        token = auth_headers["Authorization"].removeprefix("Bearer ")
+
+        response = client.get(f"/api/v1/todos/stream?jwt={token}")
+
+        assert response.status_code == 200
+
+    def test_stream_unauthorized(self, client):
+        assert client.get("/api/v1/todos/stream").status_code == 401
+
+
+@pytest.mark.sql_budget(1)
+class TestTodoExports:
+    @pytest.fixture(autouse=True)
+    def export_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.core.config.Config.EXPORT_DIR", str(tmp_path))
+        return tmp_path
+
+    def export(self, client, headers) -> int:
+        from app.core.database import engine
+        from app.core.jobs import Worker
+
+        export_id = client.post("/api/v1/todos/exports", headers=headers).get_json()[
+            "id"
+        ]
+        Worker(engine).work_one()
+        return export_id
+
+    def download(self, client, headers, export_id, **extra):
+        return client.get(
+            f"/api/v1/todos/exports/{export_id}/download",
+            headers={**headers, **extra},
+        )
+
+    def test_create_export(self, client, auth_headers):
+        response = client.post("/api/v1/todos/exports", headers=auth_headers)
+
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data["status"] == "queued" and data["expires_at"] is None
+        assert response.headers["Location"] == f"/api/v1/todos/exports/{data['id']}"
+
+        status = client.get(response.headers["Location"], headers=auth_headers)
+        assert status.get_json()["status"] == "queued"
+
+    @pytest.mark.sql_budget(3)
+    def test_create_export_shed_before_writes(
+        self, app, client, auth_headers, monkeypatch
+    ):
+        # Half the limit in use: low priority is full, writes still fit
+        admission = app.extensions["admission"]
+        monkeypatch.setattr(admission, "in_flight", int(admission.limit / 2))
+
+        export = client.post("/api/v1/todos/exports", headers=auth_headers)
+        write = client.post("/api/v1/todos", headers=auth_headers, json={"title": "x"})
+
+        assert export.status_code == 503
+        assert write.status_code == 201
+
+    def test_export_done(self, client, auth_headers, test_todo):
+        export_id = self.export(client, auth_headers)
+
+        response = client.get(
+            f"/api/v1/todos/exports/{export_id}", headers=auth_headers
+        )
+
+        data = response.get_json()
+        assert data["status"] == "done" and data["todos"] == 1
+        assert data["size"] > 0 and data["expires_at"] is not None
+
+    def test_download(self, client, auth_headers, test_todo):
+        import gzip
+        import json
+
+        export_id = self.export(client, auth_headers)
+
+        response = self.download(client, auth_headers, export_id)
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/gzip"
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert "todos-" in response.headers["Content-Disposition"]
+        (line,) = gzip.decompress(response.data).splitlines()
+        assert json.loads(line)["title"] == test_todo.title
+
+    def test_range_resumes_download(self, client, auth_headers, test_todo):
+        export_id = self.export(client, auth_headers)
+        full = self.download(client, auth_headers, export_id)
+
+        response = self.download(
+            client,
+            auth_headers,
+            export_id,
+            Range="bytes=10-",
+            **{"If-Range": full.headers["ETag"]},
+        )
+
+        assert response.status_code == 206
+        assert response.data == full.data[10:]
+        assert response.headers["Content-Range"] == (
+            f"bytes 10-{len(full.data) - 1}/{len(full.data)}"
+        )
+
+    def test_stale_if_range_sends_whole_file(self, client, auth_headers, test_todo):
+        export_id = self.export(client, auth_headers)
+
+        response = self.download(
+            client, auth_headers, export_id, Range="bytes=10-", **{"If-Range": '"x"'}
+        )
+
+        assert response.status_code == 200
+        assert response.content_length == len(response.data) > 10
+
+    def test_unsatisfiable_range(self, client, auth_headers, test_todo):
+        export_id = self.export(client, auth_headers)
+
+        response = self.download(client, auth_headers, export_id, Range="bytes=100000-")
+
+        assert response.status_code == 416
+
+    def test_download_not_ready(self, client, auth_headers):
+        export_id = client.post(
+            "/api/v1/todos/exports", headers=auth_headers
+        ).get_json()["id"]
+
+        response = self.download(client, auth_headers, export_id)
+
+        assert response.status_code == 409
+        assert response.get_json()["error"] == "export_not_ready"
+
+    def test_download_expired(self, client, auth_headers, export_dir):
+        export_id = self.export(client, auth_headers)
+        for path in export_dir.iterdir():
+            path.unlink()
+
+        response = self.download(client, auth_headers, export_id)
+
+        assert response.status_code == 410
+
+    def test_other_users_export(self, client, auth_headers, second_user_auth_headers):
+        export_id = self.export(client, auth_headers)
+
+        for url in (
+            f"/api/v1/todos/exports/{export_id}",
+            f"/api/v1/todos/exports/{export_id}/download",
+        ):
+            response = client.get(url, headers=second_user_auth_headers)
+            assert response.status_code == 404
+
+
+class TestShardedTodos:
+    @pytest.fixture
+    def moved(self, shards, test_user, test_todo):
+        from app.services.shard_service import move_user
+
+        move_user(shards, test_user.id, 1, wait=lambda seconds: None)
+        return shards
+
+    def test_reads_from_users_shard(self, client, auth_headers, moved, test_todo):
+        response = client.get("/api/v1/todos", headers=auth_headers)
+
+        assert [item["title"] for item in response.get_json()["items"]] == [
+            test_todo.title
+        ]
+
+    def test_writes_to_users_shard(self, client, auth_headers, moved, session):
+        from sqlmodel import Session
+
+        response = client.post(
+            "/api/v1/todos", json={"title": "Sharded"}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        todo_id = response.get_json()["id"]
+        assert session.get(Todo, todo_id) is None
+        with Session(moved.engines[1]) as shard:
+            assert shard.get(Todo, todo_id).title == "Sharded"
+
+    def test_write_while_moving(self, client, auth_headers, shards, test_user, session):
+        from app.models import UserShard
+
+        session.add(UserShard(user_id=test_user.id, shard=0, moving=True))
+        session.commit()
+
+        response = client.post(
+            "/api/v1/todos", json={"title": "Later"}, headers=auth_headers
+        )
+
+        assert response.status_code == 503
+        assert response.get_json()["error"] == "moving"
+        assert response.headers["Retry-After"] == "5"
+        assert client.get("/api/v1/todos", headers=auth_headers).status_code == 200
+
+    def test_export_reads_users_shard(
+        self, client, auth_headers, moved, test_todo, tmp_path, monkeypatch
+    ):
+        from app.core.database import engine
+        from app.core.jobs import Worker
+
+        monkeypatch.setattr("app.core.config.Config.EXPORT_DIR", str(tmp_path))
+        export_id = client.post(
+            "/api/v1/todos/exports", headers=auth_headers
+        ).get_json()["id"]
+        Worker(engine).work_one()
+
+        response = client.get(
+            f"/api/v1/todos/exports/{export_id}", headers=auth_headers
+        )
+        assert response.get_json()["todos"] == 1
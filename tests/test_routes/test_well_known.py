@@ -0,0 +1,20 @@
+class TestJwks:
+    def test_jwks_empty_for_symmetric_signing(self, client):
+        response = client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 200
+        assert response.get_json() == {"keys": []}
+
+    def test_jwks_cache_headers(self, client):
+        response = client.get("/.well-known/jwks.json")
+
+        assert "max-age=3600" in response.headers["Cache-Control"]
+        assert "public" in response.headers["Cache-Control"]
+        assert response.headers["ETag"]
+
+    def test_jwks_conditional_request(self, client):
+        etag = client.get("/.well-known/jwks.json").headers["ETag"]
+
+        response = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import select
+
+from app.models import ArchivedTodo, Todo
+from app.services.archive_service import archive_batch, archive_completed
+from app.services.todo_service import list_todos, todo_stats
+
+NOW = datetime.now(timezone.utc)
+OLD = NOW - timedelta(days=100)
+
+
+def add(session, user, title, completed=True, updated_at=OLD):
+    todo = Todo(
+        title=title,
+        user_id=user.id,
+        completed=completed,
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+    session.add(todo)
+    session.commit()
+    return todo.id
+
+
+def titles(session, model):
+    return sorted(session.exec(select(model.title)).all())
+
+
+class TestArchiveCompleted:
+    def test_moves_only_old_completed_todos(self, app, session, test_user):
+        add(session, test_user, "old done")
+        add(session, test_user, "old open", completed=False)
+        add(session, test_user, "recent done", updated_at=NOW)
+        add(session, test_user, "newest", completed=False, updated_at=NOW)
+
+        moved = archive_completed(session, timedelta(days=90), batch_size=10)
+
+        assert moved == 1
+        assert titles(session, ArchivedTodo) == ["old done"]
+        assert titles(session, Todo) == ["newest", "old open", "recent done"]
+
+    def test_keeps_id_and_columns(self, app, session, test_user):
+        todo_id = add(session, test_user, "old done")
+        add(session, test_user, "newest", completed=False)
+
+        archive_completed(session, timedelta(days=90), batch_size=10)
+
+        archived = session.get(ArchivedTodo, todo_id)
+        assert (archived.title, archived.user_id) == ("old done", test_user.id)
+        assert archived.archived_at is not None
+
+    def test_archives_newest_todo(self, app, session, test_user):
+        add(session, test_user, "a")
+        add(session, test_user, "b")
+
+        archive_completed(session, timedelta(days=90), batch_size=10)
+
+        assert titles(session, Todo) == []
+        assert titles(session, ArchivedTodo) == ["a", "b"]
+
+    def test_ids_not_reused_after_archiving(self, app, session, test_user):
+        archived_ids = {add(session, test_user, "a"), add(session, test_user, "b")}
+        open_id = add(session, test_user, "c", completed=False)
+        archive_completed(session, timedelta(days=90), batch_size=10)
+        session.delete(session.get(Todo, open_id))
+        session.commit()
+
+        new_id = add(session, test_user, "new", completed=False)
+
+        assert new_id > open_id
+        assert new_id not in archived_ids
+        listed = list_todos(session, test_user.id, include_archived=True)
+        ids = [todo.id for todo in listed.items]
+        assert len(ids) == len(set(ids)) == 3
+
+    def test_batches(self, app, session, test_user):
+        for i in range(5):
+            add(session, test_user, f"old {i}")
+        add(session, test_user, "newest", completed=False)
+
+        assert archive_batch(session, NOW, batch_size=2) == 2
+        assert archive_completed(session, timedelta(days=90), batch_size=2) == 3
+        assert len(titles(session, ArchivedTodo)) == 5
+
+
+class TestArchivedReads:
+    def test_list_includes_archived_on_request(
+        self, app, session, test_user, second_user
+    ):
+        add(session, test_user, "archived")
+        add(session, second_user, "not mine")
+        add(session, test_user, "hot", completed=False, updated_at=NOW)
+        archive_completed(session, timedelta(days=90), batch_size=10)
+
+        hot = list_todos(session, test_user.id)
+        both = list_todos(session, test_user.id, include_archived=True)
+
+        assert [todo.title for todo in hot.items] == ["hot"]
+        assert [todo.title for todo in both.items] == ["hot", "archived"]
+        assert both.total == 2
+
+    def test_filters_and_pages_across_tiers(self, app, session, test_user):
+        for i in range(3):
+            add(session, test_user, f"done {i}", updated_at=OLD + timedelta(i))
+        add(session, test_user, "open", completed=False, updated_at=NOW)
+        archive_completed(session, timedelta(days=90), batch_size=10)
+
+        page = list_todos(
+            session,
+            test_user.id,
+            page=2,
+            per_page=2,
+            completed=True,
+            sort_by="title",
+            order="asc",
+            include_archived=True,
+        )
+
+        assert page.total == 3 and page.pages == 2
+        assert [todo.title for todo in page.items] == ["done 2"]
+
+    def test_stats_unchanged_by_archiving(self, app, session, test_user):
+        add(session, test_user, "old done")
+        add(session, test_user, "open", completed=False)
+        before = todo_stats(session, test_user.id)
+
+        archive_completed(session, timedelta(days=90), batch_size=10)
+
+        assert titles(session, ArchivedTodo) == ["old done"]
+        assert todo_stats(session, test_user.id) == before
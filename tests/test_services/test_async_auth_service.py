@@ -0,0 +1,80 @@
+import asyncio
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import User, UserShard
+from app.schemas import UserRegister
+from app.services.async_auth_service import (
+    authenticate_user,
+    create_user,
+    get_user_by_id,
+    get_user_by_username,
+)
+
+
+def run(engine, scenario):
+    async def main():
+        async with AsyncSession(engine) as session:
+            return await scenario(session)
+
+    return asyncio.run(main())
+
+
+class TestAsyncAuthService:
+    def test_create_and_lookup(self, async_engine):
+        async def scenario(session):
+            user = await create_user(
+                session,
+                UserRegister(
+                    email="new@example.com", username="newuser", password="secret123"
+                ),
+            )
+            return (
+                user,
+                await get_user_by_id(session, user.id),
+                await get_user_by_username(session, "newuser"),
+            )
+
+        user, by_id, by_username = run(async_engine, scenario)
+
+        assert user.password_hash != "secret123"
+        assert by_id.id == by_username.id == user.id
+
+    def test_authenticate(self, async_engine):
+        async def scenario(session):
+            await create_user(
+                session,
+                UserRegister(
+                    email="auth@example.com", username="authuser", password="secret123"
+                ),
+            )
+            return (
+                await authenticate_user(session, "auth@example.com", "secret123"),
+                await authenticate_user(session, "auth@example.com", "wrong"),
+                await authenticate_user(session, "nobody@example.com", "secret123"),
+            )
+
+        valid, wrong_password, unknown = run(async_engine, scenario)
+
+        assert valid.username == "authuser"
+        assert wrong_password is None
+        assert unknown is None
+
+    def test_create_places_user(self, async_engine, shards, monkeypatch):
+        monkeypatch.setattr(shards.ring, "shard_for", lambda user_id: 2)
+
+        async def scenario(session):
+            user = await create_user(
+                session,
+                UserRegister(
+                    email="new@example.com", username="newuser", password="secret123"
+                ),
+            )
+            return user.id, await session.get(UserShard, user.id)
+
+        user_id, placement = run(async_engine, scenario)
+
+        assert placement.shard == 2
+        with Session(shards.engines[2]) as shard_session:
+            assert shard_session.get(User, user_id).email == "new@example.com"
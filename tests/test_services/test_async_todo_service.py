@@ -0,0 +1,88 @@
+import asyncio
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import User
+from app.models.enums import Priority
+from app.schemas import TodoCreate, TodoUpdate
+from app.services.async_todo_service import (
+    create_todo,
+    delete_todo,
+    get_todo,
+    list_todos,
+    toggle_todo,
+    update_todo,
+)
+
+
+def run(engine, scenario):
+    """Run ``scenario(session, user_id)`` on a fresh user in its own loop."""
+
+    async def main():
+        async with AsyncSession(engine) as session:
+            user = User(email="a@example.com", username="async", password_hash="x")
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+            return await scenario(session, user.id)
+
+    return asyncio.run(main())
+
+
+class TestAsyncTodoService:
+    def test_create_and_get(self, async_engine):
+        async def scenario(session, user_id):
+            todo = await create_todo(
+                session, user_id, TodoCreate(title="Async", priority=Priority.HIGH)
+            )
+            return todo, await get_todo(session, todo.id, user_id)
+
+        created, fetched = run(async_engine, scenario)
+
+        assert created.id is not None
+        assert fetched.title == "Async"
+        assert fetched.priority == Priority.HIGH
+
+    def test_get_other_users_todo(self, async_engine):
+        async def scenario(session, user_id):
+            todo = await create_todo(session, user_id, TodoCreate(title="Mine"))
+            return await get_todo(session, todo.id, user_id + 1)
+
+        assert run(async_engine, scenario) is None
+
+    def test_list_filters_and_paginates(self, async_engine):
+        async def scenario(session, user_id):
+            for i in range(5):
+                todo = await create_todo(session, user_id, TodoCreate(title=f"T{i}"))
+                if i % 2:
+                    await toggle_todo(session, todo.id, user_id)
+            return await list_todos(
+                session, user_id, page=1, per_page=2, completed=False
+            )
+
+        result = run(async_engine, scenario)
+
+        assert result.total == 3
+        assert result.pages == 2
+        assert len(result.items) == 2
+        assert all(not item.completed for item in result.items)
+
+    def test_update_and_toggle(self, async_engine):
+        async def scenario(session, user_id):
+            todo = await create_todo(session, user_id, TodoCreate(title="Old"))
+            await update_todo(session, todo.id, user_id, TodoUpdate(title="New"))
+            return await toggle_todo(session, todo.id, user_id)
+
+        todo = run(async_engine, scenario)
+
+        assert todo.title == "New"
+        assert todo.completed is True
+
+    def test_delete(self, async_engine):
+        async def scenario(session, user_id):
+            todo = await create_todo(session, user_id, TodoCreate(title="Gone"))
+            deleted = await delete_todo(session, todo.id, user_id)
+            missing = await delete_todo(session, todo.id, user_id)
+            return deleted, missing, await get_todo(session, todo.id, user_id)
+
+        assert run(async_engine, scenario) == (True, False, None)
@@ -0,0 +1,73 @@
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.models import Todo
+from app.services.archive_service import archive_completed
+from app.services.export_service import (
+    export_rows,
+    export_todos,
+    get_export,
+    prune_exports,
+    start_export,
+)
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.config.Config.EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def add(session, user, title, **fields):
+    session.add(Todo(title=title, user_id=user.id, **fields))
+    session.commit()
+
+
+class TestExportTodos:
+    def test_writes_gzipped_ndjson(self, app, session, test_user, export_dir):
+        add(session, test_user, "a")
+        add(session, test_user, "b")
+
+        result = export_todos(session, test_user.id, "out.ndjson.gz")
+
+        path = export_dir / "out.ndjson.gz"
+        lines = gzip.decompress(path.read_bytes()).splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["a", "b"]
+        assert result == {"todos": 2, "size": path.stat().st_size}
+        assert os.listdir(export_dir) == ["out.ndjson.gz"]
+
+    def test_includes_archived_not_other_users(
+        self, app, session, test_user, second_user, monkeypatch
+    ):
+        monkeypatch.setattr("app.core.config.Config.EXPORT_CHUNK_SIZE", 1)
+        add(session, test_user, "archived", completed=True)
+        add(session, second_user, "not mine")
+        add(session, test_user, "hot")
+        archive_completed(session, timedelta(0), batch_size=10)
+
+        titles = [todo.title for todo in export_rows(session, test_user.id)]
+
+        assert titles == ["hot", "archived"]
+
+
+class TestExportLookup:
+    def test_only_owner_sees_export(self, app, session, test_user, second_user):
+        export = start_export(session, test_user.id)
+
+        assert get_export(session, export.id, test_user.id).id == export.id
+        assert get_export(session, export.id, second_user.id) is None
+
+    def test_prune_exports(self, app, session, export_dir):
+        old = export_dir / "old.ndjson.gz"
+        old.write_bytes(b"")
+        day_ago = time.time() - 25 * 60 * 60
+        os.utime(old, (day_ago, day_ago))
+        (export_dir / "new.ndjson.gz").write_bytes(b"")
+
+        assert prune_exports(session) == 1
+        assert os.listdir(export_dir) == ["new.ndjson.gz"]
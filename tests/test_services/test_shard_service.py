@@ -0,0 +1,126 @@
+import pytest
+from sqlmodel import Session, select
+
+from app.core.database import ShardLocation, ShardMoving
+from app.models import ArchivedTodo, Todo, TodoTombstone, User, UserShard
+from app.schemas import TodoCreate, TodoUpdate
+from app.services.shard_service import move_user, rebalance, sync_user
+from app.services.todo_service import create_todo, delete_todo, update_todo
+
+
+def no_wait(seconds):
+    pass
+
+
+def titles(engine, model, user_id):
+    with Session(engine) as session:
+        statement = select(model.title).where(model.user_id == user_id)
+        return sorted(session.exec(statement).all())
+
+
+@pytest.fixture
+def todos(shards, test_user):
+    with shards.session(test_user.id, write=True) as session:
+        kept = create_todo(session, test_user.id, TodoCreate(title="kept"))
+        gone = create_todo(session, test_user.id, TodoCreate(title="gone"))
+        session.add(
+            ArchivedTodo(id=shards.next_todo_id(), title="old", user_id=test_user.id)
+        )
+        session.commit()
+        delete_todo(session, gone.id, test_user.id)
+        return kept.id, gone.id
+
+
+class TestMoveUser:
+    def test_moves_rows_to_target(self, shards, session, test_user, todos):
+        kept, gone = todos
+
+        assert move_user(shards, test_user.id, 1, wait=no_wait) is True
+
+        assert session.get(UserShard, test_user.id) == UserShard(
+            user_id=test_user.id, shard=1, moving=False
+        )
+        assert shards.locate(test_user.id) == ShardLocation(1)
+        assert titles(shards.engines[1], Todo, test_user.id) == ["kept"]
+        assert titles(shards.engines[1], ArchivedTodo, test_user.id) == ["old"]
+        with Session(shards.engines[1]) as shard:
+            assert shard.get(User, test_user.id).change_seq == 3
+            tombstone = shard.exec(select(TodoTombstone)).one()
+            assert (tombstone.todo_id, tombstone.change_seq) == (gone, 3)
+        # The source shard is emptied, but shard 0 keeps the login
+        session.expire_all()
+        assert titles(shards.engines[0], Todo, test_user.id) == []
+        assert session.exec(select(TodoTombstone)).all() == []
+        assert session.get(User, test_user.id) is not None
+
+    def test_writes_refused_during_switch(self, shards, test_user, todos):
+        refused = []
+
+        def wait(seconds):
+            assert seconds == shards.cache_seconds
+            if not refused:
+                shards.forget(test_user.id)
+                with pytest.raises(ShardMoving):
+                    shards.session(test_user.id, write=True)
+                # Reads are still served from the old shard
+                assert shards.session(test_user.id).bind is shards.engines[0]
+            refused.append(seconds)
+
+        move_user(shards, test_user.id, 2, wait=wait)
+
+        assert len(refused) == 2
+        with shards.session(test_user.id, write=True) as session:
+            todo = create_todo(session, test_user.id, TodoCreate(title="after"))
+            assert todo.change_seq == 4
+        assert titles(shards.engines[2], Todo, test_user.id) == ["after", "kept"]
+
+    def test_moves_between_shards(self, shards, session, test_user, todos):
+        move_user(shards, test_user.id, 1, wait=no_wait)
+        move_user(shards, test_user.id, 2, wait=no_wait)
+
+        assert titles(shards.engines[1], Todo, test_user.id) == []
+        assert titles(shards.engines[2], Todo, test_user.id) == ["kept"]
+        with Session(shards.engines[1]) as shard:
+            assert shard.get(User, test_user.id) is None
+
+    def test_already_on_target(self, shards, test_user):
+        assert move_user(shards, test_user.id, 0, wait=no_wait) is False
+
+    def test_rejects_unknown_shard_and_user(self, shards, test_user):
+        with pytest.raises(ValueError):
+            move_user(shards, test_user.id, 3, wait=no_wait)
+        with pytest.raises(LookupError):
+            move_user(shards, 9999, 1, wait=no_wait)
+
+
+class TestSyncUser:
+    def test_copies_only_changes(self, shards, session, test_user, todos):
+        kept, _ = todos
+        with Session(shards.engines[1]) as target:
+            since = sync_user(session, target, test_user, None)
+            update_todo(session, kept, test_user.id, TodoUpdate(title="edited"))
+            delete_todo(session, kept, test_user.id)
+            create_todo(session, test_user.id, TodoCreate(title="new"))
+
+            assert sync_user(session, target, test_user, since) == since + 3
+
+        assert titles(shards.engines[1], Todo, test_user.id) == ["new"]
+        with Session(shards.engines[1]) as target:
+            assert len(target.exec(select(TodoTombstone)).all()) == 2
+
+
+class TestRebalance:
+    def test_moves_users_off_their_ring_shard(
+        self, shards, session, test_user, second_user
+    ):
+        expected = [
+            (user.id, 0, shards.ring.shard_for(user.id))
+            for user in (test_user, second_user)
+            if shards.ring.shard_for(user.id) != 0
+        ]
+
+        assert expected
+        assert rebalance(shards, dry_run=True) == expected
+        assert session.exec(select(UserShard)).all() == []
+        assert rebalance(shards, wait=no_wait) == expected
+        assert rebalance(shards, dry_run=True) == []
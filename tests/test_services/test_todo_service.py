@@ -1,13 +1,19 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlmodel import update
 
 from app.models import Todo
 from app.models.enums import Priority
 from app.schemas import TodoCreate, TodoUpdate
 from app.services.todo_service import (
+    VersionConflict,
     create_todo,
     delete_todo,
     get_todo,
+    list_changes,
     list_todos,
+    todo_stats,
     toggle_todo,
     update_todo,
 )
@@ -209,6 +215,49 @@ class TestUpdateTodo:
 
         assert todo.updated_at > original_updated_at
 
+    def test_update_bumps_version(self, app, session, test_user, test_todo):
+        data = TodoUpdate(title="Versioned")
+
+        todo = update_todo(session, test_todo.id, test_user.id, data, if_match={1})
+
+        assert todo.version == 2
+
+    def test_update_stale_version(self, app, session, test_user, test_todo):
+        data = TodoUpdate(title="Stale")
+
+        with pytest.raises(VersionConflict) as conflict:
+            update_todo(session, test_todo.id, test_user.id, data, if_match={0, 5})
+
+        assert conflict.value.version == 1
+        session.refresh(test_todo)
+        assert test_todo.title != "Stale"
+
+    def test_update_loses_race(self, app, session, test_user, test_todo, monkeypatch):
+        from app.services import todo_service
+
+        def concurrent_write(todo, data):
+            # Another request's write lands between our read and our UPDATE
+            session.exec(
+                update(Todo)
+                .values(version=Todo.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            todo.title = data.title
+
+        monkeypatch.setattr(todo_service, "apply_update", concurrent_write)
+
+        with pytest.raises(VersionConflict) as conflict:
+            update_todo(session, test_todo.id, test_user.id, TodoUpdate(title="Lost"))
+        with pytest.raises(VersionConflict) as conditional:
+            update_todo(
+                session, test_todo.id, test_user.id, TodoUpdate(title="Lost"), {1}
+            )
+
+        assert conflict.value.version is None
+        assert conflict.value.precondition is False
+        assert conditional.value.precondition is True
+        assert get_todo(session, test_todo.id, test_user.id).title != "Lost"
+
 
 class TestDeleteTodo:
     def test_delete_todo_success(self, app, session, test_user, test_todo):
@@ -229,6 +278,12 @@ class TestDeleteTodo:
 
         assert result is False
 
+    def test_delete_stale_version(self, app, session, test_user, test_todo):
+        with pytest.raises(VersionConflict):
+            delete_todo(session, test_todo.id, test_user.id, if_match={2})
+
+        assert get_todo(session, test_todo.id, test_user.id) is not None
+
 
 class TestToggleTodo:
     def test_toggle_todo_to_completed(self, app, session, test_user, test_todo):
@@ -270,3 +325,93 @@ class TestToggleTodo:
         todo = toggle_todo(session, test_todo.id, test_user.id)
 
         assert todo.updated_at > original_updated_at
+
+
+class TestChangeFeed:
+    def test_every_write_takes_next_sequence_number(self, app, session, test_user):
+        todo = create_todo(session, test_user.id, TodoCreate(title="Seq"))
+        assert todo.change_seq == 1
+
+        update_todo(session, todo.id, test_user.id, TodoUpdate(title="Seq 2"))
+        toggle_todo(session, todo.id, test_user.id)
+
+        session.refresh(test_user)
+        assert todo.change_seq == test_user.change_seq == 3
+
+    def test_missing_todo_takes_no_sequence_number(self, app, session, test_user):
+        update_todo(session, 99999, test_user.id, TodoUpdate(title="Nope"))
+        delete_todo(session, 99999, test_user.id)
+
+        session.refresh(test_user)
+        assert test_user.change_seq == 0
+
+    def test_delete_leaves_tombstone(self, app, session, test_user, second_user):
+        todo = create_todo(session, test_user.id, TodoCreate(title="Gone"))
+        create_todo(session, second_user.id, TodoCreate(title="Other"))
+        todo_id = todo.id
+
+        delete_todo(session, todo_id, test_user.id)
+        result = list_changes(session, test_user.id, since=1)
+
+        assert result.changed == []
+        assert [deleted.id for deleted in result.deleted] == [todo_id]
+        assert result.cursor == "2"
+
+    def test_has_more_across_both_feeds(self, app, session, test_user):
+        ids = [
+            create_todo(session, test_user.id, TodoCreate(title=f"T{i}")).id
+            for i in range(3)
+        ]
+        delete_todo(session, ids[0], test_user.id)
+
+        result = list_changes(session, test_user.id, since=0, limit=2)
+
+        assert [todo.id for todo in result.changed] == ids[1:]
+        assert result.has_more is True
+        assert result.cursor == "3"
+
+
+class TestTodoStats:
+    def add(self, session, user, due_date=None, completed=False, priority="medium"):
+        session.add(
+            Todo(
+                title="Stat",
+                user_id=user.id,
+                due_date=due_date,
+                completed=completed,
+                priority=priority,
+            )
+        )
+        session.commit()
+
+    def test_counts_in_one_pass(self, app, session, test_user, second_user):
+        today = date(2025, 3, 10)
+        self.add(session, test_user, datetime(2025, 3, 9, 23, tzinfo=timezone.utc))
+        self.add(session, test_user, datetime(2025, 3, 10, 8, tzinfo=timezone.utc))
+        self.add(session, test_user, datetime(2025, 3, 11, tzinfo=timezone.utc))
+        self.add(session, test_user, priority="high")
+        # Completed todos are neither overdue nor due
+        self.add(
+            session,
+            test_user,
+            datetime(2025, 3, 1, tzinfo=timezone.utc),
+            completed=True,
+            priority="low",
+        )
+        self.add(session, second_user, datetime(2025, 3, 1, tzinfo=timezone.utc))
+
+        stats = todo_stats(session, test_user.id, today)
+
+        assert (stats.total, stats.completed, stats.active) == (5, 1, 4)
+        assert stats.by_priority == {
+            Priority.LOW: 1,
+            Priority.MEDIUM: 3,
+            Priority.HIGH: 1,
+        }
+        assert (stats.overdue, stats.due_today) == (1, 1)
+
+    def test_no_todos(self, app, session, test_user):
+        stats = todo_stats(session, test_user.id)
+
+        assert stats.total == stats.overdue == stats.due_today == 0
+        assert set(stats.by_priority.values()) == {0}